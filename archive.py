@@ -0,0 +1,225 @@
+"""
+끝난 예약 보관 (reserve -> reserve_archive)
+
+reserve 에는 다가오는 / 진행 중인 예약과 최근에 끝난 예약만 두고, 끝난 지 ARCHIVE_AFTER_DAYS 일이 지난
+예약 (종료 / 노쇼 / 미퇴실) 은 reserve_archive 로 옮김
+-> 겹침 검사, 예약 가능 시간, 잠금 확인이 훑는 테이블이 쌓인 이력이 아니라 앞으로의 예약 수에 비례
+
+- ARCHIVE_BATCH_SIZE 건씩 INSERT .. SELECT 와 DELETE 를 한 트랜잭션으로 처리 (중간에 멈춰도 반쯤 옮긴 예약 없음)
+- 예약 내역 (my-reservations) 과 집계 재계산 (usage_stats / room_hourly rebuild) 은 두 테이블을 함께 읽음
+- 이용 통계 / 히트맵 집계는 예약이 끝날 때 이미 반영되므로 옮겨도 바뀌지 않음
+- 기본은 cron 등에서 CLI 로 실행. ARCHIVE_ENABLED=1 이면 앱 워커 안에서도 ARCHIVE_INTERVAL_SEC 마다 실행
+- 실행마다 DB 수준 잠금 (MySQL GET_LOCK / PostgreSQL advisory lock) 을 잡고, 이미 다른 워커 / cron 이
+  옮기는 중이면 건너뜀 (SQLite 는 쓰기가 직렬화되고 겹쳐도 기본 키 충돌로 롤백되므로 잠금 없음)
+
+python -m app.archive run [--days N] [--batch-size N] [--dry-run]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, insert, literal, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Reserve, ReserveArchive
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "0") == "1"                # 앱 워커 안에서 주기 실행 (기본: CLI / cron 만)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))          # 끝난 뒤 reserve 에 남겨 두는 기간 (일)
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "5000"))
+ARCHIVE_INTERVAL_SEC = int(os.getenv("ARCHIVE_INTERVAL_SEC", "3600"))
+
+# 동시에 한 곳에서만 옮기도록 잡는 DB 잠금 이름 (PostgreSQL 은 이 이름의 crc32 를 키로 사용)
+ARCHIVE_LOCK_NAME = "haedal.reserve_archive"
+
+# 옮기는 예약 상태 (더 이상 바뀌지 않는 상태만)
+ARCHIVED_STATUSES = ("종료", "노쇼", "미퇴실")
+# 두 테이블에 공통인 컬럼
+RESERVATION_COLUMNS = ("reservation_id", "class_id", "user_id", "start_time", "end_time", "status")
+
+
+def reservation_history():
+    """
+    reserve + reserve_archive 를 합친 서브쿼리 (컬럼은 RESERVATION_COLUMNS, 집계 재계산용)
+    """
+    return union_all(
+        select(*(getattr(Reserve, name) for name in RESERVATION_COLUMNS)),
+        select(*(getattr(ReserveArchive, name) for name in RESERVATION_COLUMNS)),
+    ).subquery("reservation_history")
+
+
+def _eligible(cutoff: datetime):
+    # 가장 큰 reservation_id 는 남김: SQLite (AUTOINCREMENT 없음) 나 재시작한 MySQL 은 남은 최대 ID + 1 을
+    # 다음 ID 로 쓰므로, 최대 ID 까지 옮기면 새 예약이 보관된 예약과 같은 ID 를 받을 수 있음
+    return select(Reserve.reservation_id).where(
+        Reserve.status.in_(ARCHIVED_STATUSES),
+        Reserve.end_time < cutoff,
+        Reserve.reservation_id < select(func.max(Reserve.reservation_id)).scalar_subquery(),
+    )
+
+
+@contextmanager
+def _exclusive(engine):
+    """
+    보관 작업 잠금을 기다리지 않고 시도해 잡았는지 여부를 돌려줌 (세션 잠금이라 전용 커넥션에서 잡고 풂)
+    """
+    dialect = engine.dialect.name
+    if dialect in ("mysql", "mariadb"):
+        acquire, release = "SELECT GET_LOCK(:name, 0)", "SELECT RELEASE_LOCK(:name)"
+        params = {"name": ARCHIVE_LOCK_NAME}
+    elif dialect == "postgresql":
+        acquire, release = "SELECT pg_try_advisory_lock(:key)", "SELECT pg_advisory_unlock(:key)"
+        params = {"key": zlib.crc32(ARCHIVE_LOCK_NAME.encode())}
+    else:
+        yield True
+        return
+
+    with engine.connect() as conn:
+        acquired = bool(conn.scalar(text(acquire), params))
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.scalar(text(release), params)
+
+
+def archive_finished(db: Session, days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE,
+                     dry_run: bool = False, now: datetime = None) -> dict:
+    """
+    끝난 지 days 일이 지난 예약을 reserve_archive 로 옮기고 통계를 반환
+    """
+    started = time.perf_counter()
+    cutoff = (now or datetime.now()) - timedelta(days=days)
+    stats = {"cutoff": cutoff.isoformat(), "archived": 0, "batches": 0}
+
+    if dry_run:
+        stats["eligible"] = db.scalar(select(func.count()).select_from(_eligible(cutoff).subquery()))
+    else:
+        with _exclusive(db.get_bind()) as acquired:
+            if acquired:
+                _move(db, cutoff, batch_size, stats)
+            else:
+                stats["skipped"] = "다른 프로세스가 보관 작업 중"
+
+    stats["hot_rows"] = db.scalar(select(func.count()).select_from(Reserve))
+    stats["archived_rows"] = db.scalar(select(func.count()).select_from(ReserveArchive))
+    stats["elapsed_sec"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def _move(db: Session, cutoff: datetime, batch_size: int, stats: dict):
+    columns = [getattr(Reserve, name) for name in RESERVATION_COLUMNS]
+    while True:
+        # 오래된 예약일수록 ID 가 작으므로 기본 키 순서로 앞에서부터 찾음
+        ids = db.scalars(_eligible(cutoff).order_by(Reserve.reservation_id).limit(batch_size)).all()
+        if not ids:
+            break
+        try:
+            db.execute(insert(ReserveArchive).from_select(
+                [*RESERVATION_COLUMNS, "archived_at"],
+                select(*columns, literal(datetime.now())).where(Reserve.reservation_id.in_(ids)),
+            ))
+            db.execute(delete(Reserve).where(Reserve.reservation_id.in_(ids)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        stats["archived"] += len(ids)
+        stats["batches"] += 1
+        if len(ids) < batch_size:
+            break
+
+
+class ReservationArchiver:
+    """
+    ARCHIVE_INTERVAL_SEC 마다 archive_finished 를 실행하는 백그라운드 작업 (ARCHIVE_ENABLED=1 일 때만)
+    여러 워커에서 돌아도 DB 잠금을 잡은 한 곳만 옮기고 나머지는 그 주기를 건너뜀
+    """
+    def __init__(self):
+        self._task = None
+        self.runs = 0
+        self.archived = 0
+        self.last_run = None
+        self.last_error = None
+
+    def run_once(self) -> dict:
+        with SessionLocal() as db:
+            return archive_finished(db)
+
+    async def run(self):
+        while True:
+            try:
+                result = await run_in_threadpool(self.run_once)
+                self.runs += 1
+                self.archived += result["archived"]
+                self.last_run = result
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("예약 보관 실패")
+                self.last_error = str(e)
+            await asyncio.sleep(ARCHIVE_INTERVAL_SEC)
+
+    def start(self):
+        if ARCHIVE_ENABLED and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": ARCHIVE_ENABLED,
+            "running": self._task is not None,
+            "after_days": ARCHIVE_AFTER_DAYS,
+            "runs": self.runs,
+            "archived": self.archived,
+            "last_run": self.last_run,
+            "last_error": self.last_error,
+        }
+
+
+# 워커 프로세스 전역 보관 작업
+reservation_archiver = ReservationArchiver()
+
+
+# 보관 작업 상태 (마지막 실행 결과, reserve / reserve_archive 행 수)
+@router.get("/archive/stats")
+def get_archive_stats():
+    return reservation_archiver.stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="끝난 예약 보관")
+    parser.add_argument("command", choices=["run"])
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="끝난 뒤 reserve 에 남겨 둘 기간 (일)")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="옮길 예약 수만 출력")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        result = archive_finished(db, args.days, args.batch_size, args.dry_run)
+    if args.dry_run:
+        print(f"{result['cutoff']} 이전에 끝난 예약 {result['eligible']}건 보관 대상")
+    elif "skipped" in result:
+        print(f"건너뜀: {result['skipped']}")
+    else:
+        print(f"{result['archived']}건 보관 ({result['batches']}묶음, {result['elapsed_sec']:.2f}s), "
+              f"reserve {result['hot_rows']}건 / reserve_archive {result['archived_rows']}건")
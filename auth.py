@@ -1,41 +1,69 @@
-import mysql.connector
-from fastapi import APIRouter, Form, Depends, HTTPException
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi import APIRouter
 
-router = APIRouter() 
+from app.database import SessionLocal
+from app.models import User
 
-def get_db_connection():
-    """
-    MySQL DB에 접속하는 함수
-    """
-    conn = mysql.connector.connect(
-        host="localhost",           # 또는 db 서버 주소
-        user="root",                # 사용자 계정
-        password="@Imjiin61",   # 본인의 비밀번호
-        database="haedal_uni"       # 사용할 데이터베이스
-    )
-    return conn
+router = APIRouter()
 
-def verify_student_login(user_id: str, name: str, phone: str) -> bool:
-    print("🔍 로그인 시도:", user_id, name, phone)
+# 로그인 결과 캐시 (같은 학생의 반복 시도가 DB 까지 가지 않도록)
+LOGIN_CACHE_TTL_SEC = float(os.getenv("LOGIN_CACHE_TTL_SEC", "60"))            # 성공 결과 유지 시간
+LOGIN_NEGATIVE_CACHE_TTL_SEC = float(os.getenv("LOGIN_NEGATIVE_CACHE_TTL_SEC", "5"))  # 실패 결과 유지 시간
+LOGIN_CACHE_SIZE = int(os.getenv("LOGIN_CACHE_SIZE", "4096"))
 
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+_login_cache = OrderedDict()  # sha256(학번, 이름, 전화번호) -> (만료 시각, 결과)
+_login_cache_lock = threading.Lock()
 
-    query = """
-        SELECT * FROM users
-        WHERE user_id = %s AND name = %s AND phone = %s
-    """
-    cursor.execute(query, (
-    user_id.strip(), 
-    name.strip(), 
-    phone.strip()
-))
 
-    result = cursor.fetchone()
+def _cache_key(user_id: str, name: str, phone: str) -> str:
+    # 개인정보를 그대로 메모리에 두지 않도록 해시로 저장
+    return hashlib.sha256("\0".join((user_id, name, phone)).encode()).hexdigest()
+
+
+def _cache_get(key: str):
+    with _login_cache_lock:
+        cached = _login_cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.monotonic():
+            del _login_cache[key]
+            return None
+        _login_cache.move_to_end(key)
+        return cached[1]
+
+
+def _cache_put(key: str, result: bool):
+    ttl = LOGIN_CACHE_TTL_SEC if result else LOGIN_NEGATIVE_CACHE_TTL_SEC
+    if ttl <= 0:
+        return
+    with _login_cache_lock:
+        _login_cache[key] = (time.monotonic() + ttl, result)
+        _login_cache.move_to_end(key)
+        while len(_login_cache) > LOGIN_CACHE_SIZE:
+            _login_cache.popitem(last=False)
+
+
+def verify_student_login(user_id: str, name: str, phone: str) -> bool:
+    """
+    학번 / 이름 / 전화번호로 학생 인증 (공용 커넥션 풀 사용, 결과는 짧게 캐시)
+    """
+    user_id, name, phone = user_id.strip(), name.strip(), phone.strip()
 
-    print("✅ 결과:", result)
+    key = _cache_key(user_id, name, phone)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
 
-    cursor.close()
-    conn.close()
+    with SessionLocal() as db:
+        result = db.query(User.user_id).filter(
+            User.user_id == user_id,
+            User.name == name,
+            User.phone == phone
+        ).first() is not None
 
-    return result is not None
\ No newline at end of file
+    _cache_put(key, result)
+    return result
@@ -0,0 +1,108 @@
+"""
+끝난 예약 보관 전후 hot path 비교 (reserve 에 이력이 쌓인 상태 vs archive 로 옮긴 뒤)
+
+- 예약 생성 직전 겹침 검사 (구간 인덱스 지문 쿼리)
+- 워커 시작 시 구간 인덱스 적재 (warm)
+- 예약 가능 시간 행렬 (class_info), 호관 잠금 상태 (class_list)
+- 예약 내역 첫 페이지 / 깊은 페이지 (보관 후에는 reserve + reserve_archive 합쳐 읽음)
+
+python -m app.benchmarks.archive
+"""
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from app.benchmarks.common import reset_schema, session, measure, print_table
+from app.models import Class, Reserve
+from app.archive import archive_finished
+from app.class_info import compute_availability_matrix
+from app.interval_index import reservation_index
+from app.occupancy import compute_house_occupancy
+from app.reservation import _reservation_page
+
+HISTORY_SIZES = [100_000, 400_000]
+UPCOMING = 3000
+HOUSES = 5
+ROOMS_PER_HOUSE = 40
+HEAVY_USER = 20210001
+PAGE = 50
+
+
+def seed(db, history):
+    rng = random.Random(11)
+    rooms = [h * 100 + r for h in range(1, HOUSES + 1) for r in range(1, ROOMS_PER_HOUSE + 1)]
+    db.bulk_save_objects([Class(class_id=c, house_id=c // 100, lock="N") for c in rooms])
+
+    # 지난 2년 이력 (끝난 예약) -> 앞으로 2주 예약 순서로 넣어 ID 가 시간 순서를 따르게 함
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    starts = sorted(now - timedelta(days=rng.randrange(1, 730), hours=rng.randrange(8)) for _ in range(history))
+    db.bulk_insert_mappings(Reserve, [
+        {"user_id": HEAVY_USER if i % 50 == 0 else rng.randrange(5000), "class_id": rng.choice(rooms),
+         "status": rng.choice(["종료", "종료", "종료", "노쇼", "미퇴실"]), "start_time": s, "end_time": s + timedelta(hours=1)}
+        for i, s in enumerate(starts)
+    ])
+    upcoming = sorted(now + timedelta(days=rng.randrange(14), hours=rng.randrange(-2, 8)) for _ in range(UPCOMING))
+    db.bulk_insert_mappings(Reserve, [
+        {"user_id": HEAVY_USER if i % 50 == 0 else rng.randrange(5000), "class_id": rng.choice(rooms),
+         "status": "사용중" if s <= now else "예약", "start_time": s, "end_time": s + timedelta(hours=1)}
+        for i, s in enumerate(upcoming)
+    ])
+    db.commit()
+    return rooms
+
+
+def deep_cursor(db, pages):
+    cursor = None
+    for _ in range(pages):
+        _, cursor = _reservation_page(db, HEAVY_USER, None, cursor, PAGE)
+    return cursor
+
+
+def hot_paths(db, rooms) -> dict:
+    rng = random.Random(3)
+    house_rooms = db.query(Class.class_id, Class.lock).filter(Class.house_id == 1).all()
+    slot = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=20)
+
+    def overlap():
+        reservation_index.has_overlap(db, rng.choice(rooms), slot, slot + timedelta(hours=1))
+
+    def warm():
+        reservation_index.warm(db)
+
+    reservation_index.warm(db)
+    cursor = deep_cursor(db, 40)
+    results = {
+        "overlap_check": measure(overlap, repeat=200)[0],
+        "index_warm": measure(warm, repeat=5)[0],
+        "availability_7d": measure(lambda: compute_availability_matrix(db, house_rooms, date.today(), 7))[0],
+        "house_occupancy": measure(lambda: compute_house_occupancy(db, 1))[0],
+        "history_page": measure(lambda: _reservation_page(db, HEAVY_USER, None, None, PAGE))[0],
+        "history_deep_page": measure(lambda: _reservation_page(db, HEAVY_USER, None, cursor, PAGE))[0],
+    }
+    db.expunge_all()
+    return results
+
+
+def main():
+    rows = []
+    for size in HISTORY_SIZES:
+        reset_schema()
+        with session() as db:
+            rooms = seed(db, size)
+            before = hot_paths(db, rooms)
+
+            started = time.perf_counter()
+            archived = archive_finished(db)
+            archive_s = time.perf_counter() - started
+            after = hot_paths(db, rooms)
+
+        rows.append((f"{size} (보관 전)", size + UPCOMING, *(f"{v:.2f}" for v in before.values()), ""))
+        rows.append((f"{size} (보관 후)", archived["hot_rows"], *(f"{v:.2f}" for v in after.values()),
+                     f"{archived['archived']}건 {archive_s:.1f}s"))
+
+    print("ms / 호출")
+    print_table(["history", "reserve_rows", *before.keys(), "archive_run"], rows)
+
+
+if __name__ == "__main__":
+    main()
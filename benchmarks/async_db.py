@@ -0,0 +1,165 @@
+"""
+동시 접속 처리량: 동기 Session (스레드풀) vs AsyncSession (aiosqlite)
+
+같은 조회 로직을 기존처럼 def 라우트 + get_db 로 돌린 경우와
+async 라우트 + get_async_db + run_sync 로 돌린 경우를 동시 클라이언트 수별로 비교
+SQLite 는 네트워크 왕복이 없으므로 문장마다 DB_LATENCY_MS 만큼 DB 쪽 스레드에서 대기시켜 MySQL 을 흉내냄
+blocking=yes 는 스레드풀을 오래 잡는 동기 요청(느린 쿼리, 기존 방식의 OCR 등)이 함께 들어오는 상황
+python -m app.benchmarks.async_db
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.benchmarks.common import reset_schema, session, print_table
+from app.database import engine, get_db, get_async_engine, dispose_async_engine
+from app.models import Class, Reserve
+from app import class_info, class_list, total, usage_stats
+from app.occupancy import compute_house_occupancy
+
+CLIENTS = [50, 500, 1000]
+REQUESTS_PER_CLIENT = 4
+HOUSES = 5
+ROOMS_PER_HOUSE = 30
+USERS = 2000
+RESERVATIONS = 3000
+DB_LATENCY_MS = 3
+BLOCKING_CLIENTS = 40          # anyio 기본 스레드풀 크기
+BLOCKING_SEC = 0.5
+
+
+def _simulate_latency(statement):
+    time.sleep(DB_LATENCY_MS / 1000)
+
+
+def add_latency():
+    # 동기: 요청을 처리하는 스레드가, 비동기: aiosqlite 의 커넥션 스레드가 대기 (이벤트 루프는 막지 않음)
+    @event.listens_for(engine, "connect")
+    def on_sync_connect(dbapi_connection, record):
+        dbapi_connection.set_trace_callback(_simulate_latency)
+
+    @event.listens_for(get_async_engine().sync_engine, "connect")
+    def on_async_connect(dbapi_connection, record):
+        dbapi_connection.run_async(lambda conn: conn.set_trace_callback(_simulate_latency))
+
+
+def seed(db):
+    rng = random.Random(3)
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    db.bulk_save_objects([
+        Class(class_id=h * 100 + r, house_id=h, lock="N")
+        for h in range(1, HOUSES + 1) for r in range(1, ROOMS_PER_HOUSE + 1)
+    ])
+    reservations = []
+    for i in range(RESERVATIONS):
+        start = now + timedelta(hours=rng.randrange(-200, 48))
+        reservations.append(Reserve(
+            class_id=rng.randrange(1, HOUSES + 1) * 100 + rng.randrange(1, ROOMS_PER_HOUSE + 1),
+            user_id=rng.randrange(USERS), start_time=start, end_time=start + timedelta(hours=1),
+            status="종료" if start < now else "예약",
+        ))
+    db.bulk_save_objects(reservations)
+    db.commit()
+    usage_stats.rebuild(db)
+
+
+def build_app():
+    app = FastAPI()
+    app.include_router(class_list.router)
+    app.include_router(class_info.router)
+    app.include_router(total.router)
+
+    # 같은 로직의 동기 버전 (포팅 전 방식)
+    @app.get("/sync/classrooms/{house_id}")
+    def sync_classrooms(house_id: int, db: Session = Depends(get_db)):
+        return {"house_id": house_id, "classrooms": compute_house_occupancy(db, house_id)}
+
+    @app.get("/sync/availability")
+    def sync_availability(start_date: str = Query(...), house_id: int = Query(...), db: Session = Depends(get_db)):
+        return class_info._availability_matrix(db, class_info._parse_date(start_date), 7, house_id, None)
+
+    @app.get("/sync/usage-summary/{user_id}")
+    def sync_usage(user_id: int, db: Session = Depends(get_db)):
+        return usage_stats.get_user_usage(db, user_id)
+
+    @app.get("/blocking")
+    def blocking():
+        time.sleep(BLOCKING_SEC)
+        return {}
+
+    return app
+
+
+def paths(prefix, rng):
+    today = datetime.now().date().isoformat()
+    while True:
+        kind = rng.randrange(3)
+        house = rng.randrange(1, HOUSES + 1)
+        if kind == 0:
+            yield f"{prefix}/classrooms/{house}"
+        elif kind == 1:
+            yield f"{prefix}/availability?start_date={today}&house_id={house}"
+        else:
+            yield f"{prefix}/usage-summary/{rng.randrange(USERS)}"
+
+
+async def run(client, prefix, clients):
+    latencies = []
+
+    async def one(i):
+        rng = random.Random(i)
+        gen = paths(prefix, rng)
+        for _ in range(REQUESTS_PER_CLIENT):
+            started = time.perf_counter()
+            r = await client.get(next(gen))
+            r.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[int(len(latencies) * 0.95)] * 1000
+
+
+async def blocking_load(client, stop):
+    async def one():
+        while not stop.is_set():
+            await client.get("/blocking")
+    await asyncio.gather(*(one() for _ in range(BLOCKING_CLIENTS)))
+
+
+async def main():
+    reset_schema()
+    with session() as db:
+        seed(db)
+    engine.dispose()
+    add_latency()
+
+    rows = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app()), base_url="http://bench",
+                                 timeout=300) as client:
+        for clients in CLIENTS:
+            for blocking in (False, True):
+                stop = asyncio.Event()
+                background = asyncio.create_task(blocking_load(client, stop)) if blocking else None
+                sync_rps, sync_p95 = await run(client, "/sync", clients)
+                async_rps, async_p95 = await run(client, "", clients)
+                if background:
+                    stop.set()
+                    await background
+                rows.append((clients, "yes" if blocking else "no", f"{sync_rps:.0f}", f"{sync_p95:.0f}",
+                             f"{async_rps:.0f}", f"{async_p95:.0f}"))
+    await dispose_async_engine()
+
+    print_table(["clients", "blocking", "sync_req_per_s", "sync_p95_ms", "async_req_per_s", "async_p95_ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
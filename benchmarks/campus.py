@@ -0,0 +1,366 @@
+"""
+가상 캠퍼스 부하 벤치마크
+
+설정한 규모의 캠퍼스(호관, 강의실, 한 학기 시간표, 예약 수백만 건, 포인트 원장)를 로컬 DB 에 만들고
+실제 앱(app.main)에 동시 클라이언트로 요청을 보내 시나리오별 지연 시간(p50/p95/p99), 처리량, 요청당 쿼리 수를 측정
+결과는 JSON 으로 저장하고, --baseline 으로 이전 결과와 비교
+
+python -m app.benchmarks.campus                                  # 기본 규모로 생성 + 측정
+python -m app.benchmarks.campus --reservations 200000 --skip-seed # 이미 만든 DB 재사용
+python -m app.benchmarks.campus --base-url http://localhost:8000  # 떠 있는 서버에 요청 (쿼리 수는 측정 안 함)
+
+BENCH_DATABASE_URL 을 지정하면 (예: MySQL, BENCH_ALLOW_DROP=1 필요) 그 DB 에 생성 / 측정
+--skip-seed 로 같은 DB 를 다시 쓰면 reserve 는 이전 실행에서 만든 예약과 겹쳐 400 비율이 달라지므로
+실행 간 비교는 같은 옵션으로 새로 생성한 DB 에서 할 것
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.benchmarks.common import BENCH_DB_PATH, reset_schema, session, print_table
+
+os.environ.setdefault("SECRET_KEY", "campus-benchmark")
+
+import httpx  # noqa: E402
+import sqlalchemy  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from app.database import engine, get_async_engine, dispose_async_engine  # noqa: E402
+from app.models import Class, Timetable, Reserve, User, Point  # noqa: E402
+from app.jwt_handler import create_token  # noqa: E402
+from app.slots import OPEN_HOUR, CLOSE_HOUR  # noqa: E402
+from app import usage_stats  # noqa: E402
+
+SCENARIOS = ["login", "reserve", "classrooms", "availability", "availability_matrix",
+             "predict", "predict_house", "reservation_history", "point_history"]
+INSERT_CHUNK = 20000
+
+
+# ------------------------
+# 캠퍼스 생성
+# ------------------------
+def student_id(i: int) -> int:
+    return 20200000 + i
+
+
+def student_phone(i: int) -> str:
+    return f"010-{i // 10000:04d}-{i % 10000:04d}"
+
+
+def room_ids(cfg) -> list:
+    return [h * 1000 + r for h in range(1, cfg.houses + 1) for r in range(1, cfg.rooms_per_house + 1)]
+
+
+def _bulk_insert(db, model, rows):
+    for i in range(0, len(rows), INSERT_CHUNK):
+        db.execute(insert(model), rows[i:i + INSERT_CHUNK])
+
+
+def seed(db, cfg):
+    rng = random.Random(cfg.seed)
+    now = datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    semester_start = today - timedelta(weeks=cfg.weeks_past)
+    semester_days = cfg.weeks_past * 7 + cfg.days_ahead
+    rooms = room_ids(cfg)
+
+    # 강의실 (5% 는 수동 잠금)
+    _bulk_insert(db, Class, [
+        {"class_id": c, "house_id": c // 1000, "lock": "Y" if rng.random() < 0.05 else "N"} for c in rooms
+    ])
+
+    # 주간 시간표 (평일, 강의실마다 하루 최대 lectures_per_day 개, 겹치지 않게)
+    lectures = []
+    for c in rooms:
+        for weekday in range(5):
+            hour = OPEN_HOUR
+            for _ in range(cfg.lectures_per_day):
+                hour += rng.randrange(0, 3)
+                length = rng.randrange(1, 4)
+                if hour + length > CLOSE_HOUR:
+                    break
+                lectures.append({"class_id": c, "weekend": weekday, "start_time": hour, "end_time": hour + length})
+                hour += length
+    _bulk_insert(db, Timetable, lectures)
+
+    # 한 학기 예약 (지난 예약은 종료 / 노쇼 / 미퇴실, 앞으로의 예약은 예약, 지금 걸친 예약은 사용중)
+    rows = []
+    for _ in range(cfg.reservations):
+        start = semester_start + timedelta(days=rng.randrange(semester_days),
+                                           hours=rng.randrange(OPEN_HOUR, CLOSE_HOUR))
+        end = start + timedelta(hours=min(rng.randrange(1, 3), CLOSE_HOUR - start.hour))
+        if end <= now:
+            roll = rng.random()
+            status = "종료" if roll < 0.85 else "노쇼" if roll < 0.95 else "미퇴실"
+        else:
+            status = "사용중" if start <= now else "예약"
+        rows.append({"class_id": rng.choice(rooms), "user_id": student_id(rng.randrange(cfg.users)),
+                     "start_time": start, "end_time": end, "status": status})
+        if len(rows) >= INSERT_CHUNK:
+            db.execute(insert(Reserve), rows)
+            rows = []
+    if rows:
+        db.execute(insert(Reserve), rows)
+
+    # 포인트 원장 (첫 이용 100 + 학기 중 적립 / 차감) 과 학생 (total_point = 원장 잔액)
+    points = []
+    balances = []
+    for i in range(cfg.users):
+        balance = 100
+        t = semester_start + timedelta(minutes=rng.randrange(60 * 24 * 7))
+        points.append({"user_id": str(student_id(i)), "plus": 100, "minus": 0, "time": t})
+        for _ in range(rng.randrange(cfg.points_per_user + 1)):
+            t += timedelta(minutes=rng.randrange(60, 60 * 24 * 3))
+            if t >= now:
+                break
+            delta = rng.choice((5, 5, 5, 10, -10, -15))
+            applied = max(0, balance + delta) - balance
+            if applied:
+                balance += applied
+                points.append({"user_id": str(student_id(i)), "plus": max(applied, 0), "minus": max(-applied, 0), "time": t})
+        balances.append(balance)
+        if len(points) >= INSERT_CHUNK:
+            db.execute(insert(Point), points)
+            points = []
+    if points:
+        db.execute(insert(Point), points)
+    _bulk_insert(db, User, [
+        {"user_id": str(student_id(i)), "name": f"학생{i}", "phone": student_phone(i), "total_point": balance}
+        for i, balance in enumerate(balances)
+    ])
+    db.commit()
+    usage_stats.rebuild(db)
+
+
+# ------------------------
+# 시나리오 (요청 하나를 만드는 함수)
+# ------------------------
+class Campus:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.rooms = room_ids(cfg)
+        self._tokens = {}
+
+    def auth(self, i: int) -> dict:
+        token = self._tokens.get(i)
+        if token is None:
+            token = self._tokens[i] = create_token(str(student_id(i)))
+        return {"Authorization": f"Bearer {token}"}
+
+    def request(self, scenario: str, rng: random.Random):
+        cfg = self.cfg
+        i = rng.randrange(cfg.users)
+        now = datetime.now()
+        if scenario == "login":
+            # 10% 는 잘못된 전화번호
+            phone = student_phone(i) if rng.random() > 0.1 else "010-9999-9999"
+            return "POST", "/login", {"data": {"user_id": str(student_id(i)), "name": f"학생{i}", "phone": phone}}
+        if scenario == "reserve":
+            start = (now + timedelta(days=rng.randrange(1, cfg.days_ahead + 1))) \
+                .replace(hour=rng.randrange(OPEN_HOUR, CLOSE_HOUR - 1), minute=0, second=0, microsecond=0)
+            body = {"user_id": student_id(i), "class_id": rng.choice(self.rooms),
+                    "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat()}
+            return "POST", "/reserve", {"json": body, "headers": self.auth(i)}
+        if scenario == "classrooms":
+            return "GET", f"/classrooms/{rng.randrange(1, cfg.houses + 1)}", {}
+        if scenario == "availability":
+            day = (now + timedelta(days=rng.randrange(cfg.days_ahead))).date().isoformat()
+            return "GET", f"/classrooms/{rng.choice(self.rooms)}/availability", {"params": {"date": day}}
+        if scenario == "availability_matrix":
+            return "GET", "/availability", {"params": {"start_date": now.date().isoformat(), "days": 7,
+                                                       "house_id": rng.randrange(1, cfg.houses + 1)}}
+        if scenario == "predict":
+            start = now - timedelta(minutes=rng.randrange(180))
+            return "GET", f"/predict/{student_id(rng.randrange(cfg.users))}", \
+                {"params": {"start_time": start.isoformat()}, "headers": self.auth(i)}
+        if scenario == "predict_house":
+            return "GET", f"/predict/house/{rng.randrange(1, cfg.houses + 1)}", {"headers": self.auth(i)}
+        if scenario == "reservation_history":
+            return "GET", f"/my-reservations/{student_id(i)}", {"headers": self.auth(i)}
+        if scenario == "point_history":
+            return "GET", f"/points/history/{student_id(i)}", {"headers": self.auth(i)}
+        raise ValueError(scenario)
+
+
+# ------------------------
+# 측정
+# ------------------------
+class QueryCounter:
+    """
+    동기 / 비동기 엔진에서 실행된 SQL 수
+    """
+    def __init__(self):
+        self.count = 0
+        for target in (engine, get_async_engine().sync_engine):
+            event.listen(target, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+async def run_scenario(client, campus, scenario, cfg, counter):
+    latencies = []
+    statuses = {}
+    errors = 0
+    remaining = iter(range(cfg.requests))
+
+    async def worker(n):
+        nonlocal errors
+        rng = random.Random(f"{cfg.seed}-{scenario}-{n}")
+        for _ in remaining:
+            method, path, kwargs = campus.request(scenario, rng)
+            started = time.perf_counter()
+            try:
+                r = await client.request(method, path, **kwargs)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+                if r.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    queries_before = counter.count if counter else 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(cfg.clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "clients": cfg.clients,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "errors": errors,
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "queries_per_request": round((counter.count - queries_before) / len(latencies), 2) if counter and latencies else None,
+    }
+
+
+def load_app():
+    # app.main 은 현재 디렉터리의 static / templates 를 마운트하므로 빈 디렉터리를 만든 곳에서 import
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="haedal_campus_")
+    for name in ("static", "templates"):
+        os.makedirs(os.path.join(workdir, name), exist_ok=True)
+    os.chdir(workdir)
+    try:
+        from app.main import app
+    finally:
+        os.chdir(cwd)
+    return app
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results: dict, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    rows = []
+    for scenario, result in results.items():
+        base = baseline.get(scenario)
+        if not base:
+            continue
+        rows.append((
+            scenario,
+            f"{base['throughput_rps']} -> {result['throughput_rps']}",
+            f"{(result['throughput_rps'] / base['throughput_rps'] - 1) * 100:+.1f}%" if base["throughput_rps"] else "-",
+            f"{base['p95_ms']} -> {result['p95_ms']}",
+            f"{(result['p95_ms'] / base['p95_ms'] - 1) * 100:+.1f}%" if base["p95_ms"] else "-",
+        ))
+    print()
+    print_table(["scenario", "req_per_s", "change", "p95_ms", "change"], rows)
+
+
+async def main(cfg):
+    if not cfg.skip_seed:
+        reset_schema()
+        started = time.perf_counter()
+        with session() as db:
+            seed(db, cfg)
+        print(f"캠퍼스 생성: 예약 {cfg.reservations}건 ({time.perf_counter() - started:.1f}s)")
+
+    campus = Campus(cfg)
+    counter = None
+    if cfg.base_url:
+        transport, base_url = None, cfg.base_url
+    else:
+        counter = QueryCounter()
+        transport, base_url = httpx.ASGITransport(app=load_app()), "http://campus"
+
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+        for scenario in cfg.scenarios:
+            # 캐시 / 풀 예열 후 측정
+            warmup = argparse.Namespace(**{**vars(cfg), "requests": min(cfg.clients, cfg.requests)})
+            await run_scenario(client, campus, scenario, warmup, None)
+            results[scenario] = await run_scenario(client, campus, scenario, cfg, counter)
+    await dispose_async_engine()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": engine.dialect.name,
+            "target": cfg.base_url or "in-process",
+            "config": {k: v for k, v in vars(cfg).items() if k not in ("output", "baseline", "skip_seed")},
+        },
+        "results": results,
+    }
+    with open(cfg.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_table(["scenario", "req_per_s", "p50_ms", "p95_ms", "p99_ms", "queries/req", "errors"], [
+        (s, r["throughput_rps"], r["p50_ms"], r["p95_ms"], r["p99_ms"], r["queries_per_request"], r["errors"])
+        for s, r in results.items()
+    ])
+    print(f"\n결과 저장: {cfg.output}")
+    if cfg.baseline:
+        compare(results, cfg.baseline)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="가상 캠퍼스 부하 벤치마크")
+    parser.add_argument("--houses", type=int, default=10)
+    parser.add_argument("--rooms-per-house", type=int, default=40)
+    parser.add_argument("--lectures-per-day", type=int, default=3)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--reservations", type=int, default=1000000)
+    parser.add_argument("--points-per-user", type=int, default=30, help="학생당 최대 포인트 이력 수")
+    parser.add_argument("--weeks-past", type=int, default=16, help="지난 학기 주 수")
+    parser.add_argument("--days-ahead", type=int, default=14, help="미리 예약 가능한 일수")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-seed", action="store_true", help=f"이미 만든 DB 재사용 (기본 {BENCH_DB_PATH})")
+    parser.add_argument("--clients", type=int, default=50, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=2000, help="시나리오별 요청 수")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--base-url", help="지정하면 in-process 대신 이 주소로 요청")
+    parser.add_argument("--output", default="campus_results.json")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,86 @@
+"""
+건물 / 강의실 목록 처리량: 매 요청 조회 (기존) vs 캐시 (200) vs 캐시 + 조건부 요청 (304)
+
+python -m app.benchmarks.catalog
+"""
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm import Session
+
+from app.benchmarks.common import reset_schema, session, print_table
+from app.database import get_db
+from app.models import Class
+from app import house_select
+
+HOUSES = 20
+ROOMS_PER_HOUSE = 40
+REQUESTS = 3000
+CLIENTS = 50
+
+
+def seed(db):
+    db.bulk_save_objects([
+        Class(class_id=h * 1000 + r, house_id=h, lock="Y" if r % 7 == 0 else "N")
+        for h in range(1, HOUSES + 1) for r in range(1, ROOMS_PER_HOUSE + 1)
+    ])
+    db.commit()
+
+
+def build_app():
+    app = FastAPI()
+    app.include_router(house_select.router)
+
+    # 캐시 도입 전 구현
+    @app.get("/legacy/houses")
+    def legacy_houses(db: Session = Depends(get_db)):
+        results = db.query(Class.house_id).distinct().all()
+        return {"houses": [{"house_id": h.house_id} for h in results]}
+
+    @app.get("/legacy/houses/{house_id}/classrooms")
+    def legacy_classrooms(house_id: int, db: Session = Depends(get_db)):
+        classrooms = db.query(Class).filter(Class.house_id == house_id).all()
+        return {"house_id": house_id, "classrooms": [{"class_id": c.class_id, "locked": c.lock} for c in classrooms]}
+
+    return app
+
+
+async def run(client, prefix, conditional):
+    etags = {}
+    queue = list(range(REQUESTS))
+
+    async def worker():
+        while queue:
+            i = queue.pop()
+            path = f"{prefix}/houses" if i % 2 else f"{prefix}/houses/{i % HOUSES + 1}/classrooms"
+            headers = {"If-None-Match": etags[path]} if conditional and path in etags else {}
+            r = await client.get(path, headers=headers)
+            if r.status_code == 200 and "etag" in r.headers:
+                etags[path] = r.headers["etag"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CLIENTS)))
+    return REQUESTS / (time.perf_counter() - started)
+
+
+async def main():
+    reset_schema()
+    with session() as db:
+        seed(db)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app()), base_url="http://bench") as client:
+        legacy = await run(client, "/legacy", False)
+        cached = await run(client, "", False)
+        conditional = await run(client, "", True)
+
+    print_table(["mode", "req_per_s"], [
+        ("매 요청 조회", f"{legacy:.0f}"),
+        ("캐시 200", f"{cached:.0f}"),
+        ("캐시 304", f"{conditional:.0f}"),
+    ])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""
+포인트 / 예약 이력 조회: 전체 로드 vs 키셋 페이지 (이력 10만 건 사용자)
+
+python -m app.benchmarks.history
+"""
+from datetime import datetime, timedelta
+
+from app.benchmarks.common import reset_schema, session, measure, print_table
+from app.models import Point, Reserve
+from app.pagination import keyset_page
+
+ROWS = 100_000
+PAGE = 50
+HEAVY_USER = 20210001
+
+
+def seed(db):
+    base = datetime(2022, 3, 2, 9)
+    db.bulk_insert_mappings(Point, [
+        {"user_id": str(HEAVY_USER), "plus": 5 if i % 3 else 0, "minus": 0 if i % 3 else 10,
+         "time": base + timedelta(minutes=30 * i)}
+        for i in range(ROWS)
+    ])
+    db.bulk_insert_mappings(Reserve, [
+        {"user_id": HEAVY_USER, "class_id": 100 + i % 40, "status": "종료" if i % 5 else "노쇼",
+         "start_time": base + timedelta(hours=i), "end_time": base + timedelta(hours=i + 1)}
+        for i in range(ROWS)
+    ])
+    db.commit()
+
+
+def deep_cursor(db, query, time_column, id_column, pages):
+    cursor = None
+    for _ in range(pages):
+        _, cursor = keyset_page(query, time_column, id_column, cursor, 1000)
+    return cursor
+
+
+def main():
+    reset_schema()
+    rows = []
+    with session() as db:
+        seed(db)
+        cases = [
+            ("point", db.query(Point).filter(Point.user_id == str(HEAVY_USER)), Point.time, Point.id),
+            ("reserve", db.query(Reserve).filter(Reserve.user_id == HEAVY_USER), Reserve.start_time, Reserve.reservation_id),
+            ("reserve status=종료", db.query(Reserve).filter(Reserve.user_id == HEAVY_USER, Reserve.status == "종료"),
+             Reserve.start_time, Reserve.reservation_id),
+        ]
+        for name, query, time_column, id_column in cases:
+            full_ms, _ = measure(lambda: query.order_by(time_column.desc()).all(), repeat=3)
+            first_ms, first_q = measure(lambda: keyset_page(query, time_column, id_column, None, PAGE))
+            cursor = deep_cursor(db, query, time_column, id_column, 75)
+            deep_ms, _ = measure(lambda: keyset_page(query, time_column, id_column, cursor, PAGE))
+            rows.append((name, f"{full_ms:.1f}", f"{first_ms:.2f}", f"{deep_ms:.2f}", f"{first_q:.0f}"))
+            db.expunge_all()
+
+    print_table(["history", "load_all_ms", "first_page_ms", "page_at_75k_ms", "queries_per_page"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+실시간 강의실 상태 채널 팬아웃 비용
+
+구독자 수별로 (1) 구독 시 쿼리 수와 소요 시간, (2) 한 호관의 잠금이 바뀐 뒤
+그 호관의 모든 구독자에게 delta 가 도착하기까지의 시간, (3) 같은 수의 탭이 5초마다 폴링할 때의 쿼리 수를 비교
+python -m app.benchmarks.live
+"""
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from app.benchmarks.common import reset_schema, session, print_table
+from app.database import get_async_engine, dispose_async_engine
+from app.models import Class
+from app import live
+
+SUBSCRIBERS = [1000, 5000, 10000]
+HOUSES = 5
+ROOMS_PER_HOUSE = 40
+POLL_INTERVAL_SEC = 5
+POLL_QUERIES = 2            # /classrooms/{house_id} 스냅샷이 만료됐을 때의 쿼리 수
+
+
+def seed(db):
+    db.bulk_save_objects([
+        Class(class_id=h * 100 + r, house_id=h, lock="N")
+        for h in range(1, HOUSES + 1) for r in range(1, ROOMS_PER_HOUSE + 1)
+    ])
+    db.commit()
+
+
+class AsyncQueryCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(get_async_engine().sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+async def run(subscribers, counter):
+    live.LIVE_QUEUE_SIZE = 4
+    hub = live.LiveHub()
+    received = []
+    target = 1
+    consumers = []
+
+    counter.count = 0
+    started = time.perf_counter()
+    queues = await asyncio.gather(*(hub.subscribe(i % HOUSES + 1) for i in range(subscribers)))
+    subscribe_ms = (time.perf_counter() - started) * 1000
+    subscribe_queries = counter.count
+
+    async def consume(queue):
+        message = await queue.get()
+        received.append(time.perf_counter())
+        return message
+
+    for i, (queue, _) in enumerate(queues):
+        if i % HOUSES + 1 == target:
+            consumers.append(asyncio.create_task(consume(queue)))
+
+    # 잠금 변경 -> after_commit 에서 notify -> 디바운스 후 재계산 1회 -> 팬아웃
+    counter.count = 0
+    with session() as db:
+        db.query(Class).filter(Class.class_id == target * 100 + 1).update({Class.lock: "Y"})
+        db.commit()
+    changed = time.perf_counter()
+    hub.notify(house_id=target)
+    await asyncio.gather(*consumers)
+    fanout_ms = (max(received) - changed) * 1000 - live.LIVE_DEBOUNCE_SEC * 1000
+    refresh_queries = counter.count
+
+    with session() as db:
+        db.query(Class).filter(Class.class_id == target * 100 + 1).update({Class.lock: "N"})
+        db.commit()
+    await hub.stop()
+
+    polling_qps = subscribers / POLL_INTERVAL_SEC * POLL_QUERIES
+    return (subscribers, f"{subscribe_ms:.0f}", subscribe_queries, len(consumers),
+            f"{fanout_ms:.1f}", refresh_queries, f"{polling_qps:.0f}")
+
+
+async def main():
+    reset_schema()
+    with session() as db:
+        seed(db)
+    counter = AsyncQueryCounter()
+
+    rows = [await run(n, counter) for n in SUBSCRIBERS]
+    await dispose_async_engine()
+    print_table(["subscribers", "subscribe_ms", "subscribe_queries", "house_subscribers",
+                 "fanout_ms", "change_queries", "polling_queries_per_s"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+로그인 처리량: 로그인마다 새 커넥션 (기존 방식) vs 공용 풀 vs 공용 풀 + 결과 캐시
+
+BENCH_DATABASE_URL 을 MySQL 로 지정하면 (BENCH_ALLOW_DROP=1 필요) 실제 연결 비용이 반영됨
+python -m app.benchmarks.login
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.benchmarks.common import reset_schema, session, print_table
+from app.database import DATABASE_URL, _engine_options
+from app.models import User
+from app import auth
+
+USERS = 500
+ATTEMPTS = 5000
+CLIENTS = 32
+
+
+def seed(db):
+    db.bulk_save_objects([
+        User(user_id=str(20200000 + i), name=f"학생{i}", phone=f"010-0000-{i:04d}") for i in range(USERS)
+    ])
+    db.commit()
+
+
+def attempts():
+    # 수업이 끝난 직후처럼 같은 학생이 여러 번 시도하는 분포 (오타 10%)
+    rng = random.Random(1)
+    for _ in range(ATTEMPTS):
+        i = rng.randrange(USERS)
+        phone = f"010-0000-{i:04d}" if rng.random() > 0.1 else "010-9999-9999"
+        yield str(20200000 + i), f"학생{i}", phone
+
+
+def fresh_connection_login(factory):
+    def login(user_id, name, phone):
+        with factory() as db:
+            return db.query(User.user_id).filter(
+                User.user_id == user_id, User.name == name, User.phone == phone
+            ).first() is not None
+    return login
+
+
+def run(login):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(CLIENTS) as pool:
+        list(pool.map(lambda a: login(*a), attempts()))
+    return ATTEMPTS / (time.perf_counter() - started)
+
+
+def main():
+    reset_schema()
+    with session() as db:
+        seed(db)
+
+    options = _engine_options(DATABASE_URL)
+    options.pop("pool_size", None)
+    options.pop("max_overflow", None)
+    options.pop("pool_timeout", None)
+    unpooled = sessionmaker(bind=create_engine(DATABASE_URL, poolclass=NullPool, **options))
+
+    rows = [("fresh connection", f"{run(fresh_connection_login(unpooled)):.0f}")]
+
+    auth.LOGIN_CACHE_TTL_SEC = auth.LOGIN_NEGATIVE_CACHE_TTL_SEC = 0
+    rows.append(("pooled", f"{run(auth.verify_student_login):.0f}"))
+
+    auth.LOGIN_CACHE_TTL_SEC, auth.LOGIN_NEGATIVE_CACHE_TTL_SEC = 60, 5
+    rows.append(("pooled + cache", f"{run(auth.verify_student_login):.0f}"))
+
+    print_table(["mode", "logins_per_sec"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+/classrooms/{house_id} 잠금 상태 계산: 기존 강의실별 N+1 루프 vs 호관 단위 집합 쿼리
+
+python -m app.benchmarks.occupancy
+"""
+import random
+from datetime import datetime, timedelta
+
+from app.benchmarks.common import reset_schema, session, measure, print_table
+from app.models import Class, Timetable, Reserve
+from app import occupancy
+
+ROOM_COUNTS = [10, 50, 200, 1000]
+
+
+def legacy_house_occupancy(db, house_id):
+    # 기존 class_list.py 구현 (강의실마다 Reserve / Timetable 쿼리 2회)
+    now = datetime.now().hour
+    results = []
+    for room in db.query(Class).filter(Class.house_id == house_id).all():
+        locked = room.lock == "Y"
+        if not locked:
+            reserved = db.query(Reserve).filter(
+                Reserve.class_id == room.class_id,
+                Reserve.start_time <= now,
+                Reserve.end_time >= now
+            ).first()
+            in_lecture = db.query(Timetable).filter(
+                Timetable.class_id == room.class_id,
+                Timetable.start_time <= now,
+                Timetable.end_time >= now
+            ).first()
+            locked = bool(reserved or in_lecture)
+        results.append({"class_id": room.class_id, "locked": locked})
+    return results
+
+
+def seed(db, house_id, rooms):
+    rng = random.Random(house_id)
+    today = datetime.now().replace(minute=0, second=0, microsecond=0)
+    for i in range(rooms):
+        class_id = house_id * 10000 + i
+        db.add(Class(class_id=class_id, house_id=house_id, lock="Y" if rng.random() < 0.05 else "N"))
+        for weekday in range(5):
+            start = rng.randint(9, 16)
+            db.add(Timetable(class_id=class_id, weekend=weekday, start_time=start, end_time=start + 2))
+        for day in range(-30, 7):
+            start = today + timedelta(days=day, hours=rng.randint(-4, 4))
+            db.add(Reserve(class_id=class_id, user_id=rng.randint(1, 500),
+                           start_time=start, end_time=start + timedelta(hours=2), status="예약"))
+    db.commit()
+
+
+def main():
+    reset_schema()
+    rows = []
+    with session() as db:
+        for house_id, rooms in enumerate(ROOM_COUNTS, start=1):
+            seed(db, house_id, rooms)
+        for house_id, rooms in enumerate(ROOM_COUNTS, start=1):
+            legacy_ms, legacy_q = measure(lambda: legacy_house_occupancy(db, house_id))
+            set_ms, set_q = measure(lambda: occupancy.compute_house_occupancy(db, house_id))
+            occupancy.invalidate()
+            snap_ms, snap_q = measure(lambda: occupancy.get_house_occupancy(db, house_id))
+            rows.append((rooms, f"{legacy_q:.0f}", f"{legacy_ms:.2f}",
+                         f"{set_q:.0f}", f"{set_ms:.2f}", f"{snap_q:.2f}", f"{snap_ms:.3f}"))
+
+    print_table(
+        ["rooms", "legacy_q", "legacy_ms", "set_q", "set_ms", "snapshot_q", "snapshot_ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
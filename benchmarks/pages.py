@@ -0,0 +1,105 @@
+"""
+HTML 페이지 / 정적 파일 처리량
+
+페이지: 매 요청 TemplateResponse (기존) vs 미리 렌더링 + gzip (200) vs ETag 재검증 (304)
+정적 파일: StaticFiles (기존) vs 메모리 캐시 + gzip (200) vs 304
+요청당 전송 바이트(본문)도 함께 출력
+
+python -m app.benchmarks.pages
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+WORKDIR = tempfile.mkdtemp(prefix="haedal_pages_")
+os.environ["TEMPLATES_DIR"] = os.path.join(WORKDIR, "templates")
+os.environ["STATIC_DIR"] = os.path.join(WORKDIR, "static")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import HTMLResponse  # noqa: E402
+from fastapi.staticfiles import StaticFiles  # noqa: E402
+from fastapi.templating import Jinja2Templates  # noqa: E402
+
+from app.benchmarks.common import print_table  # noqa: E402
+from app import pages  # noqa: E402
+
+REQUESTS = 3000
+CLIENTS = 50
+ROWS = 300          # 페이지 본문 크기 (약 30KB)
+
+
+def write_fixtures():
+    os.makedirs(pages.TEMPLATES_DIR, exist_ok=True)
+    os.makedirs(os.path.join(pages.STATIC_DIR, "css"), exist_ok=True)
+    rows = "\n".join(
+        f"<tr><td>IT{i // 20 + 1}호관</td><td>{100 + i}호</td><td><button class='reserve'>예약</button></td></tr>"
+        for i in range(ROWS)
+    )
+    html = ("<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            "<link rel='stylesheet' href=\"{{ url_for('static', path='/css/style.css') }}\"></head>"
+            f"<body><table>{rows}</table></body></html>")
+    for name in pages.PAGES.values():
+        with open(os.path.join(pages.TEMPLATES_DIR, name), "w", encoding="utf-8") as f:
+            f.write(html)
+    with open(os.path.join(pages.STATIC_DIR, "css", "style.css"), "w", encoding="utf-8") as f:
+        f.write("".join(f".room-{i} {{ margin: {i % 8}px; color: #3a3a3a; }}\n" for i in range(800)))
+
+
+def build_app():
+    app = FastAPI()
+    app.include_router(pages.router)
+    app.mount("/static", pages.CachedStaticFiles(directory=pages.STATIC_DIR), name="static")
+    app.mount("/legacy-static", StaticFiles(directory=pages.STATIC_DIR), name="legacy-static")
+
+    # 기존 구현: 요청마다 템플릿 렌더링, 압축 / 캐시 헤더 없음
+    legacy_templates = Jinja2Templates(directory=pages.TEMPLATES_DIR)
+
+    @app.get("/legacy/point.html", response_class=HTMLResponse)
+    def legacy_point_page(request: Request):
+        return legacy_templates.TemplateResponse(request, "point.html")
+
+    return app
+
+
+async def run(client, path, conditional):
+    headers = {"Accept-Encoding": "gzip, deflate, br"}
+    etag = None
+    sent = []
+    queue = list(range(REQUESTS))
+
+    async def worker():
+        nonlocal etag
+        while queue:
+            queue.pop()
+            request_headers = dict(headers, **({"If-None-Match": etag} if conditional and etag else {}))
+            r = await client.get(path, headers=request_headers)
+            sent.append(int(r.headers.get("content-length", 0)))
+            if r.status_code == 200 and "etag" in r.headers:
+                etag = r.headers["etag"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CLIENTS)))
+    return REQUESTS / (time.perf_counter() - started), sum(sent) / len(sent)
+
+
+async def main():
+    write_fixtures()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=build_app()), base_url="http://bench") as client:
+        results = [
+            ("페이지: 매 요청 렌더링", await run(client, "/legacy/point.html", False)),
+            ("페이지: 미리 렌더링 200", await run(client, "/point.html", False)),
+            ("페이지: 미리 렌더링 304", await run(client, "/point.html", True)),
+            ("정적: StaticFiles", await run(client, "/legacy-static/css/style.css", False)),
+            ("정적: 캐시 200", await run(client, "/static/css/style.css", False)),
+            ("정적: 캐시 304", await run(client, "/static/css/style.css", True)),
+        ]
+
+    print_table(["mode", "req_per_s", "bytes_per_response"],
+                [(mode, f"{rps:.0f}", f"{size:.0f}") for mode, (rps, size) in results])
+    print(f"(brotli {'사용' if pages.brotli else '미설치 -> gzip'})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
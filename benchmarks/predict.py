@@ -0,0 +1,73 @@
+"""
+호관 단위 빈 강의실 확률: 강의실마다 /predict 호출 vs 일괄 예측
+
+python -m app.benchmarks.predict
+"""
+import random
+from datetime import datetime, timedelta
+
+from app.benchmarks.common import reset_schema, session, measure, print_table
+from app.models import Class, Reserve, User, Point
+from app.probability import ProbabilityManager, convert_point_to_trust_score
+from app import ledger
+from app.predict import predict_reservations, _active_reservations
+
+ROOM_COUNTS = [20, 100, 400]
+
+
+def seed(db, house_id, rooms, now):
+    rng = random.Random(house_id)
+    for i in range(rooms):
+        class_id = house_id * 10000 + i
+        user_id = house_id * 100000 + i
+        points = rng.randint(0, 200)
+        db.add(Class(class_id=class_id, house_id=house_id, lock="N"))
+        db.add(User(user_id=str(user_id), name=f"학생{i}", phone="010", total_point=points))
+        db.add(Point(user_id=str(user_id), plus=points, minus=0, time=now))
+        start = now - timedelta(minutes=rng.randint(0, 170))
+        db.add(Reserve(class_id=class_id, user_id=user_id, start_time=start,
+                       end_time=start + timedelta(hours=3), status="사용중"))
+    db.commit()
+
+
+def per_room(db, reservations, now):
+    # 기존 방식: 예약마다 잔액 조회 + ProbabilityManager 생성
+    results = []
+    for r in reservations:
+        ledger.invalidate([str(r.user_id)])
+        points = ledger.get_balance(db, str(r.user_id))
+        elapsed = int((now - r.start_time).total_seconds() // 60)
+        results.append(ProbabilityManager().get_empty_probability(elapsed, convert_point_to_trust_score(points)))
+    return results
+
+
+def main():
+    reset_schema()
+    now = datetime.now()
+    rows = []
+    with session() as db:
+        for house_id, rooms in enumerate(ROOM_COUNTS, start=1):
+            seed(db, house_id, rooms, now)
+        for house_id, rooms in enumerate(ROOM_COUNTS, start=1):
+            reservations = [r for r in _active_reservations(db, now).all() if r.class_id // 10000 == house_id]
+
+            single_ms, single_q = measure(lambda: per_room(db, reservations, now), repeat=5)
+
+            def cold_batch():
+                ledger.invalidate()
+                return predict_reservations(db, reservations, now)
+            cold_ms, cold_q = measure(cold_batch)
+            warm_ms, warm_q = measure(lambda: predict_reservations(db, reservations, now))
+
+            expected = per_room(db, reservations, now)
+            assert [p["empty_probability"] for p in predict_reservations(db, reservations, now)] == expected
+
+            rows.append((rooms, f"{single_ms:.2f}", f"{single_q:.0f}", f"{cold_ms:.2f}", f"{cold_q:.0f}",
+                         f"{warm_ms:.3f}", f"{warm_q:.0f}"))
+
+    print_table(["reservations", "per_room_ms", "per_room_q", "batch_cold_ms", "batch_cold_q",
+                 "batch_warm_ms", "batch_warm_q"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+앱 기동 시간
+
+새 프로세스에서 (1) import app.main, (2) lifespan 시작, (3) 첫 응답 (강의실 목록 / 로그인이 필요한 포인트 조회)
+까지 걸린 시간을 여러 번 재서 중앙값을 출력하고, import 가 오래 걸린 app 모듈을 함께 보여줌
+WARM_CACHES=1 (백그라운드 예열) 일 때도 같이 측정
+
+python -m app.benchmarks.startup
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from app.benchmarks.common import BENCH_DATABASE_URL, reset_schema, session, print_table
+from app.models import Class, User
+
+RUNS = 5
+
+CHILD = r"""
+import asyncio, json, os, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+import httpx
+from app.jwt_handler import create_token
+
+async def main():
+    result = {"import_ms": (imported - started) * 1000, "numpy_loaded": "numpy" in sys.modules}
+    async with app.router.lifespan_context(app):
+        result["startup_ms"] = (time.perf_counter() - imported) * 1000
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            t = time.perf_counter()
+            assert (await client.get("/houses")).status_code == 200
+            result["first_catalog_ms"] = (time.perf_counter() - t) * 1000
+            t = time.perf_counter()
+            headers = {"Authorization": "Bearer " + create_token("2024000001")}
+            assert (await client.get("/points/points/2024000001", headers=headers)).status_code == 200
+            result["first_auth_ms"] = (time.perf_counter() - t) * 1000
+        result["ready_ms"] = (time.perf_counter() - started) * 1000
+    print(json.dumps(result))
+
+asyncio.run(main())
+"""
+
+
+def seed():
+    reset_schema()
+    with session() as db:
+        db.add_all([Class(class_id=h * 100 + r, house_id=h, lock="N") for h in range(1, 6) for r in range(1, 21)])
+        db.add(User(user_id="2024000001", name="벤치", phone="010-0000-0000", total_point=100))
+        db.commit()
+
+
+def run_child(workdir: str, env: dict) -> dict:
+    # 인터프리터 시작부터 잰 전체 시간은 wall_ms
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=workdir, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["wall_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def slowest_imports(workdir: str, env: dict, top: int = 10) -> list:
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=workdir, env=env,
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        # "import time:  self [us] | cumulative | module"
+        parts = line.partition(":")[2].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((parts[2].strip(), int(parts[1])))
+    rows = [(name, us) for name, us in rows if name.startswith(("app.", "numpy", "jose"))]
+    return sorted(rows, key=lambda r: -r[1])[:top]
+
+
+def main():
+    seed()
+    workdir = tempfile.mkdtemp(prefix="haedal_startup_")
+    for name in ("static", "templates"):
+        os.makedirs(os.path.join(workdir, name), exist_ok=True)
+
+    package_parent = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    base_env = dict(os.environ, DATABASE_URL=BENCH_DATABASE_URL, SECRET_KEY="bench",
+                    PYTHONPATH=os.pathsep.join(filter(None, [package_parent, os.environ.get("PYTHONPATH")])))
+
+    metrics = ["import_ms", "startup_ms", "first_catalog_ms", "first_auth_ms", "ready_ms", "wall_ms"]
+    rows = []
+    for label, warm in (("cold", "0"), ("WARM_CACHES=1", "1")):
+        env = dict(base_env, WARM_CACHES=warm)
+        runs = [run_child(workdir, env) for _ in range(RUNS)]
+        rows.append((label, *(f"{statistics.median(r[m] for r in runs):.1f}" for m in metrics),
+                     any(r["numpy_loaded"] for r in runs)))
+    print(f"중앙값 ({RUNS}회, ms)")
+    print_table(["mode", *metrics, "numpy_at_import"], rows)
+
+    print()
+    print("import 가 오래 걸린 모듈 (누적, ms)")
+    print_table(["module", "ms"], [(name, f"{us / 1000:.1f}") for name, us in slowest_imports(workdir, base_env)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+시간표 비트셋 캐시: 캠퍼스 전체 규모의 메모리 사용량과 조회 지연
+
+python -m app.benchmarks.timetable_cache
+"""
+import random
+import time
+from datetime import datetime
+
+from app.benchmarks.common import reset_schema, session, measure, print_table
+from app.models import Timetable
+from app.timetable_cache import TimetableCache
+
+HOUSES = 40
+ROOMS_PER_HOUSE = 60
+LECTURES_PER_ROOM = 25
+
+
+def seed(db):
+    rng = random.Random(7)
+    rows = []
+    for house_id in range(1, HOUSES + 1):
+        for i in range(ROOMS_PER_HOUSE):
+            class_id = house_id * 1000 + i
+            for _ in range(LECTURES_PER_ROOM):
+                start = rng.randint(9, 19)
+                rows.append(Timetable(class_id=class_id, weekend=rng.randint(0, 5),
+                                      start_time=start, end_time=start + rng.choice([1, 2, 3])))
+    db.bulk_save_objects(rows)
+    db.commit()
+    return len(rows)
+
+
+def main():
+    reset_schema()
+    with session() as db:
+        lectures = seed(db)
+        cache = TimetableCache()
+
+        started = time.perf_counter()
+        cache.reload(db)
+        reload_ms = (time.perf_counter() - started) * 1000
+
+        now = datetime.now()
+        class_id = 1000 + ROOMS_PER_HOUSE // 2
+        db_ms, db_q = measure(lambda: db.query(Timetable).filter(
+            Timetable.class_id == class_id,
+            Timetable.weekend == now.weekday(),
+            Timetable.start_time <= now.hour,
+            Timetable.end_time > now.hour,
+        ).first(), repeat=200)
+        bit_ms, bit_q = measure(lambda: cache.in_lecture(db, class_id, now), repeat=200)
+
+        usage = cache.memory_usage()
+        print_table(
+            ["lectures", "rooms", "cache_kib", "reload_ms", "db_lookup_ms", "db_q", "bit_lookup_ms", "bit_q"],
+            [(lectures, usage["rooms"], f"{usage['bytes'] / 1024:.1f}", f"{reload_ms:.1f}",
+              f"{db_ms:.3f}", f"{db_q:.0f}", f"{bit_ms:.4f}", f"{bit_q:.0f}")],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+인증 사진 업로드: 기존 동기 복사 (클라이언트 파일명) vs 스트리밍 저장 (내용 해시 파일명)
+
+동시 업로드 처리량과 같은 파일명으로 올린 서로 다른 사진이 몇 장 남는지 비교
+python -m app.benchmarks.uploads
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+
+from app.benchmarks.common import print_table
+from app import uploads
+
+CONCURRENCY = [10, 100, 300]
+PHOTO_BYTES = 2 * 1024 * 1024
+
+
+def build_app(legacy_dir):
+    app = FastAPI()
+
+    @app.post("/legacy")
+    def legacy(image: UploadFile = File(...)):
+        os.makedirs(legacy_dir, exist_ok=True)
+        with open(os.path.join(legacy_dir, image.filename), "wb") as buffer:
+            shutil.copyfileobj(image.file, buffer)
+        return {}
+
+    @app.post("/streaming")
+    async def streaming(image: UploadFile = File(...)):
+        stored = await uploads.save_upload(image)
+        return {"sha256": stored.sha256}
+
+    return app
+
+
+async def run(client, path, clients):
+    async def one(i):
+        # 학생마다 다른 사진이지만 파일명은 모두 IMG_0001.jpg
+        body = i.to_bytes(4, "big") * (PHOTO_BYTES // 4)
+        r = await client.post(path, files={"image": ("IMG_0001.jpg", body, "image/jpeg")})
+        r.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(clients)))
+    return time.perf_counter() - started
+
+
+async def main():
+    root = tempfile.mkdtemp(prefix="haedal_uploads_")
+    legacy_dir = os.path.join(root, "legacy")
+    uploads.UPLOAD_DIR = os.path.join(root, "streaming")
+    app = build_app(legacy_dir)
+
+    rows = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for clients in CONCURRENCY:
+            shutil.rmtree(legacy_dir, ignore_errors=True)
+            shutil.rmtree(uploads.UPLOAD_DIR, ignore_errors=True)
+            legacy_s = await run(client, "/legacy", clients)
+            streaming_s = await run(client, "/streaming", clients)
+            mb = clients * PHOTO_BYTES / (1024 * 1024)
+            rows.append((clients, f"{mb / legacy_s:.0f}", len(os.listdir(legacy_dir)),
+                         f"{mb / streaming_s:.0f}", len(os.listdir(uploads.UPLOAD_DIR))))
+    shutil.rmtree(root, ignore_errors=True)
+
+    print_table(["clients", "legacy_MBps", "legacy_files_kept", "streaming_MBps", "streaming_files_kept"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
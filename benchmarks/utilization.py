@@ -0,0 +1,104 @@
+"""
+강의실 이용률 히트맵 / 상위 N: 이력 스캔 vs 시간대별 누적 집계 (room_hourly)
+
+이력 크기별로 (1) 히트맵을 예약 / 시간표 전체를 읽어 매번 계산할 때와 집계 테이블에서 읽을 때,
+(2) 상위 N 강의실, (3) 집계 재계산 (행마다 Python vs NumPy 일괄) 시간을 비교
+
+python -m app.benchmarks.utilization
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.benchmarks.common import reset_schema, session, measure, print_table
+from app.models import Class, Reserve, Timetable
+from app import room_hourly
+
+HISTORY_SIZES = [10_000, 100_000, 300_000]
+HOUSES = 5
+ROOMS_PER_HOUSE = 40
+STATUSES = ["종료"] * 7 + ["노쇼", "미퇴실"]
+
+
+def seed(db, reservations):
+    rng = random.Random(7)
+    rooms = [h * 100 + r for h in range(1, HOUSES + 1) for r in range(1, ROOMS_PER_HOUSE + 1)]
+    db.bulk_save_objects([Class(class_id=c, house_id=c // 100, lock="N") for c in rooms])
+    db.bulk_insert_mappings(Timetable, [
+        {"class_id": c, "weekend": wd, "start_time": h, "end_time": h + 2}
+        for c in rooms for wd in range(5) for h in (9, 13) if rng.random() < 0.5
+    ])
+    base = datetime(2026, 3, 2)
+    rows = []
+    for _ in range(reservations):
+        start = base + timedelta(days=rng.randrange(110), hours=rng.randrange(9, 17), minutes=rng.choice([0, 30]))
+        rows.append({"user_id": rng.randrange(5000), "class_id": rng.choice(rooms), "status": rng.choice(STATUSES),
+                     "start_time": start, "end_time": start + timedelta(minutes=rng.choice([60, 90, 120]))})
+    db.bulk_insert_mappings(Reserve, rows)
+    db.commit()
+
+
+def scan_heatmap(db, house_id):
+    # 집계 테이블 없이: 해당 호관의 끝난 예약과 시간표를 모두 읽어 매번 계산
+    class_ids = [c for (c,) in db.query(Class.class_id).filter(Class.house_id == house_id)]
+    cells = {}
+    for r in db.query(Reserve.class_id, Reserve.start_time, Reserve.end_time, Reserve.status).filter(
+            Reserve.class_id.in_(class_ids), Reserve.status.in_(room_hourly.RECORDED_STATUSES)):
+        for key, delta in room_hourly.cell_deltas(r.status, r.start_time, r.end_time).items():
+            cell = cells.setdefault(key, dict.fromkeys(room_hourly.CELL_FIELDS, 0))
+            for name, value in delta.items():
+                cell[name] += value
+    for t in db.query(Timetable).filter(Timetable.class_id.in_(class_ids)):
+        for hour in range(t.start_time, t.end_time):
+            cells.setdefault((t.weekend, hour), dict.fromkeys(room_hourly.CELL_FIELDS, 0))["weekly_lecture_minutes"] += 60
+    return cells
+
+
+def scan_top(db, limit):
+    used = {}
+    for r in db.query(Reserve.class_id, Reserve.start_time, Reserve.end_time).filter(
+            Reserve.status.in_(room_hourly.USED_STATUSES)):
+        used[r.class_id] = used.get(r.class_id, 0) + int((r.end_time - r.start_time).total_seconds() // 60)
+    return sorted(used.items(), key=lambda kv: -kv[1])[:limit]
+
+
+def rebuild_rowwise(db):
+    # NumPy 없이 행마다 나눠서 더하는 재계산 (비교용, DB 에 쓰지 않음)
+    cells = {}
+    for r in db.query(Reserve.class_id, Reserve.start_time, Reserve.end_time, Reserve.status).filter(
+            Reserve.status.in_(room_hourly.RECORDED_STATUSES)).yield_per(room_hourly.REBUILD_CHUNK):
+        for (wd, h), delta in room_hourly.cell_deltas(r.status, r.start_time, r.end_time).items():
+            cell = cells.setdefault((r.class_id, wd, h), {})
+            for name, value in delta.items():
+                cell[name] = cell.get(name, 0) + value
+    return cells
+
+
+def main():
+    rows = []
+    for size in HISTORY_SIZES:
+        reset_schema()
+        with session() as db:
+            seed(db, size)
+
+            started = time.perf_counter()
+            rebuild_rowwise(db)
+            rowwise_s = time.perf_counter() - started
+            started = time.perf_counter()
+            room_hourly.rebuild(db)
+            vectorized_s = time.perf_counter() - started
+
+            scan_ms, _ = measure(lambda: scan_heatmap(db, 1), repeat=3)
+            heatmap_ms, heatmap_q = measure(lambda: room_hourly.heatmap(db, house_id=1))
+            scan_top_ms, _ = measure(lambda: scan_top(db, 10), repeat=3)
+            top_ms, _ = measure(lambda: room_hourly.top_rooms(db, "used_minutes", 10))
+
+        rows.append((size, f"{scan_ms:.1f}", f"{heatmap_ms:.2f}", f"{heatmap_q:.0f}", f"{scan_top_ms:.1f}",
+                     f"{top_ms:.2f}", f"{rowwise_s:.2f}", f"{vectorized_s:.2f}"))
+
+    print_table(["reservations", "scan_heatmap_ms", "rollup_heatmap_ms", "heatmap_queries", "scan_top10_ms",
+                 "rollup_top10_ms", "rebuild_rowwise_s", "rebuild_numpy_s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,116 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime
-from app.database import get_db
-from app.models import Reserve
+from datetime import datetime, date as date_type, timedelta
+from typing import List, Optional
+from app.database import get_async_db
+from app.interval_index import reservation_index
+from app.models import Class, Reserve, ACTIVE_STATUSES
+from app.slots import HOURS, FULL_DAY_MASK, hour_mask, hours_covered
+from app.timetable_cache import timetable_cache
 
 router = APIRouter()
 
+# 한 번에 조회 가능한 최대 일수
+MAX_MATRIX_DAYS = 31
+
+
+def _parse_date(value: str) -> date_type:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식은 YYYY-MM-DD 입니다.")
+
+
 @router.get("/classrooms/{class_id}/availability")
-def get_classroom_availability(
+async def get_classroom_availability(
     class_id: int,
     date: str = Query(..., description="예약 날짜 (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # 시간대: 9시 ~ 17시
-    all_slots = list(range(9, 18))
-    reserved_slots = set()
-
-    # 해당 날짜의 예약 중인 시간대 조회
-    reservations = db.query(Reserve).filter(
-        Reserve.class_id == class_id,
-        Reserve.start_time < 18,
-        Reserve.end_time > 9
-    ).all()
-
-    for res in reservations:
-        res_date = res.start_time.strftime("%Y-%m-%d")
-        if res_date == date:
-            reserved_range = range(res.start_time.hour, res.end_time.hour)
-            reserved_slots.update(reserved_range)
-
-    # 시간별 예약 가능 여부 표시
+    day = _parse_date(date)
+
+    # 해당 날짜에 걸친 예약만 구간 인덱스에서 조회
+    reserved_slots = await db.run_sync(reservation_index.reserved_hours, class_id, day)
+
+    # 시간별 예약 가능 여부 표시 (9시 ~ 17시)
     return [
         {"hour": h, "status": "예약중" if h in reserved_slots else "예약가능"}
-        for h in all_slots
+        for h in HOURS
     ]
+
+
+def compute_availability_matrix(db: Session, rooms: list, start: date_type, days: int) -> list:
+    """
+    강의실 x 날짜 별 "예약 불가" 시간대 비트마스크 계산 (bit i = HOURS[i])
+
+    rooms: (class_id, lock) 목록. 수업은 시간표 비트셋 캐시, 예약은 강의실 수와 무관하게 쿼리 1회
+    """
+    class_ids = [r.class_id for r in rooms]
+    range_start = datetime.combine(start, datetime.min.time())
+    range_end = range_start + timedelta(days=days)
+
+    # 기간과 겹치는 진행 예정 / 진행 중 예약
+    busy = {class_id: [0] * days for class_id in class_ids}
+    reservations = db.query(Reserve.class_id, Reserve.start_time, Reserve.end_time).filter(
+        Reserve.class_id.in_(class_ids),
+        Reserve.status.in_(ACTIVE_STATUSES),
+        Reserve.start_time < range_end,
+        Reserve.end_time > range_start,
+    )
+    for r in reservations:
+        row = busy[r.class_id]
+        s, e = max(r.start_time, range_start), min(r.end_time, range_end)
+        while s < e:
+            day_end = datetime.combine(s.date(), datetime.min.time()) + timedelta(days=1)
+            covered = hours_covered(s, min(e, day_end))
+            row[(s.date() - start).days] |= hour_mask(covered.start, covered.stop)
+            s = day_end
+
+    weekdays = [(start + timedelta(days=i)).weekday() for i in range(days)]
+    results = []
+    for room in rooms:
+        if room.lock == "Y":
+            masks = [FULL_DAY_MASK] * days
+        else:
+            # 요일별 수업 시간 마스크 (월 ~ 일)
+            week = timetable_cache.day_masks(db, room.class_id)
+            masks = [m | week[wd] for m, wd in zip(busy[room.class_id], weekdays)]
+        results.append({"class_id": room.class_id, "locked": room.lock == "Y", "busy": masks})
+    return results
+
+
+@router.get("/availability")
+async def get_availability_matrix(
+    start_date: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    days: int = Query(7, ge=1, le=MAX_MATRIX_DAYS, description="조회 일수"),
+    house_id: Optional[int] = Query(None, description="호관 번호"),
+    class_ids: Optional[List[int]] = Query(None, description="강의실 번호 목록"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    여러 강의실 / 여러 날짜의 예약 가능 여부를 한 번에 반환 (강의실 / 예약 쿼리 각 1회)
+
+    busy[d] 의 i 번째 비트가 1 이면 start_date + d 일의 hours[i] 시는 예약 불가
+    (수업, 예약, 수동 잠금 중 하나)
+    """
+    if house_id is None and not class_ids:
+        raise HTTPException(status_code=400, detail="house_id 또는 class_ids 가 필요합니다.")
+    start = _parse_date(start_date)
+    return await db.run_sync(_availability_matrix, start, days, house_id, class_ids)
+
+
+def _availability_matrix(db: Session, start: date_type, days: int, house_id: Optional[int], class_ids: Optional[List[int]]) -> dict:
+    query = db.query(Class.class_id, Class.lock)
+    if house_id is not None:
+        query = query.filter(Class.house_id == house_id)
+    if class_ids:
+        query = query.filter(Class.class_id.in_(class_ids))
+    rooms = query.order_by(Class.class_id).all()
+
+    return {
+        "start_date": start.isoformat(),
+        "days": days,
+        "hours": HOURS,
+        "rooms": compute_availability_matrix(db, rooms, start, days) if rooms else [],
+    }
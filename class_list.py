@@ -1,45 +1,28 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from datetime import datetime
-from app.database import get_db
-from app.models import Class, Timetable, Reserve  # 필요 테이블들
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.live import live_hub
+from app.occupancy import get_house_occupancy
 
 router = APIRouter()
 
 @router.get("/classrooms/{house_id}")
-def get_classrooms_by_house(house_id: int, db: Session = Depends(get_db)):
-    now = datetime.now().hour  # 시간 기준만 본다고 가정 (분/요일 추가 가능)
-
-    # 1. 해당 호관 강의실들 조회
-    classrooms = db.query(Class).filter(Class.house_id == house_id).all()
-    results = []
-
-    for room in classrooms:
-        locked = False
-
-        # 2. 수동 잠금 여부
-        if room.lock == "Y":
-            locked = True
-        else:
-            # 3. timetable 또는 reserve 기준 자동 잠금 체크 (시작시간 <= now <= 종료시간)
-            reserved = db.query(Reserve).filter(
-                Reserve.class_id == room.class_id,
-                Reserve.start_time <= now,
-                Reserve.end_time >= now
-            ).first()
-
-            in_lecture = db.query(Timetable).filter(
-                Timetable.class_id == room.class_id,
-                Timetable.start_time <= now,
-                Timetable.end_time >= now
-            ).first()
-
-            if reserved or in_lecture:
-                locked = True
-
-        results.append({
-            "class_id": room.class_id,
-            "locked": locked
-        })
-
-    return {"house_id": house_id, "classrooms": results}
+async def get_classrooms_by_house(house_id: int, db: AsyncSession = Depends(get_async_db)):
+    # 수동 잠금 + 진행 중 예약 + 현재 수업 여부를 호관 단위로 한 번에 계산
+    classrooms = await db.run_sync(get_house_occupancy, house_id)
+    return {"house_id": house_id, "classrooms": classrooms}
+
+@router.get("/classrooms/{house_id}/live")
+async def stream_classrooms_by_house(house_id: int, request: Request):
+    # 폴링 대신 구독: 처음에 snapshot, 이후 바뀐 강의실만 delta 로 전송 (text/event-stream)
+    return StreamingResponse(
+        live_hub.stream(house_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# 실시간 채널 상태 (구독자 수, 재계산 횟수)
+@router.get("/live/stats")
+def get_live_stats():
+    return live_hub.stats()
@@ -0,0 +1,23 @@
+"""
+조건부 요청 (If-None-Match / If-Modified-Since) 처리 공용 함수
+"""
+from email.utils import parsedate_to_datetime
+from fastapi import Request
+
+
+def not_modified(request: Request, etag: str, modified_at: float) -> bool:
+    """
+    클라이언트가 가진 표현이 etag / modified_at 과 같으면 True (304 로 응답)
+    If-None-Match 가 있으면 그것만 보고, 없을 때만 If-Modified-Since 를 비교
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] \
+            or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= modified_at
+        except (TypeError, ValueError):
+            return False
+    return False
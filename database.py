@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -11,8 +12,61 @@ load_dotenv()
 # 환경 변수에서 DB URL 불러오기
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# 커넥션 풀 설정 (로그인이 몰리는 시간대에도 MySQL 연결 수를 넘지 않도록 상한을 둠)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))              # 상시 유지 커넥션 수
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))        # 순간적으로 추가 허용할 커넥션 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))       # 풀에서 커넥션을 기다리는 최대 시간 (초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))      # MySQL wait_timeout 전에 커넥션 교체 (초)
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))   # 새 커넥션 연결 제한 시간 (초)
+
+# 비동기 엔진 (조회가 많은 라우터용). 지정하지 않으면 DATABASE_URL 의 드라이버만 바꿔서 사용
+# (mysql -> aiomysql, sqlite -> aiosqlite, postgresql -> asyncpg 드라이버 설치 필요)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+DB_ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", str(DB_POOL_SIZE)))
+DB_ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", str(DB_MAX_OVERFLOW)))
+
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mariadb": "mariadb+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        # 로컬 테스트 / 벤치마크용 SQLite 는 스레드풀에서 같은 커넥션을 공유
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "connect_args": {"connect_timeout": DB_CONNECT_TIMEOUT},
+    }
+
+
+def async_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"비동기 드라이버를 알 수 없는 DB 입니다: {dialect} (ASYNC_DATABASE_URL 을 지정하세요)")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+def _async_engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    options = _engine_options(url)
+    options.update(pool_size=DB_ASYNC_POOL_SIZE, max_overflow=DB_ASYNC_MAX_OVERFLOW)
+    if url.startswith("postgresql"):
+        options["connect_args"] = {"timeout": DB_CONNECT_TIMEOUT}
+    return options
+
+
 # SQLAlchemy 엔진 생성
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 
 # 세션 로컬 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -27,3 +81,37 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 비동기 엔진은 처음 쓸 때 생성 (비동기 드라이버가 없어도 동기 경로는 그대로 동작)
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = ASYNC_DATABASE_URL or async_url(DATABASE_URL)
+        _async_engine = create_async_engine(url, **_async_engine_options(url))
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+# 비동기 DB 세션 의존성 주입 함수
+# 기존 동기 로직은 await db.run_sync(함수, 인자...) 로 그대로 재사용 (쿼리 대기 중에 이벤트 루프를 막지 않음)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,23 +1,136 @@
-from fastapi import APIRouter, Depends
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import formatdate
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import Class  # class 테이블 모델
+from app import occupancy
+from app.conditional import not_modified
+from app.live import live_hub
 
 router = APIRouter()
 
+# 건물 / 강의실 목록 캐시 유지 시간 (앱 밖에서 DB 를 직접 고친 경우 반영까지의 최대 지연)
+CATALOG_CACHE_TTL_SEC = float(os.getenv("CATALOG_CACHE_TTL_SEC", "300"))
+
+
+class CatalogEntry:
+    """
+    미리 직렬화한 응답 본문과 검증자 (ETag / Last-Modified)
+    """
+    def __init__(self, payload: dict, previous=None):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        # 다시 읽어도 내용이 같으면 Last-Modified 는 그대로 유지
+        if previous is not None and previous.etag == self.etag:
+            self.modified_at = previous.modified_at
+        else:
+            self.modified_at = int(time.time())
+        self.last_modified = formatdate(self.modified_at, usegmt=True)
+
+    def response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Last-Modified": self.last_modified, "Cache-Control": "no-cache"}
+        if not_modified(request, self.etag, self.modified_at):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class CatalogCache:
+    """
+    건물 목록과 건물별 강의실 목록을 class 테이블 한 번 조회로 만들어 보관
+    """
+    def __init__(self):
+        self._houses = None
+        self._classrooms = {}       # house_id -> CatalogEntry
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session):
+        rows = db.query(Class.class_id, Class.house_id, Class.lock) \
+            .order_by(Class.house_id, Class.class_id).all()
+        by_house = {}
+        for row in rows:
+            by_house.setdefault(row.house_id, []).append({"class_id": row.class_id, "locked": row.lock})
+
+        houses = CatalogEntry({"houses": [{"house_id": h} for h in by_house]}, self._houses)
+        classrooms = {
+            house_id: CatalogEntry({"house_id": house_id, "classrooms": rooms}, self._classrooms.get(house_id))
+            for house_id, rooms in by_house.items()
+        }
+        with self._lock:
+            self._houses = houses
+            self._classrooms = classrooms
+            self._expires_at = time.monotonic() + CATALOG_CACHE_TTL_SEC
+
+    def _ensure_loaded(self, db: Session):
+        if self._houses is None or time.monotonic() >= self._expires_at:
+            self._load(db)
+
+    def houses(self, db: Session) -> CatalogEntry:
+        self._ensure_loaded(db)
+        return self._houses
+
+    def classrooms(self, db: Session, house_id: int) -> CatalogEntry:
+        self._ensure_loaded(db)
+        entry = self._classrooms.get(house_id)
+        if entry is None:
+            # 강의실이 없는 건물도 기존처럼 빈 목록으로 응답
+            with self._lock:
+                entry = self._classrooms.setdefault(house_id, CatalogEntry({"house_id": house_id, "classrooms": []}))
+        return entry
+
+    def invalidate(self):
+        # 검증자 비교를 위해 기존 항목은 남기고 다음 요청에서 다시 읽게만 함
+        with self._lock:
+            self._expires_at = 0.0
+
+
+# 워커 프로세스 전역 캐시
+catalog_cache = CatalogCache()
+
+
+# ------------------------
+# class 테이블 변경 감지: 커밋된 뒤에 캐시 무효화
+# ------------------------
+def _mark_class_changed(mapper, connection, target):
+    Session.object_session(target).info["class_changed"] = True
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Class, _event_name, _mark_class_changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_class_change(orm_execute_state):
+    # query(Class).update() / delete() 처럼 객체를 거치지 않는 변경
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) \
+            and orm_execute_state.bind_mapper is not None and orm_execute_state.bind_mapper.class_ is Class:
+        orm_execute_state.session.info["class_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("class_changed", False):
+        catalog_cache.invalidate()
+        occupancy.invalidate()
+        live_hub.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session):
+    session.info.pop("class_changed", None)
+
+
 @router.get("/houses")
-def get_house_list(db: Session = Depends(get_db)):
-    # 중복 제거된 건물번호(house_id) 목록 조회
-    results = db.query(Class.house_id).distinct().all()
-    houses = [{"house_id": h.house_id} for h in results]
-    return {"houses": houses}
+def get_house_list(request: Request, db: Session = Depends(get_db)):
+    # 중복 제거된 건물번호(house_id) 목록 (캐시, 바뀌지 않았으면 304)
+    return catalog_cache.houses(db).response(request)
 
 @router.get("/houses/{house_id}/classrooms")
-def get_classrooms_by_house(house_id: int, db: Session = Depends(get_db)):
-    classrooms = db.query(Class).filter(Class.house_id == house_id).all()
-    return {
-        "house_id": house_id,
-        "classrooms": [
-            {"class_id": c.class_id, "locked": c.lock} for c in classrooms
-        ]
-    }
+def get_classrooms_by_house(house_id: int, request: Request, db: Session = Depends(get_db)):
+    return catalog_cache.classrooms(db, house_id).response(request)
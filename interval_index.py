@@ -0,0 +1,155 @@
+import bisect
+import os
+import threading
+import time
+from datetime import datetime, date, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models import Reserve, ACTIVE_STATUSES
+from app.slots import hours_covered
+
+# 다른 워커가 바꾼 예약을 반영하기 위해 DB 지문을 다시 확인하는 주기 (초)
+VERIFY_INTERVAL_SEC = float(os.getenv("INTERVAL_INDEX_VERIFY_SEC", "2"))
+
+
+class RoomIntervals:
+    """
+    한 강의실의 진행 예정 / 진행 중 예약 구간을 시작 시각 순으로 보관
+
+    같은 강의실의 예약은 서로 겹치지 않으므로 종료 시각도 같은 순서로 정렬됨
+    -> 겹침 검사와 구간 조회가 모두 이진 탐색
+    """
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        # DB 와 비교하기 위한 지문: (예약 수, reservation_id 합)
+        self.count = 0
+        self.id_sum = 0
+        self.verified_at = 0.0
+
+    def add(self, reservation_id: int, start: datetime, end: datetime):
+        i = bisect.bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.ids.insert(i, reservation_id)
+        self.count += 1
+        self.id_sum += reservation_id
+
+    def remove(self, reservation_id: int, start: datetime) -> bool:
+        i = bisect.bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ids[i] == reservation_id:
+                del self.starts[i], self.ends[i], self.ids[i]
+                self.count -= 1
+                self.id_sum -= reservation_id
+                return True
+            i += 1
+        return False
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        # start < 구간 종료 and 구간 시작 < end 인 예약이 있는지
+        i = bisect.bisect_left(self.starts, end)
+        return i > 0 and self.ends[i - 1] > start
+
+    def between(self, start: datetime, end: datetime) -> list:
+        lo = bisect.bisect_right(self.ends, start)
+        hi = bisect.bisect_left(self.starts, end)
+        return list(zip(self.starts[lo:hi], self.ends[lo:hi]))
+
+
+class IntervalIndex:
+    """
+    강의실별 예약 구간 인덱스 (워커 프로세스마다 하나씩 보유)
+
+    - 최초 접근 시 또는 warm() 으로 DB 에서 적재
+    - 예약 생성 / 취소 / 퇴실 시 add / remove 로 갱신
+    - VERIFY_INTERVAL_SEC 마다 (또는 verify=True 일 때) DB 지문과 비교하여
+      다른 워커의 변경이 감지되면 해당 강의실만 다시 적재
+    """
+    def __init__(self):
+        self._rooms = {}
+        self._lock = threading.Lock()
+
+    def warm(self, db: Session):
+        rows = db.query(Reserve.class_id, Reserve.reservation_id, Reserve.start_time, Reserve.end_time) \
+            .filter(Reserve.status.in_(ACTIVE_STATUSES)) \
+            .order_by(Reserve.class_id, Reserve.start_time).all()
+        rooms = {}
+        for row in rows:
+            rooms.setdefault(row.class_id, RoomIntervals()).add(row.reservation_id, row.start_time, row.end_time)
+        now = time.monotonic()
+        for room in rooms.values():
+            room.verified_at = now
+        with self._lock:
+            self._rooms = rooms
+
+    def invalidate(self, class_id: int = None):
+        with self._lock:
+            if class_id is None:
+                self._rooms.clear()
+            else:
+                self._rooms.pop(class_id, None)
+
+    def room(self, db: Session, class_id: int, verify: bool = False) -> RoomIntervals:
+        room = self._rooms.get(class_id)
+        if room is None:
+            return self._load(db, class_id)
+        if verify or time.monotonic() - room.verified_at > VERIFY_INTERVAL_SEC:
+            if self._fingerprint(db, class_id) != (room.count, room.id_sum):
+                return self._load(db, class_id)
+            room.verified_at = time.monotonic()
+        return room
+
+    def has_overlap(self, db: Session, class_id: int, start: datetime, end: datetime) -> bool:
+        # 예약 생성 직전에는 항상 DB 지문을 확인 (집계 쿼리 1회)
+        return self.room(db, class_id, verify=True).overlaps(start, end)
+
+    def reserved_hours(self, db: Session, class_id: int, day: date) -> set:
+        day_start = datetime.combine(day, datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        hours = set()
+        for start, end in self.room(db, class_id).between(day_start, day_end):
+            hours.update(hours_covered(max(start, day_start), min(end, day_end)))
+        return hours
+
+    def add(self, class_id: int, reservation_id: int, start: datetime, end: datetime):
+        with self._lock:
+            room = self._rooms.get(class_id)
+            if room is not None:
+                room.add(reservation_id, start, end)
+
+    def remove(self, class_id: int, reservation_id: int, start: datetime):
+        with self._lock:
+            room = self._rooms.get(class_id)
+            if room is not None and not room.remove(reservation_id, start):
+                # 인덱스에 없던 예약 -> 다음 접근 때 다시 적재
+                del self._rooms[class_id]
+
+    def _fingerprint(self, db: Session, class_id: int) -> tuple:
+        count, id_sum = db.query(
+            func.count(Reserve.reservation_id),
+            func.coalesce(func.sum(Reserve.reservation_id), 0)
+        ).filter(
+            Reserve.class_id == class_id,
+            Reserve.status.in_(ACTIVE_STATUSES)
+        ).one()
+        return int(count), int(id_sum)
+
+    def _load(self, db: Session, class_id: int) -> RoomIntervals:
+        rows = db.query(Reserve.reservation_id, Reserve.start_time, Reserve.end_time).filter(
+            Reserve.class_id == class_id,
+            Reserve.status.in_(ACTIVE_STATUSES)
+        ).order_by(Reserve.start_time).all()
+        room = RoomIntervals()
+        for row in rows:
+            room.add(row.reservation_id, row.start_time, row.end_time)
+        room.verified_at = time.monotonic()
+        with self._lock:
+            self._rooms[class_id] = room
+        return room
+
+
+# 워커 프로세스 전역 인덱스
+reservation_index = IntervalIndex()
@@ -1,23 +1,89 @@
-from jose import jwt, JWTError
 from datetime import datetime, timedelta
-from fastapi import HTTPException
+from fastapi import HTTPException, Depends, Request
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from collections import OrderedDict
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+
+# 로그인 시 발급한 토큰을 담는 쿠키 이름 (헤더가 없는 페이지 요청용)
+TOKEN_COOKIE_NAME = "access_token"
+
+# 검증이 끝난 토큰의 클레임 캐시 (토큰 -> (만료 시각, user_id)), 만료 전까지만 유지
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+_claims_cache = OrderedDict()
+_claims_lock = threading.Lock()
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def create_token(user_id):
+    from jose import jwt     # 서명 라이브러리는 처음 토큰을 다룰 때 import (앱 기동 시간 단축)
 
-def create_token(user_id: int):
     payload = {
         "sub": str(user_id),
-        "exp": datetime.utcnow() + timedelta(hours=1)
+        "exp": datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     }
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
-def decode_token(token: str):
+
+def verify_token(token: str) -> str:
+    """
+    토큰을 검증하고 user_id(sub) 반환. 한 번 검증한 토큰은 exp 까지 HMAC 검증을 생략
+    """
+    now = time.time()
+    with _claims_lock:
+        cached = _claims_cache.get(token)
+        if cached is not None:
+            if cached[0] > now:
+                _claims_cache.move_to_end(token)
+                return cached[1]
+            del _claims_cache[token]
+
+    from jose import jwt, JWTError
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return int(payload.get("sub"))
     except JWTError:
-        raise HTTPException(status_code=401, detail="유효하지 않은 토큰")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="유효하지 않은 토큰")
+
+    user_id = payload.get("sub")
+    if user_id is None or "exp" not in payload:
+        raise HTTPException(status_code=401, detail="유효하지 않은 토큰")
+
+    with _claims_lock:
+        _claims_cache[token] = (float(payload["exp"]), user_id)
+        while len(_claims_cache) > TOKEN_CACHE_SIZE:
+            _claims_cache.popitem(last=False)
+    return user_id
+
+
+def decode_token(token: str):
+    return int(verify_token(token))
+
+
+def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+) -> str:
+    """
+    FastAPI 의존성: Authorization: Bearer 헤더 또는 로그인 쿠키의 토큰으로 인증된 user_id
+    """
+    token = credentials.credentials if credentials else request.cookies.get(TOKEN_COOKIE_NAME)
+    if not token:
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
+    return verify_token(token)
+
+
+def ensure_same_user(user_id, current_user: str):
+    """
+    요청에 담긴 user_id 가 토큰의 사용자와 같은지 확인
+    """
+    if str(user_id) != current_user:
+        raise HTTPException(status_code=403, detail="본인의 정보만 요청할 수 있습니다.")
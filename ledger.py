@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import exists
+from sqlalchemy.orm import Session
+
+from app.models import User, Point
+
+# 첫 이용 시 지급되는 포인트 ("강의실 예약 시스템 첫 이용")
+INITIAL_POINTS = 100
+
+# 잔액 캐시 유지 시간 (다른 워커에서 바뀐 잔액이 반영되기까지의 최대 지연)
+BALANCE_CACHE_TTL_SEC = float(os.getenv("BALANCE_CACHE_TTL_SEC", "30"))
+
+_balances = {}  # user_id -> (만료 시각, 잔액)
+_balances_lock = threading.Lock()
+
+
+def _remember(user_id: str, balance: int):
+    if BALANCE_CACHE_TTL_SEC > 0:
+        with _balances_lock:
+            _balances[user_id] = (time.monotonic() + BALANCE_CACHE_TTL_SEC, balance)
+
+
+def invalidate(user_ids=None):
+    """
+    잔액 캐시 무효화 (user_ids 가 없으면 전체)
+    """
+    with _balances_lock:
+        if user_ids is None:
+            _balances.clear()
+        else:
+            for user_id in user_ids:
+                _balances.pop(str(user_id), None)
+
+
+def get_balance(db: Session, user_id: str) -> int:
+    """
+    현재 포인트 잔액. 이력을 합산하지 않고 users.total_point 를 읽으며 캐시에 있으면 DB 도 생략
+    """
+    cached = _balances.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    row = db.query(
+        User.total_point,
+        exists().where(Point.user_id == User.user_id).label("opened")
+    ).filter(User.user_id == user_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+
+    # 아직 포인트 이력이 없는 사용자는 첫 이용 포인트를 가진 것으로 간주
+    balance = (row.total_point or 0) if row.opened else INITIAL_POINTS
+    _remember(user_id, balance)
+    return balance
+
+
+def get_balances(db: Session, user_ids) -> dict:
+    """
+    여러 사용자의 잔액을 한 번에 조회 (캐시에 없는 사용자만 쿼리 1회). 없는 사용자는 결과에서 빠짐
+    """
+    balances = {}
+    missing = []
+    now = time.monotonic()
+    for user_id in set(user_ids):
+        cached = _balances.get(user_id)
+        if cached and cached[0] > now:
+            balances[user_id] = cached[1]
+        else:
+            missing.append(user_id)
+
+    if missing:
+        rows = db.query(
+            User.user_id,
+            User.total_point,
+            exists().where(Point.user_id == User.user_id).label("opened")
+        ).filter(User.user_id.in_(missing)).all()
+        for row in rows:
+            balance = (row.total_point or 0) if row.opened else INITIAL_POINTS
+            balances[row.user_id] = balance
+            _remember(row.user_id, balance)
+    return balances
+
+
+def apply_points(db: Session, user_id: str, delta: int, commit: bool = True) -> int:
+    """
+    포인트 적립(+) / 차감(-)을 원장(point)에 기록하고 users.total_point 를 같은 트랜잭션에서 갱신
+
+    - 사용자 행에 쓰기 잠금을 먼저 잡아 동시 요청 간 갱신 유실을 막음
+    - 잔액은 0 미만으로 내려가지 않으며, 실제 반영된 양만 원장에 남김
+    - commit=False 이면 호출자가 커밋한 뒤 invalidate() 로 캐시를 정리해야 함
+    """
+    # 먼저 같은 값으로 UPDATE 해서 쓰기 잠금을 잡은 뒤 (FOR UPDATE 를 무시하는 SQLite 대비)
+    # 잠금 읽기로 최신 잔액을 읽음
+    locked = db.query(User).filter(User.user_id == user_id) \
+        .update({User.total_point: User.total_point}, synchronize_session=False)
+    if not locked:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    user = db.query(User).filter(User.user_id == user_id).with_for_update().populate_existing().one()
+
+    now = datetime.now()
+    if not db.query(exists().where(Point.user_id == user_id)).scalar():
+        db.add(Point(user_id=user_id, plus=INITIAL_POINTS, minus=0, time=now))
+        user.total_point = INITIAL_POINTS
+
+    current = user.total_point or 0
+    balance = max(0, current + delta)
+    applied = balance - current
+    if applied:
+        db.add(Point(user_id=user_id, plus=max(applied, 0), minus=max(-applied, 0), time=now))
+        user.total_point = balance
+
+    if commit:
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            invalidate([user_id])
+            raise
+        _remember(user_id, balance)
+    else:
+        db.flush()
+    return balance
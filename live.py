@@ -0,0 +1,288 @@
+"""
+호관별 실시간 강의실 상태 (Server-Sent Events)
+
+클라이언트가 /classrooms/{house_id} 를 폴링하지 않고 /classrooms/{house_id}/live 를 구독하면
+처음에 전체 상태(snapshot)를 받고, 이후에는 바뀐 강의실만(delta) 받음
+
+- 같은 호관 구독자들은 하나의 채널(상태 계산 1회, 직렬화 1회)을 공유
+- 예약 생성 / 취소 / 입실 / 퇴실 / 만료, 잠금 변경 시 해당 호관을 다시 계산 (짧게 모아서 한 번)
+- 수업 시작 / 종료(정시)와 예약 시작 / 종료 시각에 맞춰 타이머로 다시 계산
+- 다른 워커에서 일어난 변경은 LIVE_RESYNC_SEC 주기의 재계산으로 반영
+"""
+import asyncio
+import contextvars
+import json
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import AsyncSessionLocal
+from app.models import Class, Reserve, ACTIVE_STATUSES
+from app.occupancy import compute_house_occupancy
+
+LIVE_DEBOUNCE_SEC = float(os.getenv("LIVE_DEBOUNCE_SEC", "0.1"))     # 연속 변경을 모으는 시간
+LIVE_RESYNC_SEC = float(os.getenv("LIVE_RESYNC_SEC", "30"))          # 전체 재계산 주기
+LIVE_KEEPALIVE_SEC = float(os.getenv("LIVE_KEEPALIVE_SEC", "15"))    # 프록시 연결 유지용 주석 전송 주기
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "32"))            # 구독자별 밀린 메시지 상한 (넘으면 끊음)
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+def _event(name: str, version: int, payload: dict) -> bytes:
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {name}\nid: {version}\ndata: {data}\n\n".encode("utf-8")
+
+
+def house_state(db: Session, house_id: int, now: datetime):
+    """
+    호관 강의실 상태와, 다음에 상태가 바뀔 수 있는 예약 시작 / 종료 시각
+    """
+    rooms = compute_house_occupancy(db, house_id, now)
+    next_start, next_end = db.query(
+        func.min(Reserve.start_time).filter(Reserve.start_time > now),
+        func.min(Reserve.end_time).filter(Reserve.end_time > now),
+    ).join(Class, Class.class_id == Reserve.class_id).filter(
+        Class.house_id == house_id,
+        Reserve.status.in_(ACTIVE_STATUSES),
+    ).one()
+    changes = [t for t in (next_start, next_end) if t is not None]
+    return rooms, min(changes) if changes else None
+
+
+def _next_hour(now: datetime) -> datetime:
+    # 시간표는 정시 단위이므로 수업 시작 / 종료는 항상 다음 정시
+    return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+
+class HouseChannel:
+    def __init__(self, house_id: int):
+        self.house_id = house_id
+        self.subscribers = set()
+        self.rooms = {}             # class_id -> locked
+        self.version = 0
+        self.snapshot = b""         # 새 구독자에게 보낼 직렬화된 전체 상태
+        self.next_boundary = None
+        self.ready = asyncio.get_running_loop().create_future()
+
+    def apply(self, rooms: list, next_boundary: datetime):
+        """
+        새로 계산한 상태를 반영하고 바뀐 강의실 목록을 반환
+        """
+        state = {room["class_id"]: room["locked"] for room in rooms}
+        changes = [
+            {"class_id": class_id, "locked": locked}
+            for class_id, locked in state.items() if self.rooms.get(class_id) != locked
+        ] + [
+            {"class_id": class_id, "removed": True} for class_id in self.rooms if class_id not in state
+        ]
+        self.rooms = state
+        self.next_boundary = min(next_boundary, _next_hour(datetime.now())) if next_boundary else _next_hour(datetime.now())
+        if changes or not self.snapshot:
+            self.version += 1
+            self.snapshot = _event("snapshot", self.version, {
+                "house_id": self.house_id,
+                "version": self.version,
+                "classrooms": rooms,
+            })
+        return changes
+
+    def broadcast(self, message: bytes) -> int:
+        dropped = 0
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # 너무 밀린 구독자는 끊음 (재접속하면 snapshot 부터 다시 받음)
+                self.subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+                dropped += 1
+        return dropped
+
+
+class LiveHub:
+    def __init__(self):
+        self._channels = {}         # house_id -> HouseChannel
+        self._dirty = set()         # 다시 계산할 house_id
+        self._dirty_rooms = set()   # 호관을 모르는 변경 (class_id)
+        self._dirty_all = False
+        self._loop = None
+        self._wake = None
+        self._task = None
+        self._last_resync = 0.0
+        # 지표
+        self.refreshes = 0
+        self.deltas_sent = 0
+        self.dropped = 0
+
+    # ------------------------
+    # 구독
+    # ------------------------
+    def _ensure_started(self):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._last_resync = self._loop.time()
+            # 첫 구독 요청의 컨텍스트(요청별 계측 등)를 물려받지 않도록 빈 컨텍스트에서 시작
+            self._task = contextvars.Context().run(self._loop.create_task, self._run())
+
+    async def subscribe(self, house_id: int):
+        """
+        (메시지 큐, 현재 snapshot) 반환. 같은 호관의 첫 구독자만 상태를 계산하고 나머지는 그 결과를 기다림
+        """
+        self._ensure_started()
+        channel = self._channels.get(house_id)
+        if channel is None:
+            channel = self._channels[house_id] = HouseChannel(house_id)
+            try:
+                await self._refresh(channel, datetime.now())
+            except BaseException as e:
+                # 기다리던 다른 구독자들도 같은 오류로 끝냄 (요청 취소 포함)
+                self._channels.pop(house_id, None)
+                channel.ready.set_exception(e if isinstance(e, Exception) else RuntimeError("채널 초기화가 중단되었습니다."))
+                channel.ready.exception()
+                raise
+            channel.ready.set_result(True)
+        else:
+            await asyncio.shield(channel.ready)
+
+        queue = asyncio.Queue(maxsize=LIVE_QUEUE_SIZE)
+        channel.subscribers.add(queue)
+        return queue, channel.snapshot
+
+    def unsubscribe(self, house_id: int, queue):
+        channel = self._channels.get(house_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers and channel.ready.done():
+            del self._channels[house_id]
+
+    async def stream(self, house_id: int, request=None):
+        """
+        SSE 본문 생성기
+        """
+        queue, snapshot = await self.subscribe(house_id)
+        try:
+            yield snapshot
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), LIVE_KEEPALIVE_SEC)
+                except asyncio.TimeoutError:
+                    message = KEEPALIVE
+                if message is None or (request is not None and await request.is_disconnected()):
+                    break
+                yield message
+        finally:
+            self.unsubscribe(house_id, queue)
+
+    # ------------------------
+    # 변경 알림 (어느 스레드에서 호출해도 됨)
+    # ------------------------
+    def notify(self, house_id: int = None, class_id: int = None):
+        """
+        house_id / class_id 가 모두 없으면 구독 중인 모든 호관을 다시 계산
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._mark_dirty, house_id, class_id)
+
+    def _mark_dirty(self, house_id, class_id):
+        if house_id is not None:
+            self._dirty.add(house_id)
+        elif class_id is not None:
+            self._dirty_rooms.add(class_id)
+        else:
+            self._dirty_all = True
+        self._wake.set()
+
+    # ------------------------
+    # 재계산 루프
+    # ------------------------
+    async def _refresh(self, channel: HouseChannel, now: datetime):
+        async with AsyncSessionLocal() as db:
+            rooms, next_change = await db.run_sync(house_state, channel.house_id, now)
+        self.refreshes += 1
+        changes = channel.apply(rooms, next_change)
+        if changes and channel.subscribers:
+            message = _event("delta", channel.version, {
+                "house_id": channel.house_id,
+                "version": channel.version,
+                "changes": changes,
+            })
+            self.dropped += channel.broadcast(message)
+            self.deltas_sent += len(channel.subscribers)
+
+    def _due(self, now: datetime) -> list:
+        resync = self._loop.time() - self._last_resync >= LIVE_RESYNC_SEC
+        if resync:
+            self._last_resync = self._loop.time()
+        due = []
+        for house_id, channel in self._channels.items():
+            if not channel.ready.done():
+                continue
+            if self._dirty_all or resync or house_id in self._dirty \
+                    or any(class_id in channel.rooms for class_id in self._dirty_rooms) \
+                    or (channel.next_boundary is not None and channel.next_boundary <= now):
+                due.append(channel)
+        self._dirty.clear()
+        self._dirty_rooms.clear()
+        self._dirty_all = False
+        return due
+
+    def _timeout(self) -> float:
+        now = datetime.now()
+        timeout = max(LIVE_RESYNC_SEC - (self._loop.time() - self._last_resync), 0)
+        for channel in self._channels.values():
+            if channel.next_boundary is not None:
+                timeout = min(timeout, max((channel.next_boundary - now).total_seconds(), 0))
+        return timeout
+
+    async def _run(self):
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self._timeout())
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                await asyncio.sleep(LIVE_DEBOUNCE_SEC)
+
+                now = datetime.now()
+                for channel in self._due(now):
+                    await self._refresh(channel, now)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # DB 일시 장애 등: 잠시 뒤 전체 재계산
+                await asyncio.sleep(1)
+                self._dirty_all = True
+                self._wake.set()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for channel in self._channels.values():
+            channel.broadcast(None)
+        self._channels.clear()
+        self._loop = None
+
+    def stats(self) -> dict:
+        return {
+            "houses": len(self._channels),
+            "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+            "refreshes": self.refreshes,
+            "deltas_sent": self.deltas_sent,
+            "dropped": self.dropped,
+        }
+
+
+# 워커 프로세스 전역 채널 허브
+live_hub = LiveHub()
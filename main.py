@@ -1,89 +1,141 @@
-from fastapi import FastAPI, Form, Request
+"""
+앱 생성 (create_app) 과 로그인 라우트 (HTML 페이지 / 정적 파일은 app.pages)
+
+- import 시점에는 DB 에 접근하지 않음. 테이블 생성은 배포 / 처음 실행 때 한 번: python -m app.migrate
+- 만료 처리기 / 예약 보관 작업 시작 / 종료는 lifespan 에서, 캐시 예열은 WARM_CACHES=1 일 때 백그라운드로
+- OCR 모듈은 OCR 워커에서, NumPy / python-jose 는 처음 쓰일 때 import
+
+uvicorn app.main:app  (또는 uvicorn app.main:create_app --factory)
+"""
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
+from fastapi.responses import RedirectResponse, JSONResponse
 
-from app import models
-from app.database import engine
+from app.database import SessionLocal, dispose_async_engine
 
 from app.auth import router as auth_router, verify_student_login
+from app.jwt_handler import create_token, TOKEN_COOKIE_NAME, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.pagination import NEXT_CURSOR_HEADER
 from app.reservation import router as reservation_router
 from app.house_select import router as house_router
 from app.class_info import router as class_info_router
 from app.class_list import router as class_list_router
 from app.point import router as point_router
 from app.predict import router as predict_router
-
-
-app = FastAPI()
-
-models.Base.metadata.create_all(bind=engine)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
-
-app.include_router(auth_router)
-app.include_router(reservation_router)
-app.include_router(house_router)
-app.include_router(class_info_router)
-app.include_router(class_list_router)
-app.include_router(point_router, prefix="/points", tags=["Points"])  
-app.include_router(predict_router)
-
-
-
-@app.get("/")
+from app import ocr
+from app.total import router as total_router
+from app.sweeper import router as sweeper_router, reservation_sweeper
+from app.archive import router as archive_router, reservation_archiver
+from app.live import live_hub
+from app.metrics import MetricsMiddleware, router as metrics_router
+from app.uploads import UploadLimitMiddleware
+from app.pages import STATIC_DIR, CachedStaticFiles, router as page_router
+
+# 시작 직후 백그라운드에서 시간표 / 예약 구간 / 강의실 목록 캐시와 확률표를 미리 채움
+WARM_CACHES = os.getenv("WARM_CACHES", "0") == "1"
+
+logger = logging.getLogger(__name__)
+
+login_router = APIRouter()
+
+
+def warm_caches():
+    """
+    첫 요청이 적재 비용을 치르지 않도록 프로세스 전역 캐시를 채움 (스레드에서 실행)
+    """
+    from app.house_select import catalog_cache
+    from app.interval_index import reservation_index
+    from app.predict import probability_manager
+    from app.timetable_cache import timetable_cache
+
+    with SessionLocal() as db:
+        timetable_cache.reload(db)
+        reservation_index.warm(db)
+        catalog_cache.houses(db)
+    probability_manager.lookup_table()
+
+
+async def _warm_in_background():
+    try:
+        await asyncio.to_thread(warm_caches)
+    except Exception:
+        # 예열 실패는 첫 요청에서 다시 적재하면 되므로 기동을 막지 않음
+        logger.exception("캐시 예열 실패")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reservation_sweeper.start()
+    reservation_archiver.start()
+    warming = asyncio.create_task(_warm_in_background()) if WARM_CACHES else None
+    try:
+        yield
+    finally:
+        if warming is not None:
+            warming.cancel()
+        await reservation_sweeper.stop()
+        await reservation_archiver.stop()
+        await live_hub.stop()
+        ocr.shutdown()
+        await dispose_async_engine()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
+    )
+    # 사진 업로드 본문 크기 제한 (본문을 다 읽기 전에 413)
+    app.add_middleware(UploadLimitMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+    app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+
+    app.include_router(auth_router)
+    app.include_router(reservation_router)
+    app.include_router(house_router)
+    app.include_router(class_info_router)
+    app.include_router(class_list_router)
+    app.include_router(point_router, prefix="/points", tags=["Points"])
+    app.include_router(predict_router)
+    app.include_router(sweeper_router)
+    app.include_router(archive_router)
+    app.include_router(total_router)
+    app.include_router(metrics_router)
+    app.include_router(login_router)
+    app.include_router(page_router)
+    return app
+
+
+@login_router.get("/")
 def root():
     return RedirectResponse(url="/login")
 
-@app.get("/login", response_class=HTMLResponse)
-def login_page(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
-
-@app.post("/login")
+@login_router.post("/login")
 def login(user_id: str = Form(...), name: str = Form(...), phone: str = Form(...)):
     if verify_student_login(user_id, name, phone):
-        return JSONResponse(content={"success": True, "message": "로그인 성공"})
+        token = create_token(user_id.strip())
+        response = JSONResponse(content={
+            "success": True,
+            "message": "로그인 성공",
+            "access_token": token,
+            "token_type": "bearer"
+        })
+        # 페이지에서 호출하는 API 는 Authorization 헤더 대신 쿠키로도 인증 가능
+        response.set_cookie(TOKEN_COOKIE_NAME, token, max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+                            httponly=True, samesite="lax")
+        return response
     else:
         return JSONResponse(content={"success": False, "message": "다시 시도하세요"})
 
-@app.get("/mainmenu.html", response_class=HTMLResponse)
-def mainmenu_page(request: Request):
-    return templates.TemplateResponse("mainmenu.html", {"request": request})
-
-@app.get("/classroom-search1.html", response_class=HTMLResponse)
-def classroom_search1_page(request: Request):
-    return templates.TemplateResponse("classroom-search1.html", {"request": request})
-
-@app.get("/classroom-search2.html", response_class=HTMLResponse)
-def classroom_search2_page(request: Request):
-    return templates.TemplateResponse("classroom-search2.html", {"request": request})
-
-@app.get("/classroom-page1.html", response_class=HTMLResponse)
-def classroom_page1_page(request: Request):
-    return templates.TemplateResponse("classroom-page1.html", {"request": request})
-
-@app.get("/classroom-page2.html", response_class=HTMLResponse)
-def classroom_page2_page(request: Request):
-    return templates.TemplateResponse("classroom-page2.html", {"request": request})
-
-@app.get("/usage-history.html", response_class=HTMLResponse)
-def usage_history_page(request: Request):
-    return templates.TemplateResponse("usage-history.html", {"request": request})
-
-@app.get("/point.html", response_class=HTMLResponse)
-def point_page(request: Request):
-    return templates.TemplateResponse("point.html", {"request": request})
-
 
-@app.get("/mypage.html", response_class=HTMLResponse)
-def point_page(request: Request):
-    return templates.TemplateResponse("mypage.html", {"request": request})
\ No newline at end of file
+app = create_app()
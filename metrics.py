@@ -0,0 +1,241 @@
+"""
+계측: 라우트별 지연 시간 / 요청당 쿼리 수 히스토그램, OCR / 업로드 카운터, /metrics (Prometheus 텍스트 형식)
+
+- MetricsMiddleware: 요청마다 RequestStats 를 contextvar 에 두고, 엔진 이벤트가 쿼리 수와 DB 시간을 누적
+  (스레드풀 / run_sync 로 실행되는 쿼리도 같은 요청으로 집계됨)
+- SLOW_REQUEST_MS 를 지정하면 그보다 느린 요청을 실행한 SQL 과 함께 app.slow 로거로 남김
+- 값은 워커 프로세스별로 집계됨
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+router = APIRouter()
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))                 # 0 이면 느린 요청 기록 안 함
+SLOW_REQUEST_MAX_STATEMENTS = int(os.getenv("SLOW_REQUEST_MAX_STATEMENTS", "50"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+OCR_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+slow_log = logging.getLogger("app.slow")
+
+
+# ------------------------
+# 지표 타입
+# ------------------------
+def _format_labels(labelnames, values, extra=None) -> str:
+    pairs = list(zip(labelnames, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets, labelnames=()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}           # 라벨 -> [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, row in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, row):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', '+Inf'))} {row[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(row[-2])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {row[-1]}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "요청 처리 시간", LATENCY_BUCKETS,
+                            ("method", "route", "status"))
+REQUEST_QUERIES = Histogram("http_request_db_queries", "요청당 실행한 SQL 수", QUERY_COUNT_BUCKETS,
+                            ("method", "route"))
+REQUEST_DB_SECONDS = Counter("http_request_db_seconds_total", "요청 처리 중 SQL 실행에 쓴 시간", ("method", "route"))
+BACKGROUND_QUERIES = Counter("db_background_queries_total", "요청 밖(만료 처리기, 실시간 채널, OCR 완료 등)에서 실행한 SQL 수")
+OCR_DURATION = Histogram("ocr_duration_seconds", "OCR 작업 제출부터 인식 완료까지 걸린 시간", OCR_BUCKETS, ("kind",))
+OCR_JOBS = Counter("ocr_jobs_total", "끝난 OCR 작업 수", ("kind", "status", "cached"))
+UPLOAD_BYTES = Counter("upload_bytes_total", "저장한 업로드 바이트 수")
+UPLOADS = Counter("uploads_total", "업로드 처리 결과", ("result",))
+
+METRICS = [REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_SECONDS, BACKGROUND_QUERIES,
+           OCR_DURATION, OCR_JOBS, UPLOAD_BYTES, UPLOADS]
+
+
+# ------------------------
+# 요청별 쿼리 집계
+# ------------------------
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self, capture: bool):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements = [] if capture else None
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is None:
+        BACKGROUND_QUERIES.inc()
+        return
+    elapsed = time.perf_counter() - started
+    stats.queries += 1
+    stats.db_seconds += elapsed
+    if stats.statements is not None and len(stats.statements) < SLOW_REQUEST_MAX_STATEMENTS:
+        stats.statements.append((round(elapsed * 1000, 2), " ".join(statement.split())[:500]))
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(exception_context):
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+class MetricsMiddleware:
+    """
+    순수 ASGI 미들웨어 (SSE 같은 스트리밍 응답도 그대로 통과). 스트리밍 응답은 첫 바이트까지의 시간을 기록
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(capture=SLOW_REQUEST_MS > 0)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = {"code": 500, "first_byte": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = dict(message.get("headers") or [])
+                if headers.get(b"content-type", b"").startswith(b"text/event-stream"):
+                    status["first_byte"] = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = (status["first_byte"] or time.perf_counter()) - started
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            REQUEST_LATENCY.observe(elapsed, method=method, route=path, status=str(status["code"]))
+            REQUEST_QUERIES.observe(stats.queries, method=method, route=path)
+            REQUEST_DB_SECONDS.inc(stats.db_seconds, method=method, route=path)
+            if SLOW_REQUEST_MS > 0 and elapsed * 1000 >= SLOW_REQUEST_MS:
+                _log_slow_request(method, scope.get("path", ""), path, status["code"], elapsed, stats)
+
+
+def _log_slow_request(method, raw_path, route, status, elapsed, stats: RequestStats):
+    lines = [f"{method} {raw_path} ({route}) {status} {elapsed * 1000:.1f}ms, "
+             f"SQL {stats.queries}건 {stats.db_seconds * 1000:.1f}ms"]
+    lines += [f"  {ms}ms  {sql}" for ms, sql in stats.statements or []]
+    if stats.queries > len(stats.statements or []):
+        lines.append(f"  ... 외 {stats.queries - len(stats.statements or [])}건")
+    slow_log.warning("\n".join(lines))
+
+
+# ------------------------
+# 다른 모듈의 상태 (조회 시점 값)
+# ------------------------
+def _gauges() -> list:
+    from app.live import live_hub
+    from app.ocr_cache import ocr_cache
+    from app.sweeper import reservation_sweeper
+
+    sweeper = reservation_sweeper.stats()
+    live = live_hub.stats()
+    cache = ocr_cache.stats()
+    values = [
+        ("sweeper_queued", "만료 처리 대기 중인 마감 수", sweeper["queued"]),
+        ("sweeper_last_lag_seconds", "마지막 만료 배치의 지연 시간", sweeper["last_lag_sec"]),
+        ("sweeper_max_lag_seconds", "만료 배치의 최대 지연 시간", sweeper["max_lag_sec"]),
+        ("sweeper_last_batch_size", "마지막 만료 배치 크기", sweeper["last_batch_size"]),
+        ("live_subscribers", "실시간 채널 구독자 수", live["subscribers"]),
+        ("live_houses", "구독 중인 호관 수", live["houses"]),
+        ("ocr_cache_entries", "사진 인식 결과 캐시 항목 수", cache["entries"]),
+        ("ocr_cache_hit_ratio", "사진 인식 결과 캐시 적중률", cache["hit_ratio"]),
+    ]
+    lines = []
+    for name, help_text, value in values:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {_format_value(value)}"]
+    return lines
+
+
+def render() -> str:
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    lines += _gauges()
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
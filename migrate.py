@@ -0,0 +1,51 @@
+"""
+스키마 생성 (배포 / 처음 실행 때 한 번)
+
+앱 import 시점에 create_all 을 돌리지 않으므로 새 DB 나 새 테이블 / 인덱스가 추가된 뒤에는 이 명령을 먼저 실행
+없는 테이블은 만들고, 이미 있는 테이블에는 모델에 선언됐지만 DB 에 없는 인덱스만 추가 (컬럼 변경은 직접 ALTER)
+
+python -m app.migrate
+"""
+import time
+from sqlalchemy import inspect
+
+from app import models
+from app.database import engine
+
+
+def migrate() -> tuple:
+    """
+    없는 테이블과, 이미 있던 테이블에 빠진 인덱스를 생성
+    반환: (새로 만든 테이블 이름 목록, 새로 만든 인덱스 이름 목록)
+    """
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    models.Base.metadata.create_all(bind=engine)
+    created_tables = [name for name in models.Base.metadata.tables if name not in existing]
+
+    # create_all 은 이미 있는 테이블의 인덱스를 만들지 않음 (예: 나중에 추가한 복합 인덱스)
+    created_indexes = []
+    for name in existing:
+        table = models.Base.metadata.tables.get(name)
+        if table is None:
+            continue
+        present = {index["name"] for index in inspector.get_indexes(name)}
+        for index in table.indexes:
+            if index.name not in present:
+                index.create(bind=engine, checkfirst=True)
+                created_indexes.append(index.name)
+    return created_tables, created_indexes
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    tables, indexes = migrate()
+    elapsed = time.perf_counter() - started
+    if tables:
+        print(f"테이블 {len(tables)}개 생성: {', '.join(tables)}")
+    if indexes:
+        print(f"인덱스 {len(indexes)}개 생성: {', '.join(indexes)}")
+    if not tables and not indexes:
+        print(f"생성할 테이블 / 인덱스가 없습니다 ({elapsed:.2f}s)")
+    else:
+        print(f"({elapsed:.2f}s)")
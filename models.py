@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from app.database import Base
 
 # -----------------------------
@@ -38,14 +38,81 @@ class Timetable(Base):
 # -----------------------------
 class Reserve(Base):
     __tablename__ = "reserve"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # 강의실별 진행 예정 예약 조회 / 겹침 검사용
+        Index("ix_reserve_class_status_start", "class_id", "status", "start_time"),
+        # 사용자별 예약 내역 페이지 조회용 (start_time, reservation_id 순 커서)
+        Index("ix_reserve_user_start", "user_id", "start_time", "reservation_id"),
+        {'extend_existing': True},
+    )
 
     reservation_id = Column(Integer, primary_key=True, index=True)
     class_id = Column(Integer, index=True)
     user_id = Column(Integer, index=True)
     start_time = Column(DateTime)
     end_time = Column(DateTime)
-    status = Column(String(50), default="예약")                   # 상태: 예약, 사용중, 종료 등
+    status = Column(String(50), default="예약")                   # 상태: 예약, 사용중, 종료, 노쇼, 미퇴실
+
+# 강의실을 점유하고 있는 예약 상태 (종료된 예약은 강의실을 잠그지 않음)
+ACTIVE_STATUSES = ("예약", "사용중")
+
+
+class ReserveArchive(Base):
+    """
+    끝난 지 오래된 예약 (app.archive 가 reserve 에서 옮겨 옴)
+    """
+    __tablename__ = "reserve_archive"
+    __table_args__ = (
+        # 사용자별 예약 내역 페이지 조회용 (reserve 와 같은 커서)
+        Index("ix_reserve_archive_user_start", "user_id", "start_time", "reservation_id"),
+        Index("ix_reserve_archive_class_start", "class_id", "start_time"),
+    )
+
+    reservation_id = Column(Integer, primary_key=True, autoincrement=False)   # reserve 에서의 ID 그대로
+    class_id = Column(Integer)
+    user_id = Column(Integer)
+    start_time = Column(DateTime)
+    end_time = Column(DateTime)
+    status = Column(String(50))                                               # 종료, 노쇼, 미퇴실
+    archived_at = Column(DateTime)
+
+
+# -----------------------------
+# 이용 통계 (예약 이력 집계, usage_stats 가 갱신)
+# -----------------------------
+class UserUsage(Base):
+    __tablename__ = "user_usage"
+
+    user_id = Column(Integer, primary_key=True)                    # reserve.user_id 와 같은 값
+    total_sessions = Column(Integer, default=0, nullable=False)    # 퇴실 인증까지 마친 예약 수
+    total_minutes = Column(Integer, default=0, nullable=False)     # 그 예약들의 이용 시간 합 (분)
+    no_show_count = Column(Integer, default=0, nullable=False)     # 노쇼
+    overstay_count = Column(Integer, default=0, nullable=False)    # 미퇴실
+
+
+class RoomUsage(Base):
+    __tablename__ = "room_usage"
+
+    class_id = Column(Integer, primary_key=True)
+    total_sessions = Column(Integer, default=0, nullable=False)
+    total_minutes = Column(Integer, default=0, nullable=False)
+    no_show_count = Column(Integer, default=0, nullable=False)
+    overstay_count = Column(Integer, default=0, nullable=False)
+
+
+class RoomHourly(Base):
+    """
+    강의실 x 요일 x 시간대 누적 집계 (이용률 히트맵용)
+    """
+    __tablename__ = "room_hourly"
+
+    class_id = Column(Integer, primary_key=True)
+    weekday = Column(Integer, primary_key=True)                          # 0=월 ~ 6=일
+    hour = Column(Integer, primary_key=True)                             # 0 ~ 23
+    reserved_minutes = Column(Integer, default=0, nullable=False)        # 끝난 예약이 잡았던 시간 (분)
+    used_minutes = Column(Integer, default=0, nullable=False)            # 그중 사용 인증을 한 예약의 시간 (분)
+    no_show_count = Column(Integer, default=0, nullable=False)           # 이 시간대에 시작한 노쇼 예약 수
+    weekly_lecture_minutes = Column(Integer, default=0, nullable=False)  # 시간표상 주당 수업 시간 (분)
 
 
 # -----------------------------
@@ -53,6 +120,11 @@ class Reserve(Base):
 # -----------------------------
 class Point(Base):
     __tablename__ = "point"
+    __table_args__ = (
+        # 사용자별 포인트 이력 페이지 조회용 (time, id 순 커서)
+        Index("ix_point_user_time", "user_id", "time", "id"),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(String(20))
     plus = Column(Integer, default=0)
@@ -0,0 +1,77 @@
+import os
+import time
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.models import Class, Reserve, ACTIVE_STATUSES
+from app.timetable_cache import timetable_cache
+
+# 같은 호관을 여러 탭이 폴링하므로 짧은 시간 동안 계산 결과를 재사용
+SNAPSHOT_TTL_SEC = float(os.getenv("OCCUPANCY_SNAPSHOT_TTL_SEC", "5"))
+
+# house_id -> (만료 시각, 강의실 상태 목록)
+_snapshots = {}
+
+
+def compute_house_occupancy(db: Session, house_id: int, now: datetime = None) -> list:
+    """
+    호관 전체 강의실의 잠금 상태를 강의실 수와 무관하게 3번의 쿼리로 계산
+    (강의실, 진행 중 예약, 시간표. 시간표는 비트셋 캐시가 비었거나 다시 적재할 때만 조회)
+
+    - 수동 잠금: Class.lock == "Y"
+    - 예약 잠금: now 시점에 진행 중인 예약 (예약 / 사용중)
+    - 수업 잠금: 오늘 요일(Timetable.weekend)의 현재 시각이 포함된 강의 (시간표 비트셋 캐시)
+    """
+    now = now or datetime.now()
+
+    # 1. 해당 호관 강의실들 조회
+    rooms = db.query(Class.class_id, Class.lock).filter(Class.house_id == house_id).all()
+    if not rooms:
+        return []
+
+    # 2. 현재 진행 중인 예약이 있는 강의실 (DateTime 컬럼은 datetime 과 비교)
+    reserved = {
+        row.class_id for row in db.query(Reserve.class_id)
+        .join(Class, Class.class_id == Reserve.class_id)
+        .filter(
+            Class.house_id == house_id,
+            Reserve.status.in_(ACTIVE_STATUSES),
+            Reserve.start_time <= now,
+            Reserve.end_time > now,
+        ).distinct()
+    }
+
+    # 3. 오늘 요일에 현재 시각(시 단위)이 수업 시간에 포함되는 강의실
+    in_lecture = timetable_cache.rooms_in_lecture(db, [room.class_id for room in rooms], now)
+
+    return [
+        {
+            "class_id": room.class_id,
+            "locked": room.lock == "Y" or room.class_id in reserved or room.class_id in in_lecture
+        }
+        for room in rooms
+    ]
+
+
+def get_house_occupancy(db: Session, house_id: int) -> list:
+    """
+    현재 시각 기준 호관 잠금 상태. SNAPSHOT_TTL_SEC 동안은 프로세스 내 스냅샷을 반환
+    """
+    cached = _snapshots.get(house_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    rooms = compute_house_occupancy(db, house_id)
+    if SNAPSHOT_TTL_SEC > 0:
+        _snapshots[house_id] = (time.monotonic() + SNAPSHOT_TTL_SEC, rooms)
+    return rooms
+
+
+def invalidate(house_id: int = None):
+    """
+    예약 / 잠금 변경 시 스냅샷 무효화 (house_id 가 없으면 전체)
+    """
+    if house_id is None:
+        _snapshots.clear()
+    else:
+        _snapshots.pop(house_id, None)
@@ -0,0 +1,259 @@
+"""
+사진 인증 OCR 작업 풀
+
+요청 처리 중에 OCR 을 직접 돌리지 않고 제한된 크기의 프로세스 풀에 맡긴 뒤 작업 번호를 돌려줌
+작업이 끝나면 예약 상태(예약 -> 사용중, 사용중 -> 종료)를 별도 세션으로 반영
+
+작업 목록은 워커 프로세스마다 따로 관리되므로, 여러 워커로 띄울 때는 상태 조회가
+다른 워커로 가면 404 가 될 수 있음 (예약 상태 자체는 DB 에 반영되므로 my-reservations 로 확인 가능)
+"""
+import asyncio
+import importlib
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from app.database import SessionLocal
+from app.models import Reserve
+from app import metrics, reservation_events, room_hourly, usage_stats
+from app.ocr_cache import ocr_cache, perceptual_hash
+from app.uploads import StoredUpload
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "2"))
+OCR_EXECUTOR = os.getenv("OCR_EXECUTOR", "process")              # process / thread
+OCR_MAX_PENDING = int(os.getenv("OCR_MAX_PENDING", "64"))        # 대기 작업 상한 (넘으면 503)
+OCR_JOB_TTL_SEC = float(os.getenv("OCR_JOB_TTL_SEC", "600"))     # 끝난 작업 결과 보관 시간
+
+# 작업 상태
+PENDING, SUCCEEDED, MISMATCHED, FAILED = "처리중", "완료", "불일치", "실패"
+
+# 인증 종류별 OCR 함수와 상태 전이, 응답 문구
+OCR_KINDS = {
+    "checkin": {
+        "module": "app.services.in_image",
+        "function": "extract_room_number",
+        "from_status": "예약",
+        "to_status": "사용중",
+        "success": "사용 인증 완료되었습니다.",
+        "mismatch": "인식된 강의실 번호({})가 예약된 강의실과 일치하지 않습니다.",
+    },
+    "checkout": {
+        "module": "app.services.out_image",
+        "function": "extract_room_number_for_checkout",
+        "from_status": "사용중",
+        "to_status": "종료",
+        "success": "퇴실 인증 완료되었습니다.",
+        "mismatch": "인식된 강의실 번호({})가 예약 강의실과 다릅니다.",
+    },
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_jobs = {}          # job_id -> OcrJob
+_active = {}        # (kind, reservation_id) -> job_id (처리 중인 작업 중복 제출 방지)
+_jobs_lock = threading.Lock()
+
+
+def recognize(module: str, function: str, path: str) -> str:
+    """
+    OCR 워커 프로세스에서 실행: 무거운 OCR 모듈은 여기서 처음 import
+    """
+    return getattr(importlib.import_module(module), function)(path)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            pool = ProcessPoolExecutor if OCR_EXECUTOR == "process" else ThreadPoolExecutor
+            _executor = pool(max_workers=OCR_WORKERS)
+        return _executor
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class OcrJob:
+    def __init__(self, kind: str, info: reservation_events.ReservationInfo, stored: StoredUpload):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.info = info
+        self.stored = stored
+        self.phash = None
+        self.cached = False
+        self.status = PENDING
+        self.recognized_room = None
+        self.message = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.done = Future()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "reservation_id": self.info.reservation_id,
+            "status": self.status,
+            "recognized_room": self.recognized_room,
+            "message": self.message,
+            "cached": self.cached,
+        }
+
+
+def _purge_finished():
+    cutoff = time.time() - OCR_JOB_TTL_SEC
+    for job_id in [j for j, job in _jobs.items() if job.finished_at and job.finished_at < cutoff]:
+        del _jobs[job_id]
+
+
+async def submit(kind: str, info: reservation_events.ReservationInfo, stored: StoredUpload) -> OcrJob:
+    """
+    OCR 작업 제출. 같은 예약에 처리 중인 작업이 있으면 그 작업을 돌려줌
+
+    같은(또는 거의 같은) 사진의 인식 결과가 캐시에 있으면 풀을 거치지 않고 바로 결과를 반영
+    """
+    spec = OCR_KINDS[kind]
+    with _jobs_lock:
+        _purge_finished()
+        existing = _active.get((kind, info.reservation_id))
+        if existing:
+            return _jobs[existing]
+        if len(_active) >= OCR_MAX_PENDING:
+            raise HTTPException(status_code=503, detail="사진 인증 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+        job = OcrJob(kind, info, stored)
+        _jobs[job.job_id] = job
+        _active[(kind, info.reservation_id)] = job.job_id
+
+    # 조회 한 번에 hit / phash_hit / miss 중 하나만 집계 (phash 단계가 있으면 miss 는 거기서)
+    use_phash = ocr_cache.phash_distance > 0
+    extracted = ocr_cache.get(stored.sha256, count_miss=not use_phash)
+    if extracted is None and use_phash:
+        job.phash = await run_in_threadpool(perceptual_hash, stored.path)
+        extracted = ocr_cache.get(stored.sha256, job.phash)
+    if extracted is not None:
+        job.cached = True
+        await run_in_threadpool(_apply_result, job, extracted)
+        return job
+
+    try:
+        future = _get_executor().submit(recognize, spec["module"], spec["function"], stored.path)
+    except Exception:
+        _finish(job, FAILED, "사진 인증 작업을 시작하지 못했습니다.")
+        raise HTTPException(status_code=503, detail="사진 인증 작업을 시작하지 못했습니다.")
+    loop = asyncio.get_running_loop()
+    future.add_done_callback(lambda f: _hand_off(loop, job, f))
+    return job
+
+
+def _hand_off(loop, job: OcrJob, future):
+    # 풀의 관리 스레드에서 실행: 여기서 DB 에 쓰면 모든 작업의 결과 수집 / 작업 전달이 멈추므로 넘기기만 함
+    try:
+        loop.call_soon_threadsafe(_start_completion, job, future)
+    except RuntimeError:
+        # 이벤트 루프가 이미 닫힘 (종료 중)
+        _finish(job, FAILED, "사진 인증 작업이 중단되었습니다.")
+
+
+_completions = set()    # 진행 중인 결과 반영 태스크 (GC 방지)
+
+
+def _start_completion(job: OcrJob, future):
+    task = asyncio.get_running_loop().create_task(run_in_threadpool(_complete, job, future))
+    _completions.add(task)
+    task.add_done_callback(_completions.discard)
+
+
+def _complete(job: OcrJob, future):
+    # 스레드풀에서 실행 (DB 반영)
+    metrics.OCR_DURATION.observe(time.time() - job.created_at, kind=job.kind)
+    try:
+        extracted = future.result()
+    except Exception:
+        _finish(job, FAILED, "사진에서 강의실 번호를 인식하지 못했습니다.")
+        return
+    ocr_cache.put(job.stored.sha256, extracted, job.phash)
+    _apply_result(job, extracted)
+
+
+def _apply_result(job: OcrJob, extracted: str):
+    spec = OCR_KINDS[job.kind]
+    job.recognized_room = extracted
+
+    if extracted != str(job.info.class_id):
+        _finish(job, MISMATCHED, spec["mismatch"].format(extracted))
+        return
+
+    try:
+        with SessionLocal() as db:
+            # 작업 중에 취소 / 만료되었을 수 있으므로 기대 상태일 때만 전이
+            updated = db.query(Reserve).filter(
+                Reserve.reservation_id == job.info.reservation_id,
+                Reserve.status == spec["from_status"]
+            ).update({Reserve.status: spec["to_status"]}, synchronize_session=False)
+            if updated:
+                usage_stats.record(db, job.info, spec["to_status"])
+                room_hourly.record(db, job.info, spec["to_status"])
+            db.commit()
+    except Exception:
+        _finish(job, FAILED, "인증 결과를 저장하지 못했습니다.")
+        return
+
+    if not updated:
+        _finish(job, FAILED, "예약 상태가 변경되어 인증을 반영하지 못했습니다.")
+        return
+    reservation_events.status_changed(job.info, spec["from_status"], spec["to_status"])
+    _finish(job, SUCCEEDED, spec["success"])
+
+
+def _finish(job: OcrJob, status: str, message: str):
+    job.status = status
+    job.message = message
+    job.finished_at = time.time()
+    metrics.OCR_JOBS.inc(kind=job.kind, status=status, cached="yes" if job.cached else "no")
+    with _jobs_lock:
+        _active.pop((job.kind, job.info.reservation_id), None)
+    if not job.done.done():
+        job.done.set_result(status)
+
+
+def get_job(job_id: str) -> OcrJob:
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="인증 작업을 찾을 수 없습니다.")
+    return job
+
+
+async def wait_for(job: OcrJob, wait: float):
+    """
+    작업이 끝나거나 wait 초가 지날 때까지 대기 (이벤트 루프는 막지 않음)
+    """
+    if wait > 0 and not job.done.done():
+        await asyncio.wait({asyncio.wrap_future(job.done)}, timeout=wait)
+
+
+async def respond(job: OcrJob, wait: float):
+    """
+    wait 초 안에 끝나면 기존 동기 API 와 같은 응답, 아니면 202 와 작업 정보를 반환
+    """
+    await wait_for(job, wait)
+    if not job.done.done():
+        return JSONResponse(status_code=202, content=job.to_dict())
+
+    if job.status == SUCCEEDED:
+        return {
+            "message": job.message,
+            "recognized_room": job.recognized_room,
+            "status": OCR_KINDS[job.kind]["to_status"],
+            "job_id": job.job_id,
+        }
+    raise HTTPException(status_code=400 if job.status == MISMATCHED else 409, detail=job.message)
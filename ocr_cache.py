@@ -0,0 +1,102 @@
+"""
+사진 내용 해시 -> 인식된 강의실 번호 캐시
+
+같은 사진으로 다시 인증하거나 입실 / 퇴실 사진이 거의 같을 때 OCR 을 다시 돌리지 않음
+- 정확히 같은 사진: sha256 으로 조회
+- 거의 같은 사진: OCR_CACHE_PHASH_DISTANCE > 0 이고 Pillow 가 있으면 dHash 해밍 거리로 조회
+- LRU (OCR_CACHE_SIZE) + TTL (OCR_CACHE_TTL_SEC) 로 정리
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+OCR_CACHE_SIZE = int(os.getenv("OCR_CACHE_SIZE", "1024"))
+OCR_CACHE_TTL_SEC = float(os.getenv("OCR_CACHE_TTL_SEC", "3600"))
+OCR_CACHE_PHASH_DISTANCE = int(os.getenv("OCR_CACHE_PHASH_DISTANCE", "0"))   # 0 이면 정확히 같은 사진만
+
+
+def perceptual_hash(path: str):
+    """
+    64비트 dHash (9x8 흑백 축소 후 가로 방향 밝기 차이). Pillow 가 없거나 읽지 못하면 None
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(path) as image:
+            pixels = list(image.convert("L").resize((9, 8)).getdata())
+    except Exception:
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+
+class OcrResultCache:
+    def __init__(self, size: int = OCR_CACHE_SIZE, ttl: float = OCR_CACHE_TTL_SEC,
+                 phash_distance: int = OCR_CACHE_PHASH_DISTANCE):
+        self.size = size
+        self.ttl = ttl
+        self.phash_distance = phash_distance
+        self._entries = OrderedDict()   # sha256 -> (만료 시각, 강의실 번호, dHash)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.phash_hits = 0
+        self.misses = 0
+
+    def get(self, sha256: str, phash=None, count_miss: bool = True):
+        """
+        내용 해시로 찾고, 없으면 phash 가 주어졌을 때 가까운 사진을 찾음
+        phash 를 아직 계산하지 않은 1차 조회는 count_miss=False 로 불러 한 번의 조회가 두 번 집계되지 않게 함
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(sha256)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(sha256)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[sha256]
+
+            if phash is not None and self.phash_distance > 0:
+                for key, (expires, room, other) in reversed(self._entries.items()):
+                    if other is not None and expires > now and bin(phash ^ other).count("1") <= self.phash_distance:
+                        self._entries.move_to_end(key)
+                        self.phash_hits += 1
+                        return room
+
+            if count_miss:
+                self.misses += 1
+            return None
+
+    def put(self, sha256: str, room: str, phash=None):
+        if self.size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[sha256] = (time.monotonic() + self.ttl, room, phash)
+            self._entries.move_to_end(sha256)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.phash_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "phash_hits": self.phash_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.phash_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+
+# 입실 / 퇴실 인증이 함께 쓰는 워커 프로세스 전역 캐시
+ocr_cache = OcrResultCache()
@@ -0,0 +1,222 @@
+"""
+HTML 페이지 / 정적 파일 서빙
+
+- 페이지: 템플릿 컨텍스트가 request 뿐이라 내용이 요청마다 같음 -> 한 번 렌더링한 결과를 압축본과 함께 보관하고
+  템플릿 파일이 바뀌면(mtime) 다시 렌더링. 렌더링 결과를 모든 요청이 공유하므로 url_for 는 요청의 scheme / host 가
+  들어간 절대 주소 대신 루트 기준 경로(/static/...)를 돌려줌 (라우트 정보가 필요해서 첫 요청 때 렌더링)
+- 정적 파일: STATIC_CACHE_MAX_BYTES 이하 파일은 메모리에 원본 / 압축본을 두고 제공, 큰 파일은 기존 FileResponse
+- 공통: Accept-Encoding 에 따라 br(brotli 설치 시) / gzip / 원본, 표현별 ETag + Last-Modified 로 304 응답
+  렌더링 / 파일 읽기 / 압축은 캐시에 없을 때만 스레드풀에서 (첫 요청이 워커의 이벤트 루프를 막지 않게)
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from email.utils import formatdate
+from fastapi import APIRouter, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip 만 제공
+    brotli = None
+
+from app.conditional import not_modified
+
+STATIC_DIR = os.getenv("STATIC_DIR", "static")
+TEMPLATES_DIR = os.getenv("TEMPLATES_DIR", "templates")
+
+# 정적 파일 브라우저 캐시 시간 (파일명에 버전이 없으므로 짧게 두고 이후에는 ETag 로 재검증)
+STATIC_MAX_AGE_SEC = int(os.getenv("STATIC_MAX_AGE_SEC", "3600"))
+# 이보다 큰 정적 파일은 메모리에 두지 않음
+STATIC_CACHE_MAX_BYTES = int(os.getenv("STATIC_CACHE_MAX_BYTES", str(1 << 20)))
+# 이보다 작은 본문은 압축하지 않음 (헤더 비용이 더 큼)
+COMPRESS_MIN_BYTES = 512
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+
+# 경로 -> 템플릿
+PAGES = {
+    "/login": "login.html",
+    "/mainmenu.html": "mainmenu.html",
+    "/classroom-search1.html": "classroom-search1.html",
+    "/classroom-search2.html": "classroom-search2.html",
+    "/classroom-page1.html": "classroom-page1.html",
+    "/classroom-page2.html": "classroom-page2.html",
+    "/usage-history.html": "usage-history.html",
+    "/point.html": "point.html",
+    "/mypage.html": "mypage.html",
+}
+
+router = APIRouter()
+templates = Jinja2Templates(directory=TEMPLATES_DIR)
+
+
+def _accepted_encodings(header: str) -> dict:
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+class CompressedAsset:
+    """
+    본문 하나의 원본 / 압축본과 검증자. 압축본은 원본보다 작을 때만 보관
+    """
+    def __init__(self, body: bytes, media_type: str, modified_at: float, cache_control: str, version=None):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.version = version
+        self.modified_at = int(modified_at)
+        self.last_modified = formatdate(self.modified_at, usegmt=True)
+
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        # 표현(인코딩)마다 본문이 다르므로 ETag 도 따로
+        self.variants = {"identity": (body, f'"{digest}"')}
+        if len(body) >= COMPRESS_MIN_BYTES and media_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed["br"] = brotli.compress(body, quality=11)
+            for encoding, data in compressed.items():
+                if len(data) < len(body):
+                    self.variants[encoding] = (data, f'"{digest}-{encoding}"')
+
+    def _choose(self, request: Request) -> str:
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return "identity"
+
+    def response(self, request: Request) -> Response:
+        encoding = self._choose(request)
+        body, etag = self.variants[encoding]
+        headers = {"ETag": etag, "Last-Modified": self.last_modified, "Cache-Control": self.cache_control}
+        if len(self.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if not_modified(request, etag, self.modified_at):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+class PageCache:
+    """
+    템플릿별 렌더링 결과 (템플릿 파일 mtime 이 바뀌면 다시 렌더링)
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    async def response(self, request: Request, name: str) -> Response:
+        stat = os.stat(os.path.join(self.directory, name))
+        version = (stat.st_mtime_ns, stat.st_size)
+        # root_path 는 배포 설정(프록시 하위 경로)이라 값이 몇 개뿐이므로 키에 포함
+        key = (name, request.scope.get("root_path", ""))
+        page = self._pages.get(key)
+        if page is None or page.version != version:
+            page = await run_in_threadpool(self._build, request, name, key, stat)
+        return page.response(request)
+
+    def _build(self, request: Request, name: str, key: tuple, stat) -> CompressedAsset:
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None or page.version != version:
+                body = self._render(request, name).encode("utf-8")
+                page = CompressedAsset(body, "text/html; charset=utf-8", stat.st_mtime, "no-cache", version)
+                self._pages[key] = page
+        return page
+
+    @staticmethod
+    def _render(request: Request, name: str) -> str:
+        root_path = request.scope.get("root_path", "")
+
+        def url_for(route_name: str, /, **path_params) -> str:
+            # 기본 url_for (request.url_for) 는 첫 요청의 scheme / host 로 절대 주소를 만듦
+            return root_path + str(request.app.url_path_for(route_name, **path_params))
+
+        return templates.get_template(name).render({"request": request, "url_for": url_for})
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    작은 정적 파일은 메모리에서 (압축본 포함) 제공. 파일이 바뀌면 (mtime, 크기) 로 감지해 다시 읽음
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        if status_code != 200 or stat_result.st_size > STATIC_CACHE_MAX_BYTES:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers.setdefault("Cache-Control", f"public, max-age={STATIC_MAX_AGE_SEC}")
+            return response
+
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+        asset = self._assets.get(full_path)
+        if asset is None or asset.version != version:
+            # file_response 는 이벤트 루프에서 동기로 불리므로 읽기 / 압축은 응답을 보낼 때 스레드풀에서
+            return _DeferredAssetResponse(self._load, full_path, stat_result)
+        return asset.response(Request(scope))
+
+    def _load(self, full_path, stat_result) -> CompressedAsset:
+        with open(full_path, "rb") as f:
+            body = f.read()
+        media_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+        asset = CompressedAsset(body, media_type, stat_result.st_mtime,
+                                f"public, max-age={STATIC_MAX_AGE_SEC}", (stat_result.st_mtime_ns, stat_result.st_size))
+        with self._lock:
+            self._assets[full_path] = asset
+        return asset
+
+
+class _DeferredAssetResponse(Response):
+    """
+    캐시에 없는 정적 파일: 보낼 때 스레드풀에서 읽고 압축한 뒤 캐시된 응답을 그대로 보냄
+    """
+    def __init__(self, load, full_path, stat_result):
+        self._load = load
+        self._args = (full_path, stat_result)
+
+    async def __call__(self, scope, receive, send):
+        asset = await run_in_threadpool(self._load, *self._args)
+        await asset.response(Request(scope))(scope, receive, send)
+
+
+page_cache = PageCache(TEMPLATES_DIR)
+
+
+def _page_route(name: str):
+    async def page(request: Request):
+        return await page_cache.response(request, name)
+    page.__name__ = name.removesuffix(".html").replace("-", "_") + "_page"
+    return page
+
+
+for _path, _name in PAGES.items():
+    router.add_api_route(_path, _page_route(_name), methods=["GET"], response_class=HTMLResponse)
@@ -0,0 +1,62 @@
+from datetime import datetime
+from fastapi import HTTPException, Response
+from sqlalchemy import or_
+
+# 다음 페이지 커서를 담는 응답 헤더 (응답 본문 형식은 기존 목록 그대로 유지)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(time_value: datetime, row_id: int) -> str:
+    return f"{time_value.isoformat()}_{row_id}"
+
+
+def decode_cursor(cursor: str):
+    try:
+        time_part, id_part = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(time_part), int(id_part)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 페이지 커서입니다.")
+
+
+def keyset_page(query, time_column, id_column, cursor: str, limit: int):
+    """
+    (time, id) 내림차순 키셋 페이지네이션
+
+    커서 이후 행만 인덱스 순서대로 limit + 1 개 읽으므로 이력 길이와 무관하게 비용이 일정함
+    반환: (행 목록, 다음 커서 또는 None)
+    """
+    if cursor:
+        last_time, last_id = decode_cursor(cursor)
+        # time <= last_time 조건으로 인덱스 범위 탐색을 시작하고, 같은 시각은 id 로 구분
+        query = query.filter(
+            time_column <= last_time,
+            or_(time_column < last_time, id_column < last_id),
+        )
+    rows = query.order_by(time_column.desc(), id_column.desc()).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, time_column.key), getattr(last, id_column.key))
+
+
+def set_next_cursor(response: Response, next_cursor: str):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def merge_keyset_pages(pages, time_key: str, id_key: str, limit: int):
+    """
+    같은 커서로 여러 테이블에서 읽은 keyset_page 결과를 (time, id) 내림차순으로 합쳐 한 페이지로
+    """
+    rows = sorted((row for page, _ in pages for row in page),
+                  key=lambda row: (getattr(row, time_key), getattr(row, id_key)), reverse=True)
+    if len(rows) <= limit and not any(next_cursor for _, next_cursor in pages):
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, time_key), getattr(last, id_key))
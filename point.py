@@ -1,13 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app import models
+from app import ledger
+from app.database import get_db, get_async_db
+from app.jwt_handler import get_current_user, ensure_same_user
+from app.pagination import keyset_page, set_next_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
-# 포인트정보 저장용 (DB에서 구현 계획이라면 Reserve처럼 모델을 만들고 연결)
-user_points = {}
+# 적립 / 차감 사유별 포인트
+POINTS_TO_ADD = {
+    "lecture_completed": 5,
+    "cancel_before_15min": 5,
+    "report_misuse": 10,
+}
+POINTS_TO_DEDUCT = {
+    "no_checkout": 15,
+    "no_auth_in_time": 10,
+}
 
 # 포인트 요청 목록
 class PointRequest(BaseModel):
@@ -16,57 +29,60 @@ class PointRequest(BaseModel):
 
 # 포인트 적립
 @router.post("/points/add")
-def add_points(req: PointRequest, db: Session = Depends(get_db)):
-    points_to_add = {
-        "lecture_completed": 5,
-        "cancel_before_15min": 5,
-        "report_misuse": 10,
-    }
-    if req.reason not in points_to_add:
+def add_points(req: PointRequest, db: Session = Depends(get_db), current_user: str = Depends(get_current_user)):
+    ensure_same_user(req.user_id, current_user)
+    if req.reason not in POINTS_TO_ADD:
         raise HTTPException(status_code=400, detail="알 수 없는 적립 사유입니다.")
-    if req.user_id not in user_points:
-        user_points[req.user_id] = 100
-    user_points[req.user_id] += points_to_add[req.reason]
+    points = ledger.apply_points(db, req.user_id, POINTS_TO_ADD[req.reason])
     return {
         "user_id": req.user_id,
-        "points": user_points[req.user_id],
-        "message": f"{points_to_add[req.reason]}포인트 적립 완료"
+        "points": points,
+        "message": f"{POINTS_TO_ADD[req.reason]}포인트 적립 완료"
     }
 
 # 포인트 차감
 @router.post("/points/deduct")
-def deduct_points(req: PointRequest, db: Session = Depends(get_db)):
-    points_to_deduct = {
-        "no_checkout": 15,
-        "no_auth_in_time": 10,
-    }
-    if req.reason not in points_to_deduct:
+def deduct_points(req: PointRequest, db: Session = Depends(get_db), current_user: str = Depends(get_current_user)):
+    ensure_same_user(req.user_id, current_user)
+    if req.reason not in POINTS_TO_DEDUCT:
         raise HTTPException(status_code=400, detail="알 수 없는 차감 사유입니다.")
-    if req.user_id not in user_points:
-        user_points[req.user_id] = 100
-    user_points[req.user_id] -= points_to_deduct[req.reason]
-    if user_points[req.user_id] < 0:
-        user_points[req.user_id] = 0
+    points = ledger.apply_points(db, req.user_id, -POINTS_TO_DEDUCT[req.reason])
     return {
         "user_id": req.user_id,
-        "points": user_points[req.user_id],
-        "message": f"{points_to_deduct[req.reason]}포인트 차감 완료"
+        "points": points,
+        "message": f"{POINTS_TO_DEDUCT[req.reason]}포인트 차감 완료"
     }
 
 # 포인트 조회
 @router.get("/points/{user_id}")
-def get_points(user_id: str, db: Session = Depends(get_db)):
-    if user_id not in user_points:
-        user_points[user_id] = 100
+async def get_points(user_id: str, db: AsyncSession = Depends(get_async_db), current_user: str = Depends(get_current_user)):
+    ensure_same_user(user_id, current_user)
+    return await db.run_sync(lambda sync_db: read_points(user_id, sync_db))
+
+# 포인트 조회 (predict 등 다른 모듈에서 인증 없이 호출)
+def read_points(user_id: str, db: Session):
     return {
         "user_id": user_id,
-        "points": user_points[user_id]
+        "points": ledger.get_balance(db, user_id)
     }
 
 # 포인트 이력 확인
 @router.get("/history/{user_id}")
-def get_point_history(user_id: str, db: Session = Depends(get_db)):
-    history = db.query(models.Point).filter(models.Point.user_id == user_id).order_by(models.Point.time.desc()).all()
+async def get_point_history(
+    user_id: str,
+    response: Response,
+    cursor: str = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user)
+):
+    ensure_same_user(user_id, current_user)
+    # 최신순 한 페이지만 (user_id, time, id) 인덱스로 조회
+    history, next_cursor = await db.run_sync(lambda sync_db: keyset_page(
+        sync_db.query(models.Point).filter(models.Point.user_id == user_id),
+        models.Point.time, models.Point.id, cursor, limit
+    ))
+    set_next_cursor(response, next_cursor)
     if not history:
         return []
 
@@ -87,5 +103,3 @@ def get_reason_description(plus: int, minus: int) -> str:
     elif plus == 5: return "정상 이용 완료 / 예약 취소"
     elif minus == 15: return "예약 시간 종료 후 미퇴실"
     else: return "기타 포인트 기록"
-
-
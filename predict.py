@@ -1,23 +1,37 @@
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, HTTPException
 from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app import ledger
 from app.database import get_db
-from app.point import get_points
+from app.models import Class, Reserve, ACTIVE_STATUSES
+from app.point import read_points
+from app.jwt_handler import get_current_user
 from app.probability import ProbabilityManager, convert_point_to_trust_score
 
 router = APIRouter()
 
+# 요청마다 새로 만들지 않고 확률표와 함께 재사용
+probability_manager = ProbabilityManager()
+
 @router.get("/predict/{user_id}")
-def predict_probability(user_id: str, start_time: str = Query(...), db: Session = Depends(get_db)):
+def predict_probability(
+    user_id: str,
+    start_time: str = Query(...),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user)
+):
+    # user_id 는 예약자(다른 학생일 수 있음), 요청자는 로그인만 확인
     start_dt = datetime.fromisoformat(start_time)
     elapsed_min = int((datetime.now() - start_dt).total_seconds() // 60)
 
-    point_data = get_points(user_id, db)
+    point_data = read_points(user_id, db)
     points = point_data["points"]
     trust_score = convert_point_to_trust_score(points)
 
-    prob = ProbabilityManager().get_empty_probability(elapsed_min, trust_score)
+    prob = probability_manager.get_empty_probability(elapsed_min, trust_score)
 
     return {
         "user_id": user_id,
@@ -25,4 +39,79 @@ def predict_probability(user_id: str, start_time: str = Query(...), db: Session
         "points": points,
         "trust_score": round(trust_score, 2),
         "empty_probability": f"{prob}%"
-    }
\ No newline at end of file
+    }
+
+
+# 일괄 예측 요청 (강의실 또는 예약 번호 목록)
+class BatchPredictRequest(BaseModel):
+    class_ids: Optional[List[int]] = None
+    reservation_ids: Optional[List[int]] = None
+
+
+def predict_reservations(db: Session, reservations: list, now: datetime = None) -> list:
+    """
+    진행 중 예약들의 빈 강의실 확률을 한 번에 계산
+
+    예약자 잔액은 한 번에 조회하고, 확률은 (경과 분, 신뢰도) 확률표에서 NumPy 로 일괄 조회
+    """
+    if not reservations:
+        return []
+    import numpy as np
+    now = now or datetime.now()
+
+    balances = ledger.get_balances(db, [str(r.user_id) for r in reservations])
+    points = np.array([balances.get(str(r.user_id), 0) for r in reservations], dtype=float)
+    start_ts = np.array([r.start_time.timestamp() for r in reservations])
+
+    elapsed = ((now.timestamp() - start_ts) // 60).astype(int)
+    trust = np.clip(points / 200, 0.0, 1.0)
+    probs = probability_manager.lookup_probabilities(elapsed, trust)
+
+    return [
+        {
+            "reservation_id": r.reservation_id,
+            "class_id": r.class_id,
+            "user_id": r.user_id,
+            "elapsed_time_min": int(e),
+            "trust_score": round(float(t), 2),
+            "empty_probability": int(p),
+        }
+        for r, e, t, p in zip(reservations, elapsed, trust, probs)
+    ]
+
+
+def _active_reservations(db: Session, now: datetime):
+    # 지금 진행 중인 예약 (시작 시각이 지났고 아직 끝나지 않은 예약 / 사용중)
+    return db.query(Reserve.reservation_id, Reserve.class_id, Reserve.user_id, Reserve.start_time).filter(
+        Reserve.status.in_(ACTIVE_STATUSES),
+        Reserve.start_time <= now,
+        Reserve.end_time > now,
+    )
+
+
+@router.get("/predict/house/{house_id}")
+def predict_house(house_id: int, db: Session = Depends(get_db), current_user: str = Depends(get_current_user)):
+    """
+    호관의 진행 중 예약 전체에 대한 빈 강의실 확률 (empty_probability 는 0 ~ 100 정수)
+    """
+    now = datetime.now()
+    reservations = _active_reservations(db, now) \
+        .join(Class, Class.class_id == Reserve.class_id) \
+        .filter(Class.house_id == house_id).all()
+    return {"house_id": house_id, "predictions": predict_reservations(db, reservations, now)}
+
+
+@router.post("/predict/batch")
+def predict_batch(req: BatchPredictRequest, db: Session = Depends(get_db), current_user: str = Depends(get_current_user)):
+    """
+    강의실 / 예약 번호 목록의 진행 중 예약에 대한 빈 강의실 확률
+    """
+    if not req.class_ids and not req.reservation_ids:
+        raise HTTPException(status_code=400, detail="class_ids 또는 reservation_ids 가 필요합니다.")
+    now = datetime.now()
+    query = _active_reservations(db, now)
+    if req.class_ids:
+        query = query.filter(Reserve.class_id.in_(req.class_ids))
+    if req.reservation_ids:
+        query = query.filter(Reserve.reservation_id.in_(req.reservation_ids))
+    return {"predictions": predict_reservations(db, query.all(), now)}
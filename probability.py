@@ -1,4 +1,12 @@
 import math
+from typing import TYPE_CHECKING
+
+# NumPy 는 배열 계산 메서드가 처음 호출될 때 import (앱 기동 시간 단축)
+if TYPE_CHECKING:
+    import numpy as np
+
+# 룩업 테이블의 신뢰도 구간 수 (0.005 단위 = 포인트 1점 단위)
+TRUST_BUCKETS = 200
 
 class ProbabilityManager:
     def __init__(self, max_duration_min=180):
@@ -6,6 +14,7 @@ class ProbabilityManager:
         최대 사용 시간 설정 (기본값: 3시간 = 180분)
         """
         self.max_duration_min = max_duration_min
+        self._table = None
 
     def get_empty_probability(self, elapsed_time_min: int, trust_score: float) -> int:
         """
@@ -24,6 +33,47 @@ class ProbabilityManager:
         probability = (1 - math.exp(-decay_speed * elapsed_ratio)) * 100
         return round(probability)
 
+    def get_empty_probabilities(self, elapsed_time_min, trust_score) -> "np.ndarray":
+        """
+        get_empty_probability 의 배열 버전 (같은 식을 NumPy 로 한 번에 계산)
+
+        Parameters:
+        - elapsed_time_min: 경과 시간 배열 (분 단위)
+        - trust_score: 신뢰도 배열 (0.0 ~ 1.0)
+
+        Returns:
+        - 정수형 확률값 배열 (0 ~ 100%)
+        """
+        import numpy as np
+        trust_score = np.clip(np.asarray(trust_score, dtype=float), 0.0, 1.0)
+        elapsed_ratio = np.minimum(np.asarray(elapsed_time_min, dtype=float) / self.max_duration_min, 1.0)
+        probability = (1 - np.exp(-(2.0 - trust_score) * elapsed_ratio)) * 100
+        return np.rint(probability).astype(int)
+
+    def lookup_table(self) -> "np.ndarray":
+        """
+        (경과 분 0 ~ max_duration_min) x (신뢰도 구간 0 ~ TRUST_BUCKETS) 확률표, 최초 호출 시 한 번 계산
+        """
+        import numpy as np
+        if self._table is None:
+            elapsed = np.arange(self.max_duration_min + 1)[:, None]
+            trust = np.arange(TRUST_BUCKETS + 1)[None, :] / TRUST_BUCKETS
+            self._table = self.get_empty_probabilities(elapsed, trust)
+        return self._table
+
+    def lookup_probabilities(self, elapsed_time_min, trust_score) -> "np.ndarray":
+        """
+        확률표 조회로 계산하는 배열 버전
+
+        경과 시간은 0 ~ max_duration_min 으로 (시작 전 예약은 0분), 신뢰도는 0.005 단위로 맞춤
+        포인트에서 환산한 신뢰도는 0.005 단위이므로 get_empty_probability 와 결과가 같음
+        """
+        import numpy as np
+        table = self.lookup_table()
+        elapsed = np.clip(np.asarray(elapsed_time_min, dtype=int), 0, self.max_duration_min)
+        buckets = np.rint(np.clip(np.asarray(trust_score, dtype=float), 0.0, 1.0) * TRUST_BUCKETS).astype(int)
+        return table[elapsed, buckets]
+
 
 def convert_point_to_trust_score(points: int) -> float:
     """
@@ -1,30 +1,61 @@
+import os
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi import Query
+from fastapi import Query, Response
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import timedelta
-from typing import List
-import os, shutil
-
-from app.database import get_db
-from app.models import Reserve
-from app.schemas import ReservationRequest, ReservationResponse
-from app.services.in_image import extract_room_number
-from app.services.out_image import extract_room_number_for_checkout
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.database import get_db, get_async_db
+from app.models import Reserve, ReserveArchive, ACTIVE_STATUSES
+from app.schemas import ReservationRequest, ReservationResponse, BulkReservationRequest, BulkReservationItem
+from app import ocr, reservation_events
+from app.ocr_cache import ocr_cache
+from app.interval_index import reservation_index, RoomIntervals
+from app.slots import OPEN_HOUR, CLOSE_HOUR, hours_covered
+from app.timetable_cache import timetable_cache
+from app.jwt_handler import get_current_user, ensure_same_user
+from app.pagination import keyset_page, merge_keyset_pages, set_next_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.uploads import save_upload
 
 router = APIRouter()
 
+# 여러 건 / 반복 예약 한 번에 받을 수 있는 최대 건수 (한 학기 주 5회 = 약 80건)
+BULK_MAX_ITEMS = int(os.getenv("BULK_RESERVATION_MAX_ITEMS", "200"))
+
+CONFLICT_DETAILS = {
+    "invalid_time": "종료 시간은 시작 시간 이후여야 합니다.",
+    "past": "이미 지난 시간입니다.",
+    "lecture": "해당 시간에 수업이 있습니다.",
+    "reserved": "이미 해당 시간에 예약이 존재합니다.",
+    "duplicate": "같은 요청의 다른 예약과 시간이 겹칩니다.",
+}
+
 # ------------------------
 # [1] 예약 생성 API
 # ------------------------
 @router.post("/reserve")
-def create_reservation(res_req: ReservationRequest, db: Session = Depends(get_db)):
-    overlap = db.query(Reserve).filter(
-        Reserve.class_id == res_req.class_id,
-        Reserve.end_time > res_req.start_time,
-        Reserve.start_time < res_req.end_time,
-    ).first()
+async def create_reservation(
+    res_req: ReservationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user)
+):
+    ensure_same_user(res_req.user_id, current_user)
+    if res_req.start_time >= res_req.end_time:
+        raise HTTPException(status_code=400, detail="종료 시간은 시작 시간 이후여야 합니다.")
+
+    info = await db.run_sync(_insert_reservation, res_req)
+    reservation_events.reservation_created(info)
 
-    if overlap:
+    return {
+        "message": "예약이 완료되었습니다.",
+        "reservation_id": info.reservation_id
+    }
+
+def _insert_reservation(db: Session, res_req: ReservationRequest) -> reservation_events.ReservationInfo:
+    # 강의실별 구간 인덱스로 겹침 검사 (DB 지문 확인 후 이진 탐색)
+    if reservation_index.has_overlap(db, res_req.class_id, res_req.start_time, res_req.end_time):
         raise HTTPException(status_code=400, detail="이미 해당 시간에 예약이 존재합니다.")
 
     new_reservation = Reserve(
@@ -37,20 +68,178 @@ def create_reservation(res_req: ReservationRequest, db: Session = Depends(get_db
     db.add(new_reservation)
     db.commit()
     db.refresh(new_reservation)
+    return reservation_events.snapshot(new_reservation)
 
+# ------------------------
+# [1-1] 여러 건 / 반복 예약 API
+# ------------------------
+@router.post("/reserve/bulk")
+async def create_bulk_reservation(
+    bulk_req: BulkReservationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user)
+):
+    """
+    (강의실, 시작, 종료) 목록 또는 반복 규칙(요일 + 시간대 + 기간)으로 한 번에 예약
+
+    강의실별 겹침 검사 1회 + 시간표 캐시로 검사하고, 통과한 예약만 한 트랜잭션으로 일괄 INSERT
+    항목별 결과(reserved / conflict / skipped)를 요청 순서대로 반환
+    """
+    ensure_same_user(bulk_req.user_id, current_user)
+    items = _expand_items(bulk_req)
+
+    results, created = await db.run_sync(_insert_bulk, bulk_req.user_id, items, bulk_req.all_or_nothing)
+    for info in created:
+        reservation_events.reservation_created(info)
+
+    conflicts = sum(1 for r in results if r["status"] == "conflict")
+    if created:
+        message = "예약이 완료되었습니다." if not conflicts else "충돌한 항목을 제외하고 예약이 완료되었습니다."
+    else:
+        message = "예약된 항목이 없습니다."
     return {
-        "message": "예약이 완료되었습니다.",
-        "reservation_id": new_reservation.reservation_id
+        "message": message,
+        "requested": len(items),
+        "reserved": len(created),
+        "conflicts": conflicts,
+        "items": results
     }
 
+def _expand_items(bulk_req: BulkReservationRequest) -> List[BulkReservationItem]:
+    items = list(bulk_req.items)
+    rule = bulk_req.recurrence
+    if rule is not None:
+        if not rule.weekdays or any(not 0 <= wd < 7 for wd in rule.weekdays):
+            raise HTTPException(status_code=400, detail="요일은 0(월) ~ 6(일) 사이로 하나 이상 지정해야 합니다.")
+        if not OPEN_HOUR <= rule.start_hour < rule.end_hour <= CLOSE_HOUR:
+            raise HTTPException(status_code=400, detail=f"예약 시간은 {OPEN_HOUR}시 ~ {CLOSE_HOUR}시 사이여야 합니다.")
+        if rule.start_date > rule.end_date:
+            raise HTTPException(status_code=400, detail="종료 날짜는 시작 날짜 이후여야 합니다.")
+
+        weekdays = set(rule.weekdays)
+        day = rule.start_date
+        while day <= rule.end_date and len(items) <= BULK_MAX_ITEMS:
+            if day.weekday() in weekdays:
+                day_start = datetime.combine(day, datetime.min.time())
+                items.append(BulkReservationItem(
+                    class_id=rule.class_id,
+                    start_time=day_start + timedelta(hours=rule.start_hour),
+                    end_time=day_start + timedelta(hours=rule.end_hour)
+                ))
+            day += timedelta(days=1)
+
+    if not items:
+        raise HTTPException(status_code=400, detail="예약할 항목이 없습니다.")
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BULK_MAX_ITEMS}건까지 예약할 수 있습니다.")
+    return items
+
+def _in_lecture(db: Session, class_id: int, start: datetime, end: datetime) -> bool:
+    # 날짜별로 나눠 시간표 비트셋과 비교 (DB 조회 없음)
+    day_start = datetime.combine(start.date(), datetime.min.time())
+    while day_start < end:
+        next_day = day_start + timedelta(days=1)
+        hours = hours_covered(max(start, day_start), min(end, next_day))
+        if timetable_cache.busy_between(db, class_id, day_start.weekday(), hours.start, hours.stop):
+            return True
+        day_start = next_day
+    return False
+
+def _insert_bulk(db: Session, user_id: int, items: List[BulkReservationItem], all_or_nothing: bool):
+    now = datetime.now()
+    results = []
+    accepted = []          # (결과 dict, 항목)
+    rooms = {}             # class_id -> 기존 예약 구간 (강의실마다 DB 지문 확인 1회)
+    requested = {}         # class_id -> 이번 요청에서 받아들인 구간
+
+    for i, item in enumerate(items):
+        result = {
+            "index": i,
+            "class_id": item.class_id,
+            "start_time": item.start_time,
+            "end_time": item.end_time,
+            "status": "conflict",
+            "reason": None
+        }
+        results.append(result)
+
+        if item.start_time >= item.end_time:
+            result["reason"] = "invalid_time"
+        elif item.start_time < now:
+            result["reason"] = "past"
+        elif _in_lecture(db, item.class_id, item.start_time, item.end_time):
+            result["reason"] = "lecture"
+        else:
+            room = rooms.get(item.class_id)
+            if room is None:
+                room = rooms[item.class_id] = reservation_index.room(db, item.class_id, verify=True)
+            batch = requested.setdefault(item.class_id, RoomIntervals())
+            if room.overlaps(item.start_time, item.end_time):
+                result["reason"] = "reserved"
+            elif batch.overlaps(item.start_time, item.end_time):
+                result["reason"] = "duplicate"
+            else:
+                batch.add(i, item.start_time, item.end_time)
+                accepted.append((result, item))
+
+        if result["reason"]:
+            result["detail"] = CONFLICT_DETAILS[result["reason"]]
+
+    if not accepted or (all_or_nothing and len(accepted) < len(items)):
+        for result, _ in accepted:
+            result["status"] = "skipped"
+        return results, []
+
+    # executemany 한 번으로 INSERT 후, 생성된 예약 번호는 (사용자, 시작 시각) 인덱스로 한 번에 조회
+    # (RETURNING 을 쓰면 DB 에 따라 행마다 INSERT 로 나뉨)
+    db.execute(insert(Reserve), [
+        {
+            "user_id": user_id,
+            "class_id": item.class_id,
+            "start_time": item.start_time,
+            "end_time": item.end_time,
+            "status": "예약"
+        }
+        for _, item in accepted
+    ])
+    rows = db.query(Reserve.reservation_id, Reserve.class_id, Reserve.start_time).filter(
+        Reserve.user_id == user_id,
+        Reserve.start_time.in_({item.start_time for _, item in accepted}),
+        Reserve.status == "예약"
+    ).all()
+    db.commit()
+
+    ids = {}
+    for row in rows:
+        key = (row.class_id, row.start_time)
+        ids[key] = max(ids.get(key, 0), row.reservation_id)
+    created = [
+        reservation_events.ReservationInfo(ids[(item.class_id, item.start_time)], item.class_id, user_id,
+                                           item.start_time, item.end_time)
+        for _, item in accepted
+    ]
+
+    for (result, _), info in zip(accepted, created):
+        result["status"] = "reserved"
+        result["reservation_id"] = info.reservation_id
+    return results, created
+
 # ------------------------
 # [2] 마이페이지 예약 조회 API
 # ------------------------
 @router.get("/my-reservations/{user_id}", response_model=List[ReservationResponse])
-def get_user_reservations(user_id: int, db: Session = Depends(get_db)):
-    reservations = db.query(Reserve).filter(
-        Reserve.user_id == user_id
-    ).order_by(Reserve.start_time.desc()).all()
+async def get_user_reservations(
+    user_id: int,
+    response: Response,
+    status: Optional[str] = Query(None, description="예약 / 사용중 / 종료 등 상태 필터"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user)
+):
+    ensure_same_user(user_id, current_user)
+    reservations, next_cursor = await db.run_sync(_reservation_page, user_id, status, cursor, limit)
+    set_next_cursor(response, next_cursor)
 
     results = []
     for r in reservations:
@@ -66,20 +255,39 @@ def get_user_reservations(user_id: int, db: Session = Depends(get_db)):
 
     return results
 
+def _reservation_page(db: Session, user_id: int, status: Optional[str], cursor: Optional[str], limit: int):
+    # 최신순 한 페이지만 (user_id, start_time, reservation_id) 인덱스로 조회
+    # 보관된 예약(reserve_archive)도 같은 커서로 읽어 합침 (진행 중 상태만 찾으면 reserve 만)
+    tables = [Reserve] if status in ACTIVE_STATUSES else [Reserve, ReserveArchive]
+    pages = []
+    for model in tables:
+        query = db.query(model).filter(model.user_id == user_id)
+        if status:
+            query = query.filter(model.status == status)
+        pages.append(keyset_page(query, model.start_time, model.reservation_id, cursor, limit))
+    return merge_keyset_pages(pages, "start_time", "reservation_id", limit)
+
+def _find_reservation(db: Session, reservation_id: int, user_id: int):
+    return db.query(Reserve).filter(
+        Reserve.reservation_id == reservation_id,
+        Reserve.user_id == user_id
+    ).first()
+
 # ------------------------
 # [3] 사용 인증 (사진 업로드) API
 # ------------------------
 @router.post("/auth-use")
-def auth_use_reservation(
+async def auth_use_reservation(
     reservation_id: int = Form(...),
     user_id: int = Form(...),
     image: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    wait: float = Query(0, ge=0, le=30, description="결과를 기다릴 최대 시간 (초), 0 이면 작업 번호를 바로 반환"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user)
 ):
-    reservation = db.query(Reserve).filter(
-        Reserve.reservation_id == reservation_id,
-        Reserve.user_id == user_id
-    ).first()
+    # DB 조회는 비동기 세션으로, 업로드는 청크 단위로 스트리밍, OCR 은 작업 풀에서 처리
+    ensure_same_user(user_id, current_user)
+    reservation = await db.run_sync(_find_reservation, reservation_id, user_id)
 
     if not reservation:
         raise HTTPException(status_code=404, detail="예약 내역을 찾을 수 없습니다.")
@@ -87,52 +295,29 @@ def auth_use_reservation(
     if reservation.status != "예약":
         raise HTTPException(status_code=400, detail="이미 인증되었거나 인증 불가한 상태입니다.")
 
-    upload_dir = "uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, image.filename)
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
-
-    extracted_number = extract_room_number(file_path)
+    info = reservation_events.snapshot(reservation)
+    await db.close()   # OCR 이 끝날 때까지 DB 커넥션을 잡고 있지 않음
 
-    if extracted_number != str(reservation.class_id):
-        raise HTTPException(status_code=400, detail=f"인식된 강의실 번호({extracted_number})가 예약된 강의실과 일치하지 않습니다.")
-
-    reservation.status = "사용중"
-    db.commit()
-
-    return {
-        "message": "사용 인증 완료되었습니다.",
-        "recognized_room": extracted_number,
-        "status": reservation.status
-    }
+    stored = await save_upload(image)
+    job = await ocr.submit("checkin", info, stored)
+    return await ocr.respond(job, wait)
 
 # ------------------------
 # [4] 퇴실 인증 (사진 업로드) API
 # ------------------------
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from sqlalchemy.orm import Session
-import os, shutil
-
-from app.database import get_db
-from app.models import Reserve
-from app.services.out_image import extract_room_number_for_checkout
-
-router = APIRouter()
-
 @router.patch("/reservations/{reservation_id}/checkout")
-def auth_out_reservation(
+async def auth_out_reservation(
     reservation_id: int,
     user_id: int = Form(...),
     image: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    wait: float = Query(0, ge=0, le=30, description="결과를 기다릴 최대 시간 (초), 0 이면 작업 번호를 바로 반환"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user)
 ):
+    ensure_same_user(user_id, current_user)
+
     # ① 예약 정보 조회
-    reservation = db.query(Reserve).filter(
-        Reserve.reservation_id == reservation_id,
-        Reserve.user_id == user_id
-    ).first()
+    reservation = await db.run_sync(_find_reservation, reservation_id, user_id)
 
     if not reservation:
         raise HTTPException(status_code=404, detail="예약 정보를 찾을 수 없습니다.")
@@ -140,32 +325,34 @@ def auth_out_reservation(
     if reservation.status != "사용중":
         raise HTTPException(status_code=400, detail="현재 상태에서는 퇴실 인증이 불가능합니다.")
 
-    # ② 이미지 저장
-    upload_dir = "uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, image.filename)
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
+    info = reservation_events.snapshot(reservation)
+    await db.close()
 
-    # ③ 강의실 번호 인식
-    extracted_number = extract_room_number_for_checkout(file_path)
+    # ② 이미지 저장 (스트리밍, 내용 해시 파일명)
+    stored = await save_upload(image)
 
-    if extracted_number != str(reservation.class_id):
-        raise HTTPException(
-            status_code=400,
-            detail=f"인식된 강의실 번호({extracted_number})가 예약 강의실과 다릅니다."
-        )
+    # ③ 강의실 번호 인식 + ④ 상태 변경은 OCR 작업이 끝날 때 반영
+    job = await ocr.submit("checkout", info, stored)
+    return await ocr.respond(job, wait)
 
-    # ④ 상태 변경
-    reservation.status = "종료"
-    db.commit()
+# ------------------------
+# [4-1] 사진 인증 작업 상태 조회 API
+# ------------------------
+@router.get("/ocr-jobs/{job_id}")
+async def get_ocr_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="결과를 기다릴 최대 시간 (초)"),
+    current_user: str = Depends(get_current_user)
+):
+    job = ocr.get_job(job_id)
+    ensure_same_user(job.info.user_id, current_user)
+    await ocr.wait_for(job, wait)
+    return job.to_dict()
 
-    return {
-        "message": "퇴실 인증 완료되었습니다.",
-        "recognized_room": extracted_number,
-        "status": reservation.status
-    }
+# 사진 인식 결과 캐시 적중률
+@router.get("/ocr-cache/stats")
+def get_ocr_cache_stats():
+    return ocr_cache.stats()
 
 
 # ------------------------
@@ -175,8 +362,10 @@ def auth_out_reservation(
 def cancel_reservation(
     reservation_id: int,
     user_id: int = Query(..., description="예약한 사용자 ID"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user)
 ):
+    ensure_same_user(user_id, current_user)
     reservation = db.query(Reserve).filter(
         Reserve.reservation_id == reservation_id,
         Reserve.user_id == user_id
@@ -188,7 +377,9 @@ def cancel_reservation(
     if reservation.status != "예약":
         raise HTTPException(status_code=400, detail="예약 상태가 아니므로 취소할 수 없습니다.")
 
+    info = reservation_events.snapshot(reservation)
     db.delete(reservation)
     db.commit()
+    reservation_events.reservation_cancelled(info)
 
     return {"message": "예약이 취소되었습니다."}
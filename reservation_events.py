@@ -0,0 +1,51 @@
+"""
+예약이 생성 / 취소 / 상태 변경된 뒤(커밋 이후) 프로세스 내 인덱스와 캐시를 갱신하는 곳
+
+라우터, OCR 작업 완료 처리 등 예약을 바꾸는 모든 경로가 이 함수들을 호출
+"""
+from datetime import datetime
+from typing import NamedTuple
+
+from app import occupancy, sweeper
+from app.interval_index import reservation_index
+from app.live import live_hub
+from app.models import ACTIVE_STATUSES
+
+
+class ReservationInfo(NamedTuple):
+    reservation_id: int
+    class_id: int
+    user_id: int
+    start_time: datetime
+    end_time: datetime
+
+
+def snapshot(reservation) -> ReservationInfo:
+    """
+    커밋하면 ORM 객체 속성이 만료되므로 필요한 값만 미리 복사
+    """
+    return ReservationInfo(reservation.reservation_id, reservation.class_id, reservation.user_id,
+                           reservation.start_time, reservation.end_time)
+
+
+def reservation_created(info: ReservationInfo):
+    reservation_index.add(info.class_id, info.reservation_id, info.start_time, info.end_time)
+    sweeper.reservation_sweeper.schedule(info, "예약")
+    occupancy.invalidate()
+    live_hub.notify(class_id=info.class_id)
+
+
+def reservation_cancelled(info: ReservationInfo):
+    reservation_index.remove(info.class_id, info.reservation_id, info.start_time)
+    occupancy.invalidate()
+    live_hub.notify(class_id=info.class_id)
+
+
+def status_changed(info: ReservationInfo, old_status: str, new_status: str):
+    # 종료 등으로 더 이상 강의실을 점유하지 않으면 구간 인덱스에서 제거
+    if old_status in ACTIVE_STATUSES and new_status not in ACTIVE_STATUSES:
+        reservation_index.remove(info.class_id, info.reservation_id, info.start_time)
+    if new_status in ACTIVE_STATUSES:
+        sweeper.reservation_sweeper.schedule(info, new_status)
+    occupancy.invalidate()
+    live_hub.notify(class_id=info.class_id)
@@ -0,0 +1,278 @@
+"""
+강의실 이용률 집계 (강의실 x 요일 x 시간대)
+
+예약이 끝나는 시점(퇴실 인증, 노쇼 / 미퇴실 만료)에 예약 시간을 시간대별로 나눠 room_hourly 를 증분 갱신하고,
+시간표가 바뀌면 주당 수업 시간만 다시 채움. 히트맵 / 상위 N 조회는 이 테이블만 읽으므로 이력 크기와 무관
+
+- reserved_minutes: 끝난 예약(종료 / 노쇼 / 미퇴실)이 잡았던 시간
+- used_minutes: 그중 사용 인증을 한 예약(종료 / 미퇴실)의 시간 (입실 시각은 따로 저장하지 않으므로 예약 구간 기준)
+- no_show_count: 예약 시작 시간대 기준
+- weekly_lecture_minutes: 시간표상 주당 수업 시간
+
+학기 시작 등 처음부터 다시 계산할 때 (이력은 NumPy 로 한 번에 집계)
+python -m app.room_hourly rebuild [--since 2026-03-02]
+"""
+import argparse
+import time
+from datetime import date, datetime, timedelta
+from itertools import chain
+from sqlalchemy import case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Class, RoomHourly, Timetable
+from app import archive, usage_stats
+
+CELL_FIELDS = ("reserved_minutes", "used_minutes", "no_show_count", "weekly_lecture_minutes")
+RECORDED_STATUSES = ("종료", "노쇼", "미퇴실")
+USED_STATUSES = ("종료", "미퇴실")
+
+HOURS_PER_DAY = 24
+CELLS_PER_ROOM = 7 * HOURS_PER_DAY
+# 잘못 입력된 예약이 집계를 부풀리지 않도록 한 건을 나눌 최대 길이
+MAX_SPAN = timedelta(days=1)
+REBUILD_CHUNK = 50000
+# 재계산 시 시각을 이 시점부터의 분으로 바꿔 읽음
+EPOCH = datetime(1970, 1, 1)
+
+
+def hour_cells(start: datetime, end: datetime) -> dict:
+    """
+    [start, end) 를 (요일, 시간) 별 분으로 나눔 (분 미만은 버림)
+    """
+    start = start.replace(second=0, microsecond=0)
+    end = min(end.replace(second=0, microsecond=0), start + MAX_SPAN)
+    cells = {}
+    cursor = start
+    while cursor < end:
+        next_hour = cursor.replace(minute=0) + timedelta(hours=1)
+        minutes = int((min(end, next_hour) - cursor).total_seconds() // 60)
+        key = (cursor.weekday(), cursor.hour)
+        cells[key] = cells.get(key, 0) + minutes
+        cursor = next_hour
+    return cells
+
+
+def cell_deltas(status: str, start: datetime, end: datetime) -> dict:
+    """
+    (요일, 시간) -> 늘어나는 집계
+    """
+    if status not in RECORDED_STATUSES or start is None or end is None:
+        return {}
+    deltas = {}
+    for key, minutes in hour_cells(start, end).items():
+        delta = {"reserved_minutes": minutes}
+        if status in USED_STATUSES:
+            delta["used_minutes"] = minutes
+        deltas[key] = delta
+    if status == "노쇼":
+        deltas.setdefault((start.weekday(), start.hour), {})["no_show_count"] = 1
+    return deltas
+
+
+def record(db: Session, info, status: str):
+    """
+    예약이 status 로 끝났음을 시간대별 집계에 반영 (커밋은 호출자가 함)
+    """
+    if info.class_id is None:
+        return
+    for (weekday, hour), delta in cell_deltas(status, info.start_time, info.end_time).items():
+        usage_stats.bump(db, RoomHourly, {"class_id": info.class_id, "weekday": weekday, "hour": hour},
+                         delta, CELL_FIELDS)
+
+
+# ------------------------
+# 시간표 반영
+# ------------------------
+def _lecture_cells(db: Session) -> dict:
+    cells = {}
+    for t in db.query(Timetable.class_id, Timetable.weekend, Timetable.start_time, Timetable.end_time):
+        if t.class_id is None or t.weekend is None or not 0 <= t.weekend < 7 \
+                or t.start_time is None or t.end_time is None:
+            continue
+        for hour in range(max(0, t.start_time), min(HOURS_PER_DAY, t.end_time)):
+            cells[(t.class_id, t.weekend, hour)] = 60
+    return cells
+
+
+def refresh_lectures(db: Session) -> int:
+    """
+    weekly_lecture_minutes 를 현재 시간표로 다시 채움 (커밋은 호출자가 함). 바뀐 칸 수를 반환
+    """
+    lectures = _lecture_cells(db)
+    current = {
+        (r.class_id, r.weekday, r.hour): r.weekly_lecture_minutes
+        for r in db.query(RoomHourly.class_id, RoomHourly.weekday, RoomHourly.hour, RoomHourly.weekly_lecture_minutes)
+    }
+    changes = [
+        {"class_id": c, "weekday": wd, "hour": h, "weekly_lecture_minutes": lectures.get((c, wd, h), 0)}
+        for (c, wd, h), minutes in current.items() if minutes != lectures.get((c, wd, h), 0)
+    ]
+    new = [
+        {"class_id": c, "weekday": wd, "hour": h, "weekly_lecture_minutes": minutes,
+         "reserved_minutes": 0, "used_minutes": 0, "no_show_count": 0}
+        for (c, wd, h), minutes in lectures.items() if (c, wd, h) not in current
+    ]
+    if changes:
+        db.execute(update(RoomHourly), changes)
+    if new:
+        db.execute(insert(RoomHourly), new)
+    return len(changes) + len(new)
+
+
+# ------------------------
+# 이력에서 다시 계산
+# ------------------------
+def _epoch_minutes(column, dialect: str):
+    # DATETIME -> 1970-01-01 00:00 부터의 분 (초는 버림)
+    return usage_stats.minutes_between(literal(EPOCH), column, dialect)
+
+
+def _aggregate_chunk(np, rows, rooms: dict):
+    """
+    (class_id, 시작 분, 종료 분, 이용 여부, 노쇼 여부) 묶음을 시간대 칸으로 펼쳐
+    강의실별 (3, 168) 배열 (reserved_minutes, used_minutes, no_show_count) 에 더함
+    """
+    # Row 를 그대로 넘기면 원소마다 키 조회가 일어나 느림 -> 평탄화해서 한 번에 변환
+    data = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=len(rows) * 5).reshape(-1, 5)
+    class_ids, start, end, used, no_show = data.T
+    end = np.minimum(end, start + int(MAX_SPAN.total_seconds() // 60))
+
+    valid = end > start
+    class_ids, start, end, used, no_show = class_ids[valid], start[valid], end[valid], used[valid], no_show[valid]
+    if not len(start):
+        return
+
+    uniq, room = np.unique(class_ids, return_inverse=True)
+    size = len(uniq) * CELLS_PER_ROOM
+
+    # 예약 한 건 -> 걸친 시간대 수만큼 행을 늘려서 시간대별 분 계산
+    first_hour = start // 60
+    spans = (end - 1) // 60 - first_hour + 1
+    idx = np.repeat(np.arange(len(start)), spans)
+    offset = np.arange(len(idx)) - np.repeat(np.cumsum(spans) - spans, spans)
+    hour_abs = first_hour[idx] + offset
+    minutes = np.minimum(end[idx], (hour_abs + 1) * 60) - np.maximum(start[idx], hour_abs * 60)
+
+    def cell(hours):
+        # 1970-01-01 은 목요일 (weekday 3)
+        return ((hours // HOURS_PER_DAY + 3) % 7) * HOURS_PER_DAY + hours % HOURS_PER_DAY
+
+    cells = room[idx] * CELLS_PER_ROOM + cell(hour_abs)
+    reserved = np.bincount(cells, weights=minutes, minlength=size)
+    used_minutes = np.bincount(cells, weights=minutes * used[idx], minlength=size)
+    no_shows = np.bincount(room * CELLS_PER_ROOM + cell(first_hour), weights=no_show, minlength=size)
+
+    stacked = np.stack([reserved, used_minutes, no_shows]).reshape(3, len(uniq), CELLS_PER_ROOM)
+    for i, class_id in enumerate(uniq.tolist()):
+        if class_id in rooms:
+            rooms[class_id] += stacked[:, i, :]
+        else:
+            rooms[class_id] = stacked[:, i, :].copy()
+
+
+def rebuild(db: Session, since: date = None) -> dict:
+    """
+    집계 테이블을 비우고 예약 이력 (reserve + reserve_archive, since 이후 시작한 예약) 에서 다시 채움
+    시각은 DB 에서 정수(분)로 바꿔 읽고, 시간대 분배는 NumPy 로 묶음 단위 처리
+    """
+    import numpy as np
+
+    dialect = db.get_bind().dialect.name
+    history = archive.reservation_history()
+    query = select(
+        history.c.class_id,
+        _epoch_minutes(history.c.start_time, dialect),
+        _epoch_minutes(history.c.end_time, dialect),
+        case((history.c.status.in_(USED_STATUSES), 1), else_=0),
+        case((history.c.status == "노쇼", 1), else_=0),
+    ).where(
+        history.c.status.in_(RECORDED_STATUSES),
+        history.c.class_id.isnot(None),
+        history.c.start_time.isnot(None),
+        history.c.end_time.isnot(None),
+    )
+    if since is not None:
+        query = query.where(history.c.start_time >= datetime.combine(since, datetime.min.time()))
+
+    rooms = {}
+    reservations = 0
+    result = db.execute(query.execution_options(yield_per=REBUILD_CHUNK))
+    for chunk in result.partitions():
+        _aggregate_chunk(np, chunk, rooms)
+        reservations += len(chunk)
+
+    rows = []
+    for class_id, totals in rooms.items():
+        for i in np.flatnonzero(totals.any(axis=0)).tolist():
+            rows.append({
+                "class_id": class_id, "weekday": i // HOURS_PER_DAY, "hour": i % HOURS_PER_DAY,
+                "reserved_minutes": int(totals[0, i]), "used_minutes": int(totals[1, i]),
+                "no_show_count": int(totals[2, i]), "weekly_lecture_minutes": 0,
+            })
+    try:
+        db.execute(delete(RoomHourly))
+        for i in range(0, len(rows), REBUILD_CHUNK):
+            db.execute(insert(RoomHourly), rows[i:i + REBUILD_CHUNK])
+        refresh_lectures(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {
+        "reservations": reservations,
+        "cells": db.query(func.count()).select_from(RoomHourly).scalar(),
+    }
+
+
+# ------------------------
+# 조회
+# ------------------------
+def _scope(query, house_id: int = None, class_id: int = None):
+    if class_id is not None:
+        return query.filter(RoomHourly.class_id == class_id)
+    if house_id is not None:
+        return query.filter(RoomHourly.class_id.in_(select(Class.class_id).where(Class.house_id == house_id)))
+    return query
+
+
+def heatmap(db: Session, house_id: int = None, class_id: int = None) -> dict:
+    """
+    요일(월 ~ 일) x 시간(0 ~ 23) 행렬, 지표마다 하나씩
+    """
+    query = db.query(RoomHourly.weekday, RoomHourly.hour, *(func.sum(getattr(RoomHourly, name)) for name in CELL_FIELDS))
+    query = _scope(query, house_id, class_id).group_by(RoomHourly.weekday, RoomHourly.hour)
+
+    result = {"house_id": house_id, "class_id": class_id, "hours": list(range(HOURS_PER_DAY))}
+    matrices = {name: [[0] * HOURS_PER_DAY for _ in range(7)] for name in CELL_FIELDS}
+    for weekday, hour, *values in query:
+        for name, value in zip(CELL_FIELDS, values):
+            matrices[name][weekday][hour] = int(value or 0)
+    result.update(matrices)
+    return result
+
+
+def top_rooms(db: Session, metric: str, limit: int, house_id: int = None,
+              weekday: int = None, hour: int = None) -> list:
+    column = func.sum(getattr(RoomHourly, metric))
+    query = db.query(RoomHourly.class_id, column.label("value"))
+    query = _scope(query, house_id)
+    if weekday is not None:
+        query = query.filter(RoomHourly.weekday == weekday)
+    if hour is not None:
+        query = query.filter(RoomHourly.hour == hour)
+    rows = query.group_by(RoomHourly.class_id).order_by(column.desc(), RoomHourly.class_id).limit(limit).all()
+    return [{"class_id": r.class_id, metric: int(r.value or 0)} for r in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="강의실 시간대별 이용률 집계")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--since", type=date.fromisoformat, help="이 날짜 이후 시작한 예약만 집계 (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        counts = rebuild(db, args.since)
+    print(f"예약 {counts['reservations']}건 -> {counts['cells']}칸 집계 완료 ({time.perf_counter() - started:.2f}s)")
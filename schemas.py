@@ -1,5 +1,17 @@
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import AfterValidator, BaseModel
+from datetime import date, datetime
+from typing import Annotated, List, Optional
+
+
+def to_local_naive(value: datetime) -> datetime:
+    # DB 의 DATETIME 과 datetime.now() 는 시간대 없는 서버 현지 시각 -> "...Z" / "+09:00" 입력은 현지 시각으로 바꿔 비교
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+# 요청으로 받는 예약 시각 (시간대가 있으면 서버 현지 시각으로 변환)
+LocalDateTime = Annotated[datetime, AfterValidator(to_local_naive)]
 
 class UserLogin(BaseModel):
     user_id: str
@@ -11,8 +23,8 @@ class UserLogin(BaseModel):
 class ReservationRequest(BaseModel):
     user_id: int
     class_id: int
-    start_time: datetime
-    end_time: datetime
+    start_time: LocalDateTime
+    end_time: LocalDateTime
 
 
 class ReservationResponse(BaseModel):
@@ -22,3 +34,25 @@ class ReservationResponse(BaseModel):
     end_time: datetime
     status: str
     use_auth_deadline: datetime
+
+
+class BulkReservationItem(BaseModel):
+    class_id: int
+    start_time: LocalDateTime
+    end_time: LocalDateTime
+
+
+class RecurrenceRule(BaseModel):
+    class_id: int
+    weekdays: List[int]          # 0 = 월요일 ~ 6 = 일요일
+    start_hour: int
+    end_hour: int
+    start_date: date
+    end_date: date               # 이 날짜까지 포함
+
+
+class BulkReservationRequest(BaseModel):
+    user_id: int
+    items: List[BulkReservationItem] = []
+    recurrence: Optional[RecurrenceRule] = None
+    all_or_nothing: bool = False  # True 면 하나라도 충돌할 때 아무것도 예약하지 않음
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+# 예약 가능한 시간대: 9시 ~ 17시 (1시간 단위, 18시 마감)
+OPEN_HOUR = 9
+CLOSE_HOUR = 18
+HOURS = list(range(OPEN_HOUR, CLOSE_HOUR))
+
+
+def hours_covered(start: datetime, end: datetime) -> range:
+    """
+    [start, end) 구간과 겹치는 정각 단위 시간대 (예: 10:30~12:00 -> 10, 11시)
+    """
+    last = end.hour if (end.minute or end.second or end.microsecond) else end.hour - 1
+    if end.date() > start.date():
+        last = 23
+    return range(start.hour, last + 1)
+
+
+# 하루 예약 가능 시간대를 비트마스크로 표현 (bit i = HOURS[i])
+FULL_DAY_MASK = (1 << len(HOURS)) - 1
+
+
+def hour_mask(start_hour: int, end_hour: int) -> int:
+    """
+    [start_hour, end_hour) 시간대 비트마스크 (운영 시간 밖은 잘라냄)
+    """
+    start_hour = max(start_hour, OPEN_HOUR)
+    end_hour = min(end_hour, CLOSE_HOUR)
+    if start_hour >= end_hour:
+        return 0
+    return ((1 << (end_hour - OPEN_HOUR)) - 1) ^ ((1 << (start_hour - OPEN_HOUR)) - 1)
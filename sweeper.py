@@ -0,0 +1,272 @@
+"""
+예약 만료 처리기 (노쇼 / 미퇴실)
+
+- 예약 상태로 시작 + 10분(use_auth_deadline)이 지나면 "노쇼", no_auth_in_time 포인트 차감
+- 사용중 상태로 종료 + CHECKOUT_GRACE_MIN 분이 지나면 "미퇴실", no_checkout 포인트 차감
+
+테이블 전체를 주기적으로 훑지 않고, 다가오는 마감 시각을 힙에 담아 가장 빠른 마감 시각에 깨어남
+힙은 SWEEP_HORIZON_SEC 안에 마감되는 예약으로 채우고, 새 예약 / 입실 인증 시 schedule() 로 추가
+여러 워커가 동시에 돌아도 상태 조건부 UPDATE 로 한 번만 처리됨
+마감이 SWEEP_MAX_LOOKBACK_SEC 보다 오래 지난 예약 (만료 처리 도입 전부터 남아 있던 예약 등) 은
+상태만 바꾸고 포인트는 차감하지 않음
+"""
+import asyncio
+import heapq
+import os
+import threading
+from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+from app.models import Reserve
+from app import ledger, reservation_events, room_hourly, usage_stats
+from app.point import POINTS_TO_DEDUCT
+
+router = APIRouter()
+
+SWEEPER_ENABLED = os.getenv("SWEEPER_ENABLED", "1") == "1"
+AUTH_DEADLINE_MIN = 10                                             # 예약 시작 후 입실 인증 마감 (분)
+CHECKOUT_GRACE_MIN = int(os.getenv("CHECKOUT_GRACE_MIN", "10"))    # 예약 종료 후 퇴실 인증 유예 (분)
+SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE", "200"))
+SWEEP_HORIZON_SEC = int(os.getenv("SWEEP_HORIZON_SEC", "3600"))    # 힙을 채우는 범위 / 주기
+SWEEP_MAX_LOOKBACK_SEC = int(os.getenv("SWEEP_MAX_LOOKBACK_SEC", "86400"))  # 이보다 오래 지난 마감은 차감 없이 만료
+
+NO_SHOW_STATUS = "노쇼"
+OVERSTAY_STATUS = "미퇴실"
+
+# 마감 종류별: 대상 상태, 만료 후 상태, 차감 사유
+EXPIRATIONS = {
+    "no_auth_in_time": ("예약", NO_SHOW_STATUS),
+    "no_checkout": ("사용중", OVERSTAY_STATUS),
+}
+
+
+def deadline_of(kind: str, start_time: datetime, end_time: datetime) -> datetime:
+    if kind == "no_auth_in_time":
+        return start_time + timedelta(minutes=AUTH_DEADLINE_MIN)
+    return end_time + timedelta(minutes=CHECKOUT_GRACE_MIN)
+
+
+class ReservationSweeper:
+    def __init__(self):
+        self._heap = []             # (마감 시각, reservation_id, 종류)
+        self._queued = set()        # 힙에 들어 있는 (reservation_id, 종류)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wake = None
+        self._task = None
+        self._horizon_end = None
+        # 지표
+        self.batches = 0
+        self.expired = {kind: 0 for kind in EXPIRATIONS}
+        self.expired_without_points = 0
+        self.last_due = 0                   # 힙에서 꺼낸 항목 수 (이미 처리 / 취소된 예약 포함)
+        self.last_batch_size = 0            # 그중 실제로 만료된 예약 수
+        self.max_batch_size = 0
+        self.last_lag_sec = 0.0
+        self.max_lag_sec = 0.0
+
+    # ------------------------
+    # 힙 관리
+    # ------------------------
+    def _push(self, deadline: datetime, reservation_id: int, kind: str) -> bool:
+        key = (reservation_id, kind)
+        if key in self._queued:
+            return False
+        self._queued.add(key)
+        heapq.heappush(self._heap, (deadline, reservation_id, kind))
+        return self._heap[0][1:] == (reservation_id, kind)
+
+    def schedule(self, info: "reservation_events.ReservationInfo", status: str):
+        """
+        예약 생성 / 입실 인증 직후 호출 (스레드풀에서 호출되어도 안전)
+        """
+        kinds = [kind for kind, (from_status, _) in EXPIRATIONS.items() if from_status == status]
+        if status == "예약":
+            kinds.append("no_checkout")     # 입실 인증 후를 대비해 미리 등록 (처리 시 상태 확인)
+        earliest = False
+        with self._lock:
+            for kind in kinds:
+                deadline = deadline_of(kind, info.start_time, info.end_time)
+                if self._horizon_end is None or deadline <= self._horizon_end:
+                    earliest |= self._push(deadline, info.reservation_id, kind)
+        if earliest and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _refill(self):
+        """
+        지금부터 SWEEP_HORIZON_SEC 안에 마감되는 (이미 지난 것 포함) 예약을 힙에 채움
+        """
+        horizon_end = datetime.now() + timedelta(seconds=SWEEP_HORIZON_SEC)
+        with SessionLocal() as db:
+            pending = db.query(Reserve.reservation_id, Reserve.start_time).filter(
+                Reserve.status == "예약",
+                Reserve.start_time <= horizon_end - timedelta(minutes=AUTH_DEADLINE_MIN)
+            ).all()
+            in_use = db.query(Reserve.reservation_id, Reserve.end_time).filter(
+                Reserve.status.in_(("예약", "사용중")),
+                Reserve.end_time <= horizon_end - timedelta(minutes=CHECKOUT_GRACE_MIN)
+            ).all()
+        with self._lock:
+            self._horizon_end = horizon_end
+            for r in pending:
+                self._push(deadline_of("no_auth_in_time", r.start_time, None), r.reservation_id, "no_auth_in_time")
+            for r in in_use:
+                self._push(deadline_of("no_checkout", None, r.end_time), r.reservation_id, "no_checkout")
+
+    def _pop_due(self, now: datetime) -> list:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and len(due) < SWEEP_BATCH_SIZE:
+                deadline, reservation_id, kind = heapq.heappop(self._heap)
+                self._queued.discard((reservation_id, kind))
+                due.append((deadline, reservation_id, kind))
+        return due
+
+    def _requeue(self, due: list):
+        # 처리하지 못한 배치를 힙에 되돌림 (다음 채우기까지 기다리지 않고 다시 시도)
+        with self._lock:
+            for entry in due:
+                self._push(*entry)
+
+    # ------------------------
+    # 만료 처리
+    # ------------------------
+    def expire_batch(self, due: list, now: datetime = None) -> int:
+        """
+        마감이 지난 예약들을 한 트랜잭션으로 만료시키고 포인트 차감
+        (마감이 SWEEP_MAX_LOOKBACK_SEC 보다 오래 지난 예약은 차감 없이 만료만)
+        """
+        now = now or datetime.now()
+        lookback_cutoff = now - timedelta(seconds=SWEEP_MAX_LOOKBACK_SEC)
+        expired = []
+        with SessionLocal() as db:
+            try:
+                for kind, (from_status, to_status) in EXPIRATIONS.items():
+                    ids = [reservation_id for _, reservation_id, k in due if k == kind]
+                    if not ids:
+                        continue
+                    deadline_column = Reserve.start_time if kind == "no_auth_in_time" else Reserve.end_time
+                    grace = AUTH_DEADLINE_MIN if kind == "no_auth_in_time" else CHECKOUT_GRACE_MIN
+                    condition = (
+                        Reserve.reservation_id.in_(ids),
+                        Reserve.status == from_status,
+                        deadline_column <= now - timedelta(minutes=grace),
+                    )
+                    # 쓰기 잠금을 먼저 잡고 (SQLite) 잠금 읽기로 아직 대상인 예약만 고름
+                    db.query(Reserve).filter(*condition).update({Reserve.status: Reserve.status}, synchronize_session=False)
+                    rows = db.query(Reserve).filter(*condition).with_for_update().all()
+                    if not rows:
+                        continue
+                    db.query(Reserve).filter(Reserve.reservation_id.in_([r.reservation_id for r in rows])) \
+                        .update({Reserve.status: to_status}, synchronize_session=False)
+                    for r in rows:
+                        penalized = deadline_of(kind, r.start_time, r.end_time) >= lookback_cutoff
+                        if penalized:
+                            try:
+                                ledger.apply_points(db, str(r.user_id), -POINTS_TO_DEDUCT[kind], commit=False)
+                            except HTTPException:
+                                penalized = False   # users 에 없는 사용자는 차감 없이 만료만
+                        info = reservation_events.snapshot(r)
+                        usage_stats.record(db, info, to_status)
+                        room_hourly.record(db, info, to_status)
+                        expired.append((kind, info, from_status, to_status, penalized))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+        ledger.invalidate([info.user_id for _, info, _, _, penalized in expired if penalized])
+        for kind, info, from_status, to_status, penalized in expired:
+            self.expired[kind] += 1
+            self.expired_without_points += not penalized
+            reservation_events.status_changed(info, from_status, to_status)
+        return len(expired)
+
+    # ------------------------
+    # 실행 루프
+    # ------------------------
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        while True:
+            try:
+                if self._horizon_end is None or datetime.now() >= self._horizon_end - timedelta(seconds=SWEEP_HORIZON_SEC / 2):
+                    await run_in_threadpool(self._refill)
+
+                now = datetime.now()
+                due = self._pop_due(now)
+                if due:
+                    lag = (now - due[0][0]).total_seconds()
+                    try:
+                        n = await run_in_threadpool(self.expire_batch, due, now)
+                    except Exception:
+                        self._requeue(due)
+                        raise
+                    self.batches += 1
+                    self.last_due = len(due)
+                    self.last_batch_size = n
+                    self.max_batch_size = max(self.max_batch_size, n)
+                    self.last_lag_sec = lag
+                    self.max_lag_sec = max(self.max_lag_sec, lag)
+                    continue
+
+                # 가장 빠른 마감 시각 또는 다음 채우기 시각까지 대기 (더 빠른 예약이 들어오면 깨어남)
+                wake_at = self._horizon_end - timedelta(seconds=SWEEP_HORIZON_SEC / 2)
+                with self._lock:
+                    if self._heap:
+                        wake_at = min(wake_at, self._heap[0][0])
+                timeout = max((wake_at - datetime.now()).total_seconds(), 0)
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # DB 일시 장애 등: 잠시 뒤 다시 시도
+                await asyncio.sleep(5)
+
+    def start(self):
+        if SWEEPER_ENABLED and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            next_due = self._heap[0][0].isoformat() if self._heap else None
+            queued = len(self._heap)
+        return {
+            "running": self._task is not None,
+            "queued": queued,
+            "next_due": next_due,
+            "batches": self.batches,
+            "expired": dict(self.expired),
+            "expired_without_points": self.expired_without_points,
+            "last_due": self.last_due,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "last_lag_sec": round(self.last_lag_sec, 3),
+            "max_lag_sec": round(self.max_lag_sec, 3),
+        }
+
+
+# 워커 프로세스 전역 만료 처리기
+reservation_sweeper = ReservationSweeper()
+
+
+# 만료 처리기 상태 (지연 시간, 배치 크기)
+@router.get("/sweeper/stats")
+def get_sweeper_stats():
+    return reservation_sweeper.stats()
@@ -0,0 +1,96 @@
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.models import Timetable
+from app.slots import OPEN_HOUR, FULL_DAY_MASK
+
+# 다른 프로세스에서 시간표를 다시 넣었을 때를 대비한 재적재 주기 (초, 0 이면 명시적 reload 만)
+RELOAD_INTERVAL_SEC = float(os.getenv("TIMETABLE_RELOAD_SEC", "600"))
+
+HOURS_PER_DAY = 24
+
+
+def _bit(weekday: int, hour: int) -> int:
+    return 1 << (weekday * HOURS_PER_DAY + hour)
+
+
+def _range_mask(weekday: int, start_hour: int, end_hour: int) -> int:
+    # 해당 요일의 [start_hour, end_hour) 시간 비트
+    start_hour = max(0, start_hour)
+    end_hour = min(HOURS_PER_DAY, end_hour)
+    if start_hour >= end_hour:
+        return 0
+    return ((1 << (end_hour - start_hour)) - 1) << (weekday * HOURS_PER_DAY + start_hour)
+
+
+class TimetableCache:
+    """
+    강의실별 주간 시간표 비트셋 (7일 x 24시간 = 168 비트 정수 하나)
+
+    bit (weekday * 24 + hour) 가 1 이면 해당 요일 / 시간에 수업이 있음
+    학기 중에는 시간표가 바뀌지 않으므로 한 번 적재하면 DB 없이 비트 연산으로 판단
+    """
+    def __init__(self):
+        self._rooms = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def reload(self, db: Session):
+        rooms = {}
+        for t in db.query(Timetable.class_id, Timetable.weekend, Timetable.start_time, Timetable.end_time):
+            if t.weekend is None or not 0 <= t.weekend < 7 or t.start_time is None or t.end_time is None:
+                continue
+            rooms[t.class_id] = rooms.get(t.class_id, 0) | _range_mask(t.weekend, t.start_time, t.end_time)
+        with self._lock:
+            self._rooms = rooms
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """
+        시간표 재적재 후 호출 -> 다음 조회 시 다시 읽음
+        """
+        with self._lock:
+            self._loaded_at = None
+
+    def ensure_loaded(self, db: Session):
+        loaded_at = self._loaded_at
+        if loaded_at is None or (RELOAD_INTERVAL_SEC > 0 and time.monotonic() - loaded_at > RELOAD_INTERVAL_SEC):
+            self.reload(db)
+
+    def in_lecture(self, db: Session, class_id: int, when: datetime) -> bool:
+        self.ensure_loaded(db)
+        return bool(self._rooms.get(class_id, 0) & _bit(when.weekday(), when.hour))
+
+    def busy_between(self, db: Session, class_id: int, weekday: int, start_hour: int, end_hour: int) -> bool:
+        """
+        해당 요일 [start_hour, end_hour) 사이에 수업이 하나라도 있는지
+        """
+        self.ensure_loaded(db)
+        return bool(self._rooms.get(class_id, 0) & _range_mask(weekday, start_hour, end_hour))
+
+    def rooms_in_lecture(self, db: Session, class_ids, when: datetime) -> set:
+        self.ensure_loaded(db)
+        bit = _bit(when.weekday(), when.hour)
+        rooms = self._rooms
+        return {class_id for class_id in class_ids if rooms.get(class_id, 0) & bit}
+
+    def day_masks(self, db: Session, class_id: int) -> list:
+        """
+        요일별 예약 가능 시간대 마스크 (slots.HOURS 기준, 월 ~ 일)
+        """
+        self.ensure_loaded(db)
+        week = self._rooms.get(class_id, 0)
+        return [(week >> (wd * HOURS_PER_DAY + OPEN_HOUR)) & FULL_DAY_MASK for wd in range(7)]
+
+    def memory_usage(self) -> dict:
+        rooms = self._rooms
+        size = sys.getsizeof(rooms) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in rooms.items())
+        return {"rooms": len(rooms), "bytes": size}
+
+
+# 워커 프로세스 전역 시간표 캐시
+timetable_cache = TimetableCache()
@@ -0,0 +1,286 @@
+"""
+시간표 적재 (크롤러 출력 CSV / JSON -> timetable)
+
+- 파일을 한 줄(한 객체)씩 읽어 검증하는 제너레이터 파이프라인 -> 파일 크기와 무관한 메모리
+  (현재 테이블의 키만 메모리에 둠)
+- 현재 테이블과 비교해 바뀐 행만 INSERT / UPDATE / DELETE, batch_size 건씩 executemany 후 커밋
+  -> 적재 중에도 강의실 조회가 긴 잠금에 막히지 않음 (대신 적재 도중에는 일부만 반영된 상태가 보일 수 있음)
+- 반영이 끝나면 이용률 집계(room_hourly)의 주당 수업 시간도 다시 채움
+- 행에 lecture_id 가 있으면 lecture_id 기준으로 비교(바뀐 값은 UPDATE),
+  없으면 (강의실, 요일, 시작, 종료) 기준으로 비교 (새 시간대는 INSERT, 사라진 시간대는 DELETE)
+- 파일에 없는 강의 삭제는 오류 행이 하나도 없을 때만 (열 이름이 바뀐 파일 등으로 시간표가 통째로 지워지지 않게)
+  오류가 있어도 지우려면 --prune. 올바른 행이 하나도 없으면 --prune 이어도 지우지 않음
+  오류 행이라도 lecture_id 를 읽을 수 있으면 그 강의는 지우지 않음
+
+python -m app.timetable_ingest timetable.csv
+python -m app.timetable_ingest timetable.json --dry-run
+python -m app.timetable_ingest timetable.csv --prune
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from app import occupancy, room_hourly
+from app.models import Timetable
+from app.timetable_cache import timetable_cache
+
+INGEST_BATCH_SIZE = int(os.getenv("TIMETABLE_INGEST_BATCH", "1000"))
+MAX_REPORTED_ERRORS = 20
+
+WEEKDAY_NAMES = {name: i for i, name in enumerate("월화수목금토일")}
+FIELDS = ("class_id", "weekend", "start_time", "end_time")
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+# ------------------------
+# 읽기
+# ------------------------
+def _iter_csv(f):
+    for row in csv.DictReader(f):
+        yield {(k or "").strip(): v for k, v in row.items()}
+
+
+def _iter_json(f, chunk_size: int = 1 << 16):
+    """
+    JSON 배열([{...}, ...]) 또는 JSON Lines 를 객체 하나씩 (배열 전체를 메모리에 올리지 않음)
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    eof = False
+    while True:
+        buf = buf.lstrip(" \t\r\n,[")
+        if buf.startswith("]"):
+            buf = buf[1:]
+            continue
+        if not buf:
+            if eof:
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            continue
+        try:
+            obj, end = decoder.raw_decode(buf)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            continue
+        buf = buf[end:]
+        yield obj
+
+
+def read_rows(path: str, fmt: str = None):
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "json")
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from (_iter_csv(f) if fmt == "csv" else _iter_json(f))
+
+
+# ------------------------
+# 검증
+# ------------------------
+def _int(value, name: str) -> int:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        raise InvalidRow(f"{name} 값이 정수가 아닙니다: {value!r}")
+
+
+def _hour(value, name: str, round_up: bool) -> int:
+    # 10, "10", "10:30" 모두 허용 (분 단위는 시작은 내림, 종료는 올림)
+    text = str(value).strip()
+    if ":" in text:
+        hour, minute = text.split(":", 1)
+        hour, minute = _int(hour, name), _int(minute[:2], name)
+        return hour + (1 if round_up and minute else 0)
+    return _int(text, name)
+
+
+def _weekday(value) -> int:
+    text = str(value).strip()
+    if text[:1] in WEEKDAY_NAMES:
+        return WEEKDAY_NAMES[text[:1]]
+    return _int(text, "weekend")
+
+
+def validate(raw: dict) -> dict:
+    if not isinstance(raw, dict):
+        raise InvalidRow("행이 객체가 아닙니다.")
+    missing = [name for name in FIELDS if raw.get(name) in (None, "")]
+    if missing:
+        raise InvalidRow(f"필수 값이 없습니다: {', '.join(missing)}")
+
+    row = {
+        "class_id": _int(raw["class_id"], "class_id"),
+        "weekend": _weekday(raw["weekend"]),
+        "start_time": _hour(raw["start_time"], "start_time", round_up=False),
+        "end_time": _hour(raw["end_time"], "end_time", round_up=True),
+    }
+    if not 0 <= row["weekend"] < 7:
+        raise InvalidRow(f"요일은 0(월) ~ 6(일) 입니다: {raw['weekend']!r}")
+    if not 0 <= row["start_time"] < row["end_time"] <= 24:
+        raise InvalidRow(f"시간 범위가 올바르지 않습니다: {raw['start_time']!r} ~ {raw['end_time']!r}")
+    if raw.get("lecture_id") not in (None, ""):
+        row["lecture_id"] = _int(raw["lecture_id"], "lecture_id")
+    return row
+
+
+def validated(rows, stats: dict, invalid_ids: set = None):
+    """
+    올바른 행만 내보내고, 오류 행 중 lecture_id 를 읽을 수 있는 것은 invalid_ids 에 모음 (삭제 대상에서 제외)
+    """
+    for line, raw in enumerate(rows, start=1):
+        stats["read"] += 1
+        try:
+            yield validate(raw)
+        except InvalidRow as e:
+            stats["invalid"] += 1
+            if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+                stats["errors"].append(f"{line}번째 행: {e}")
+            if invalid_ids is not None and isinstance(raw, dict):
+                try:
+                    invalid_ids.add(_int(raw.get("lecture_id"), "lecture_id"))
+                except InvalidRow:
+                    pass
+
+
+# ------------------------
+# 비교 후 반영
+# ------------------------
+def _slot(row) -> tuple:
+    return row["class_id"], row["weekend"], row["start_time"], row["end_time"]
+
+
+def _current(db: Session):
+    """
+    현재 테이블: lecture_id -> 시간대, 시간대 -> 첫 lecture_id
+    (같은 시간대의 나머지 행은 파일에서 다시 나오지 않으므로 삭제 대상이 됨)
+    """
+    by_id, by_slot = {}, {}
+    query = db.query(Timetable.lecture_id, Timetable.class_id, Timetable.weekend,
+                     Timetable.start_time, Timetable.end_time)
+    for t in query.yield_per(INGEST_BATCH_SIZE):
+        slot = (t.class_id, t.weekend, t.start_time, t.end_time)
+        by_id[t.lecture_id] = slot
+        by_slot.setdefault(slot, t.lecture_id)
+    return by_id, by_slot
+
+
+def ingest(db: Session, rows, batch_size: int = INGEST_BATCH_SIZE, dry_run: bool = False,
+           prune: bool = False) -> dict:
+    """
+    rows (검증 전 dict 들의 이터러블) 를 현재 시간표와 비교해 바뀐 행만 반영하고 통계를 반환
+    파일에 없는 강의는 오류 행이 없을 때 (prune=True 면 오류가 있어도) 삭제. 올바른 행이 없으면 삭제하지 않음
+    """
+    started = time.perf_counter()
+    stats = {"read": 0, "invalid": 0, "inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0,
+             "duplicates": 0, "stale": 0, "deletes_skipped": False, "errors": []}
+    by_id, by_slot = _current(db)
+    seen = set()            # 파일에 다시 나온 lecture_id (나머지는 삭제 대상)
+    invalid_ids = set()     # 오류 행의 lecture_id (삭제하지 않음)
+    new_slots = set()       # 이번에 추가하는 시간대 (lecture_id 없는 행)
+    pending = {"inserted": [], "updated": []}
+
+    def flush(kind: str):
+        batch = pending[kind]
+        if not batch:
+            return
+        if not dry_run:
+            db.execute(insert(Timetable) if kind == "inserted" else update(Timetable), batch)
+            db.commit()
+        stats[kind] += len(batch)
+        pending[kind] = []
+
+    for row in validated(rows, stats, invalid_ids):
+        slot = _slot(row)
+        lecture_id = row.get("lecture_id")
+        if lecture_id is None:
+            # lecture_id 가 없는 행은 시간대 자체가 키 (같은 파일에 같은 시간대가 또 나오면 무시)
+            if slot in new_slots or by_slot.get(slot) in seen:
+                stats["duplicates"] += 1
+                continue
+            lecture_id = by_slot.get(slot)
+            if lecture_id is None:
+                new_slots.add(slot)
+                pending["inserted"].append(row)
+            else:
+                seen.add(lecture_id)
+                stats["unchanged"] += 1
+        elif lecture_id in seen:
+            stats["duplicates"] += 1
+        elif lecture_id not in by_id:
+            seen.add(lecture_id)
+            pending["inserted"].append(row)
+        else:
+            seen.add(lecture_id)
+            if by_id[lecture_id] == slot:
+                stats["unchanged"] += 1
+            else:
+                pending["updated"].append(row)
+
+        for kind in pending:
+            if len(pending[kind]) >= batch_size:
+                flush(kind)
+
+    flush("inserted")
+    flush("updated")
+
+    stale = [lecture_id for lecture_id in by_id if lecture_id not in seen and lecture_id not in invalid_ids]
+    stats["stale"] = len(stale)
+    valid_rows = stats["read"] - stats["invalid"]
+    if stale and (valid_rows == 0 or (stats["invalid"] and not prune)):
+        stats["deletes_skipped"] = True
+        stale = []
+    for i in range(0, len(stale), batch_size):
+        chunk = stale[i:i + batch_size]
+        if not dry_run:
+            db.execute(delete(Timetable).where(Timetable.lecture_id.in_(chunk)))
+            db.commit()
+        stats["deleted"] += len(chunk)
+
+    if not dry_run and (stats["inserted"] or stats["updated"] or stats["deleted"]):
+        room_hourly.refresh_lectures(db)
+        db.commit()
+        # 이 프로세스의 캐시만 비움 (다른 워커는 TIMETABLE_RELOAD_SEC 주기로 다시 읽음)
+        timetable_cache.invalidate()
+        occupancy.invalidate()
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["rows_per_sec"] = round(stats["read"] / elapsed) if elapsed > 0 else 0
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="크롤러 시간표 파일 적재")
+    parser.add_argument("path", help="CSV 또는 JSON / JSON Lines 파일 (class_id, weekend, start_time, end_time[, lecture_id])")
+    parser.add_argument("--format", choices=["csv", "json"], help="생략하면 확장자로 판단")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="바뀔 행 수만 계산하고 반영하지 않음")
+    parser.add_argument("--prune", action="store_true", help="오류 행이 있어도 파일에 없는 강의를 삭제")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        result = ingest(db, read_rows(args.path, args.format), args.batch_size, args.dry_run, args.prune)
+
+    for error in result["errors"]:
+        print(error, file=sys.stderr)
+    if result["deletes_skipped"]:
+        print(f"오류 행이 있거나 올바른 행이 없어 파일에 없는 강의 {result['stale']}건을 삭제하지 않았습니다 "
+              f"(오류가 있어도 지우려면 --prune)", file=sys.stderr)
+    print(f"{'(dry run) ' if args.dry_run else ''}읽음 {result['read']}건, 오류 {result['invalid']}건 / "
+          f"추가 {result['inserted']}, 변경 {result['updated']}, 삭제 {result['deleted']}, 그대로 {result['unchanged']}, "
+          f"중복 {result['duplicates']} "
+          f"({result['seconds']}s, {result['rows_per_sec']} rows/s)")
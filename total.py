@@ -1,37 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import timedelta
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
 
-from app.database import get_db
-from app.models import Reserve
+from app.database import get_async_db
+from app import room_hourly, usage_stats
 
 router = APIRouter()
 
-# ✅ 사용자별 총 이용 시간 및 횟수 조회 API
+# ✅ 사용자별 총 이용 시간 및 횟수 조회 API (예약 이력을 훑지 않고 누적 집계에서 바로 읽음)
 @router.get("/usage-summary/{user_id}")
-def get_usage_summary(user_id: int, db: Session = Depends(get_db)):
-    # 종료된 예약만 집계
-    completed_reservations = db.query(Reserve).filter(
-        Reserve.user_id == user_id,
-        Reserve.status == "종료"
-    ).all()
+async def get_usage_summary(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    usage = await db.run_sync(usage_stats.get_user_usage, user_id)
+    usage["total_usage_minutes"] = usage.pop("total_minutes")
+    return usage
 
-    if not completed_reservations:
-        return {
-            "user_id": user_id,
-            "total_sessions": 0,
-            "total_usage_minutes": 0
-        }
+# 강의실별 이용 횟수 / 시간
+@router.get("/usage-summary/room/{class_id}")
+async def get_room_usage_summary(class_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(usage_stats.get_room_usage, class_id)
 
-    total_sessions = len(completed_reservations)
-    total_minutes = sum(
-        int((res.end_time - res.start_time).total_seconds() // 60)
-        for res in completed_reservations
-    )
+# 강의실 이용률 히트맵 (요일 x 시간대, 시간대별 누적 집계에서 읽음)
+@router.get("/utilization/heatmap")
+async def get_utilization_heatmap(
+    house_id: Optional[int] = Query(None, description="호관 (생략하면 전체)"),
+    class_id: Optional[int] = Query(None, description="강의실 (지정하면 house_id 는 무시)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(room_hourly.heatmap, house_id, class_id)
 
-    return {
-        "user_id": user_id,
-        "total_sessions": total_sessions,
-        "total_usage_minutes": total_minutes
-    }
+# 지표별 상위 강의실
+@router.get("/utilization/top")
+async def get_top_rooms(
+    metric: Literal["reserved_minutes", "used_minutes", "no_show_count", "weekly_lecture_minutes"] = "used_minutes",
+    limit: int = Query(10, ge=1, le=100),
+    house_id: Optional[int] = None,
+    weekday: Optional[int] = Query(None, ge=0, le=6, description="0=월 ~ 6=일"),
+    hour: Optional[int] = Query(None, ge=0, le=23),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(room_hourly.top_rooms, metric, limit, house_id, weekday, hour)
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import NamedTuple
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from app import metrics
+
+# 인증 사진 저장 위치와 크기 제한
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))   # 기본 10MB
+UPLOAD_CHUNK_BYTES = 256 * 1024
+# multipart 요청 전체 크기 제한 (사진 + 폼 필드 / 경계 문자열 여유분)
+UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", str(UPLOAD_MAX_BYTES + 64 * 1024)))
+
+_EXTENSION = re.compile(r"^\.[a-z0-9]{1,5}$")
+
+
+class StoredUpload(NamedTuple):
+    path: str       # 내용 해시로 지은 저장 경로
+    sha256: str     # 내용 해시 (OCR 캐시 등에서 키로 사용)
+    size: int
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"사진은 {max_bytes // (1024 * 1024)}MB 이하만 업로드할 수 있습니다.")
+
+
+class UploadLimitMiddleware:
+    """
+    multipart 요청 본문 크기 제한 (순수 ASGI 미들웨어)
+
+    Starlette 는 핸들러가 실행되기 전에 본문 전체를 SpooledTemporaryFile 로 읽으므로
+    save_upload 의 크기 검사만으로는 대역폭 / 임시 디스크 사용을 막지 못함 -> 본문을 읽는 단계에서 제한
+    - Content-Length 가 제한을 넘으면 본문을 읽지 않고 바로 413
+    - 길이를 알 수 없는 (chunked) 요청은 받은 바이트를 세다가 제한을 넘는 순간 413
+    """
+    def __init__(self, app, max_bytes: int = None):
+        self.app = app
+        self.max_bytes = max_bytes or UPLOAD_MAX_REQUEST_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            metrics.UPLOADS.inc(result="413")
+            error = _too_large(UPLOAD_MAX_BYTES)
+            await JSONResponse({"detail": error.detail}, status_code=error.status_code)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # 폼 파싱 중에 올라간 HTTPException 은 FastAPI 가 그대로 응답으로 바꿈
+                    metrics.UPLOADS.inc(result="413")
+                    raise _too_large(UPLOAD_MAX_BYTES)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def _extension(filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if _EXTENSION.match(ext) else ".bin"
+
+
+def _open_part():
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+    return os.fdopen(fd, "wb"), tmp_path
+
+
+def _write(out, digest, chunk: bytes):
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def _discard(tmp_path: str):
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+
+async def save_upload(upload: UploadFile, max_bytes: int = None) -> StoredUpload:
+    """
+    업로드 파일을 청크 단위로 임시 파일에 쓰면서 해시를 계산하고, 끝나면 <sha256><확장자> 로 이름을 바꿈
+
+    - 클라이언트 파일명을 쓰지 않으므로 같은 이름(IMG_0001.jpg)의 다른 사진이 서로 덮어쓰지 않음
+    - 같은 사진은 같은 경로로 저장됨
+    - max_bytes 를 넘거나 중간에 실패하면 임시 파일을 지우고 413 / 예외를 그대로 전달
+      (이미 받은 파일에 대한 사후 검사. 전송 중 제한은 UploadLimitMiddleware 가 함)
+    - Starlette 의 임시 파일은 이름 없는 파일(메모리 또는 TemporaryFile)이라 옮길 수 없으므로
+      해시를 계산하면서 UPLOAD_DIR 로 한 번 복사
+    - 디스크 쓰기 / 이름 바꾸기 / 정리는 스레드풀에서 (느린 디스크가 이벤트 루프를 막지 않게)
+    """
+    max_bytes = max_bytes or UPLOAD_MAX_BYTES
+    out, tmp_path = await run_in_threadpool(_open_part)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        try:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                await run_in_threadpool(_write, out, digest, chunk)
+        finally:
+            await run_in_threadpool(out.close)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="빈 파일입니다.")
+
+        sha256 = digest.hexdigest()
+        path = os.path.join(UPLOAD_DIR, sha256 + _extension(upload.filename))
+        await run_in_threadpool(os.replace, tmp_path, path)
+    except BaseException as e:
+        await run_in_threadpool(_discard, tmp_path)
+        metrics.UPLOADS.inc(result=str(e.status_code) if isinstance(e, HTTPException) else "error")
+        raise
+    finally:
+        await upload.close()
+
+    metrics.UPLOADS.inc(result="stored")
+    metrics.UPLOAD_BYTES.inc(size)
+    return StoredUpload(path, sha256, size)
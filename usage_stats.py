@@ -0,0 +1,142 @@
+"""
+이용 통계 (사용자별 / 강의실별 누적 집계)
+
+예약 이력을 요청마다 합산하지 않고, 예약이 끝나는 시점(퇴실 인증, 노쇼 / 미퇴실 만료)에
+user_usage / room_usage 를 상태 변경과 같은 트랜잭션에서 증분 갱신
+집계가 어긋났거나 처음 도입할 때는 예약 이력에서 다시 계산
+
+python -m app.usage_stats rebuild
+"""
+import argparse
+import time
+from sqlalchemy import Integer, case, cast, delete, func, insert, literal_column, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import RoomUsage, UserUsage
+from app import archive
+
+USAGE_FIELDS = ("total_sessions", "total_minutes", "no_show_count", "overstay_count")
+
+# 끝난 예약 상태 -> 늘어나는 집계 (종료는 이용 시간도 함께)
+COUNTED_STATUSES = {
+    "종료": "total_sessions",
+    "노쇼": "no_show_count",
+    "미퇴실": "overstay_count",
+}
+
+
+def usage_delta(status: str, start_time, end_time) -> dict:
+    field = COUNTED_STATUSES.get(status)
+    if field is None:
+        return {}
+    delta = {field: 1}
+    if status == "종료":
+        delta["total_minutes"] = int((end_time - start_time).total_seconds() // 60)
+    return delta
+
+
+def bump(db: Session, model, keys: dict, delta: dict, fields=USAGE_FIELDS):
+    """
+    누적 집계 행 하나에 delta 를 더함 (행이 없으면 fields 를 0 으로 만들고 더함, 커밋은 호출자가 함)
+    keys: 기본 키 컬럼 이름 -> 값 (room_hourly 처럼 복합 키도 가능)
+    """
+    condition = [getattr(model, name) == value for name, value in keys.items()]
+    values = {getattr(model, name): getattr(model, name) + amount for name, amount in delta.items()}
+    if db.query(model).filter(*condition).update(values, synchronize_session=False):
+        return
+    # 첫 집계 행: 다른 트랜잭션이 먼저 만들었으면 다시 UPDATE
+    try:
+        with db.begin_nested():
+            row = model(**keys, **{name: 0 for name in fields})
+            for name, amount in delta.items():
+                setattr(row, name, amount)
+            db.add(row)
+    except IntegrityError:
+        db.query(model).filter(*condition).update(values, synchronize_session=False)
+
+
+def record(db: Session, info, status: str):
+    """
+    예약이 status 로 끝났음을 집계에 반영 (커밋은 호출자가 함)
+    """
+    delta = usage_delta(status, info.start_time, info.end_time)
+    if delta:
+        bump(db, UserUsage, {"user_id": info.user_id}, delta)
+        bump(db, RoomUsage, {"class_id": info.class_id}, delta)
+
+
+def _to_dict(row, key_name: str, key: int) -> dict:
+    usage = {key_name: key}
+    for name in USAGE_FIELDS:
+        usage[name] = getattr(row, name) if row else 0
+    return usage
+
+
+def get_user_usage(db: Session, user_id: int) -> dict:
+    return _to_dict(db.get(UserUsage, user_id), "user_id", user_id)
+
+
+def get_room_usage(db: Session, class_id: int) -> dict:
+    return _to_dict(db.get(RoomUsage, class_id), "class_id", class_id)
+
+
+# ------------------------
+# 이력에서 다시 계산
+# ------------------------
+def minutes_between(start, end, dialect: str):
+    """
+    두 DATETIME 식 사이의 분 (버림) 을 DB 에서 계산하는 식
+    """
+    if dialect == "sqlite":
+        seconds = cast(func.round((func.julianday(end) - func.julianday(start)) * 86400), Integer)
+        return seconds // 60
+    if dialect in ("mysql", "mariadb"):
+        return func.timestampdiff(literal_column("MINUTE"), start, end)
+    return cast(func.floor(func.extract("epoch", end - start) / 60), Integer)
+
+
+def _aggregate(history, key_name: str, dialect: str):
+    key_column, status = history.c[key_name], history.c.status
+    finished = status == "종료"
+    return select(
+        key_column,
+        func.sum(case((finished, 1), else_=0)),
+        func.sum(case((finished, minutes_between(history.c.start_time, history.c.end_time, dialect)), else_=0)),
+        func.sum(case((status == "노쇼", 1), else_=0)),
+        func.sum(case((status == "미퇴실", 1), else_=0)),
+    ).where(status.in_(tuple(COUNTED_STATUSES)), key_column.isnot(None)).group_by(key_column)
+
+
+def rebuild(db: Session) -> dict:
+    """
+    집계 테이블을 비우고 예약 이력 (reserve + reserve_archive) 에서 GROUP BY 한 번씩으로 다시 채움
+    """
+    dialect = db.get_bind().dialect.name
+    history = archive.reservation_history()
+    try:
+        db.execute(delete(UserUsage))
+        db.execute(delete(RoomUsage))
+        db.execute(insert(UserUsage).from_select(["user_id", *USAGE_FIELDS], _aggregate(history, "user_id", dialect)))
+        db.execute(insert(RoomUsage).from_select(["class_id", *USAGE_FIELDS], _aggregate(history, "class_id", dialect)))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {
+        "users": db.query(func.count()).select_from(UserUsage).scalar(),
+        "rooms": db.query(func.count()).select_from(RoomUsage).scalar(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이용 통계 관리")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    from app.database import SessionLocal
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        counts = rebuild(db)
+    print(f"사용자 {counts['users']}명, 강의실 {counts['rooms']}개 집계 완료 ({time.perf_counter() - started:.2f}s)")